@@ -0,0 +1,106 @@
+# bench_category_index.py
+"""
+Category ancestor resolution on a synthetic category graph (default 1M categories):
+
+  recursive: the old CategoryResolver walk, a new set per level, with its lru_cache on
+             direct parents (bounded at 100k entries, so most lookups miss on a big graph)
+  index:     CategoryIndex closure built once, then one slice per category
+
+Each category gets 1-4 parents among earlier categories, biased towards low IDs so a few
+"hub" categories collect many children, as on Wikipedia. --cycles adds back-edges.
+
+Run from the repository root:
+    python -m benchmarks.bench_category_index --categories 1000000 --depth 3
+"""
+import argparse
+import random
+import tempfile
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from src.category_index import CategoryIndex
+from src.category_resolver import CategoryResolver
+
+
+def make_mapping(count, cycles=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    degrees = rng.integers(1, 5, size=count)
+    degrees[0] = 0
+    children = np.repeat(np.arange(count), degrees)
+    # Parents among earlier categories, skewed towards the oldest (most general) ones
+    parents = (children * rng.random(len(children)) ** 2).astype(np.int64)
+    back = rng.random(len(children)) < cycles
+    parents[back] = rng.integers(0, count, size=int(back.sum()))
+    mapping = {}
+    for child, parent in zip(children.tolist(), parents.tolist()):
+        mapping.setdefault(f"Cat_{child}", []).append(f"Cat_{parent}")
+    return mapping
+
+
+def legacy_resolver(mapping):
+    """The old CategoryResolver.resolve_categories_and_hierarchy, including its lru_cache"""
+    @lru_cache(maxsize=100000)
+    def parents_from_tree(category_name):
+        return [f"Category:{p}" for p in mapping.get(category_name.replace("Category:", "").strip(), [])]
+
+    def recursive(category_name, max_depth, current_depth=0):
+        if current_depth >= max_depth:
+            return set()
+        all_parents = set()
+        for parent in parents_from_tree(category_name):
+            all_parents.add(parent)
+            all_parents.update(recursive(parent, max_depth, current_depth + 1))
+        return all_parents
+
+    def resolve(raw_categories, max_depth=2):
+        resolved = set()
+        for cat in raw_categories:
+            resolved.add(cat)
+            resolved.update(recursive(cat, max_depth=max_depth))
+        return sorted([c.replace("Category:", "").strip() for c in resolved])
+
+    return resolve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=1_000_000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--cycles", type=float, default=0.01, help="share of edges pointing anywhere")
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    mapping = make_mapping(args.categories, args.cycles)
+    print(f"{args.categories} categories, {sum(map(len, mapping.values()))} edges "
+          f"(generated in {time.perf_counter() - start:.1f}s)")
+    sample = [f"Cat_{i}" for i in random.Random(1).sample(range(args.categories), args.queries)]
+
+    resolve = legacy_resolver(mapping)
+    for depth in range(1, args.depth + 2):
+        start = time.perf_counter()
+        for category in sample:
+            resolve([category], max_depth=depth)
+        print(f"recursive depth {depth}  {(time.perf_counter() - start) / len(sample) * 1e6:8.1f} us/category")
+
+    start = time.perf_counter()
+    index = CategoryIndex.from_mapping(mapping, args.depth)
+    print(f"index built in {time.perf_counter() - start:.1f}s: {len(index.ancestors)} ancestor entries, "
+          f"{index.memory_bytes() / 2**20:.0f} MiB of arrays")
+    del mapping
+    with tempfile.TemporaryDirectory() as root:
+        index.save(root)
+        resolver = CategoryResolver(category_index=CategoryIndex.load(root))
+        for depth in range(1, args.depth + 2):
+            start = time.perf_counter()
+            for category in sample:
+                resolver.resolve_categories_and_hierarchy([category], max_depth=depth)
+            elapsed = (time.perf_counter() - start) / len(sample)
+            note = " (walks past the closure)" if depth > args.depth else ""
+            print(f"index depth {depth}      {elapsed * 1e6:8.1f} us/category{note}")
+
+
+if __name__ == "__main__":
+    main()
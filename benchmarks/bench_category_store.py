@@ -0,0 +1,73 @@
+# bench_category_store.py
+"""
+Opening a category hierarchy, each case in a fresh interpreter (time and peak RSS):
+
+  json.load:   the old CategoryResolver startup, the whole mapping as one dict
+               (before it resolved anything)
+  first open:  CategoryResolver(file) streams the JSON into a CategoryIndex and saves it
+               beside the file as "<file>.index"
+  reopen:      CategoryResolver(file) again, memory-mapping the saved index, plus one query
+
+The mapping is the synthetic graph of bench_category_index, written as JSON.
+
+Peak RSS is read from /proc, so this runs on Linux only.
+
+Run from the repository root:
+    python -m benchmarks.bench_category_store --categories 1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_category_index import make_mapping
+
+# VmHWM, not ru_maxrss: on Linux ru_maxrss keeps the forking parent's high-water mark across exec
+_REPORT = """
+with open("/proc/self/status") as f:
+    print(next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM")))
+"""
+_OPEN = """
+from src.category_resolver import CategoryResolver
+resolver = CategoryResolver({path!r})
+assert resolver.resolve_categories_and_hierarchy(["Cat_999"], max_depth=2)
+"""
+
+CASES = {
+    "json.load": "import json\nwith open({path!r}, encoding='utf-8') as f:\n    mapping = json.load(f)\n",
+    "first open": _OPEN,
+    "reopen": _OPEN,
+}
+
+
+def run_case(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code + _REPORT], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return elapsed, int(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "category_tree.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(make_mapping(args.categories), f)
+        print(f"{args.categories} categories, JSON {os.path.getsize(path) / 2**20:.0f} MiB")
+        baseline, base_rss = run_case("")
+        print(f"{'interpreter':<12} {baseline * 1000:9.0f} ms  peak RSS {base_rss / 2**20:8.1f} MiB")
+        for name, code in CASES.items():
+            elapsed, peak = run_case(code.format(path=path))
+            print(f"{name:<12} {elapsed * 1000:9.0f} ms  peak RSS {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
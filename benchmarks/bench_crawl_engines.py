@@ -0,0 +1,81 @@
+# bench_crawl_engines.py
+"""
+Compares pages/sec of the crawl engines against a local Wikipedia stand-in:
+threaded WikiCrawler, asyncio AsyncWikiCrawler and the process-pool PipelinedWikiCrawler.
+
+Run from the repository root:
+    python -m benchmarks.bench_crawl_engines --latency 0.2 --page-kb 20
+    python -m benchmarks.bench_crawl_engines --engines threaded pipelined --page-kb 300 --latency 0
+
+Parsing is CPU-bound under the GIL in the threaded and asyncio engines, so on few
+cores their gap shrinks as --page-kb / --links-per-page grow and widens as --latency
+grows. The pipelined engine parses in worker processes and scales with cores instead.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.async_crawler import AsyncWikiCrawler
+from src.pipeline_crawler import PipelinedWikiCrawler
+from src.wiki_config import POOL_SIZE
+from src.wiki_crawler import WikiCrawler
+
+
+def run_engine(name, crawler):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        crawler.start_crawl()
+        elapsed = time.perf_counter() - start
+    rate = crawler.pages_crawled / elapsed if elapsed else 0.0
+    extra = ""
+    if isinstance(crawler, PipelinedWikiCrawler):
+        extra = f"  cores busy={crawler._cores_busy(elapsed):.2f}/{crawler.num_parsers}"
+    print(f"{name:<10} pages={crawler.pages_crawled:<6} failed={crawler.pages_failed:<4} "
+          f"time={elapsed:7.2f}s  pages/sec={rate:8.1f}{extra}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", default=["threaded", "asyncio", "pipelined"],
+                        choices=["threaded", "asyncio", "pipelined"])
+    parser.add_argument("--latency", type=float, default=0.2, help="server-side delay per request (s)")
+    parser.add_argument("--page-kb", type=int, default=20, help="approximate article size (KB)")
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--max-pages-per-depth", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=200, help="asyncio worker tasks")
+    parser.add_argument("--parsers", type=int, default=None, help="parser processes (default: all cores)")
+    args = parser.parse_args()
+
+    with MockWikiServer(links_per_page=args.links_per_page, page_kb=args.page_kb,
+                        latency=args.latency) as server:
+        start_url = f"{server.base_url}/wiki/Article_0"
+        common = dict(requests_per_second=None, base_url=server.base_url,
+                      max_depth=args.max_depth, max_pages_per_depth=args.max_pages_per_depth)
+        engines = {
+            "threaded": lambda data_dir: WikiCrawler(start_url, num_threads=POOL_SIZE, data_dir=data_dir, **common),
+            "asyncio": lambda data_dir: AsyncWikiCrawler(start_url, num_workers=args.workers,
+                                                         data_dir=data_dir, **common),
+            "pipelined": lambda data_dir: PipelinedWikiCrawler(start_url, num_threads=POOL_SIZE,
+                                                               num_parsers=args.parsers, data_dir=data_dir, **common),
+        }
+
+        print(f"Mock server at {server.base_url} (latency={args.latency}s, page≈{args.page_kb}KB)")
+        rates = {}
+        for name in args.engines:
+            with tempfile.TemporaryDirectory() as data_dir:
+                rates[name] = run_engine(name, engines[name](data_dir))
+
+        baseline = rates.get("threaded")
+        if baseline:
+            for name, rate in rates.items():
+                if name != "threaded":
+                    print(f"{name} speedup over threaded: {rate / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# bench_crawl_metrics.py
+"""
+Crawl metrics: cost of the instrumentation, and of per-page console logging, against a
+local Wikipedia stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_crawl_metrics
+    python -m benchmarks.bench_crawl_metrics --max-pages-per-depth 40 --repeat 5
+
+First the cost of each metric operation on its own. A crawled page does the same
+operations every time (five timed stages, the in-flight gauge, two counters), so their
+sum is the instrumentation cost per page, shown against the crawl's CPU time per page.
+Then whole crawls with the asyncio engine: the "info" log level, "info" with a JSON
+snapshot every 0.1 s and a Prometheus scrape every 0.1 s, and "debug", which prints
+every crawled URL. Output goes to os.devnull, so printing costs a real write.
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.async_crawler import AsyncWikiCrawler
+from src.crawl_metrics import CrawlMetrics
+
+
+def _per_op(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def bench_operations(n):
+    metrics = CrawlMetrics()
+    histogram, gauge, counter = metrics.stage["fetch"], metrics.in_flight, metrics.fetches
+
+    def timed():
+        with histogram.time():
+            pass
+
+    def tracked():
+        with gauge.track():
+            pass
+
+    costs = {
+        "Histogram.observe": _per_op(lambda: histogram.observe(0.003), n),
+        "Histogram.time block": _per_op(timed, n),
+        "Gauge.track block": _per_op(tracked, n),
+        "Counter.inc": _per_op(counter.inc, n),
+    }
+    for name, seconds in costs.items():
+        print(f"{name:<22} {seconds * 1e9:7.0f} ns")
+    per_page = 5 * costs["Histogram.time block"] + costs["Gauge.track block"] + 2 * costs["Counter.inc"]
+    print(f"{'per crawled page':<22} {per_page * 1e9:7.0f} ns")
+    return per_page
+
+
+def _scrape(port, stop):
+    while not stop.wait(0.1):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read()
+        except OSError:
+            pass  # the endpoint is only up while the crawl runs
+
+
+def bench_crawls(args, per_page):
+    configs = [
+        ("info", {"log_level": "info", "metrics_interval": 0}),
+        ("info + snapshots/scrapes", {"log_level": "info", "metrics_interval": 0.1, "metrics_port": args.port}),
+        ("debug (per-page print)", {"log_level": "debug", "metrics_interval": 0}),
+    ]
+    best = {name: (0.0, 0.0, 0) for name, _ in configs}
+    with MockWikiServer(links_per_page=args.links_per_page, page_kb=args.page_kb) as server:
+        for _ in range(args.repeat):  # configurations take turns, so warm-up and drift hit all of them
+            for name, kwargs in configs:
+                with tempfile.TemporaryDirectory() as data_dir, open(os.devnull, "w") as devnull:
+                    crawler = AsyncWikiCrawler(f"{server.base_url}/wiki/Article_0", num_workers=args.workers,
+                                               requests_per_second=None, base_url=server.base_url,
+                                               data_dir=data_dir, max_depth=args.max_depth,
+                                               max_pages_per_depth=args.max_pages_per_depth,
+                                               checkpoint_interval=0, **kwargs)
+                    stop = threading.Event()
+                    if kwargs.get("metrics_port"):
+                        threading.Thread(target=_scrape, args=(args.port, stop), daemon=True).start()
+                    with contextlib.redirect_stdout(devnull):
+                        start, start_cpu = time.perf_counter(), time.process_time()
+                        crawler.start_crawl()
+                        elapsed, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+                    stop.set()
+                rate = crawler.pages_crawled / elapsed
+                if rate > best[name][0]:
+                    best[name] = (rate, cpu / crawler.pages_crawled, crawler.pages_crawled)
+
+    baseline = best["info"][0]
+    for name, (rate, cpu_per_page, pages) in best.items():
+        print(f"{name:<26} pages={pages:<6} pages/sec={rate:8.1f}  vs info={rate / baseline - 1:+6.1%}  "
+              f"CPU/page={cpu_per_page * 1000:6.2f} ms  instrumentation={per_page / cpu_per_page:.3%} of it")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000, help="iterations per metric operation")
+    parser.add_argument("--repeat", type=int, default=3, help="crawls per configuration, best one counts")
+    parser.add_argument("--workers", type=int, default=50, help="asyncio worker tasks")
+    parser.add_argument("--port", type=int, default=9108, help="local port for the scraped configuration")
+    parser.add_argument("--page-kb", type=int, default=5, help="approximate article size (KB)")
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--max-pages-per-depth", type=int, default=25)
+    args = parser.parse_args()
+
+    per_page = bench_operations(args.ops)
+    bench_crawls(args, per_page)
+
+
+if __name__ == "__main__":
+    main()
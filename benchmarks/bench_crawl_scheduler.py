@@ -0,0 +1,74 @@
+# bench_crawl_scheduler.py
+"""
+Threaded WikiCrawler scheduling: how busy the worker threads are kept, and how long a
+crawl takes to return once its last page is done, against a local Wikipedia stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_crawl_scheduler
+    python -m benchmarks.bench_crawl_scheduler --threads 5 --slow-latency 2
+
+"tail" is the time from the last page finishing to start_crawl returning. Utilization
+is the time threads spent processing pages over threads x wall time; "threads used"
+counts the threads that processed at least one page. The slow-server run has responses
+slower than one second, which used to make idle workers give up while the first page
+was still being fetched.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import threading
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.wiki_crawler import WikiCrawler
+
+
+def run(args, latency, max_depth, max_pages_per_depth):
+    with MockWikiServer(links_per_page=args.links_per_page, page_kb=args.page_kb, latency=latency) as server, \
+            tempfile.TemporaryDirectory() as data_dir:
+        crawler = WikiCrawler(f"{server.base_url}/wiki/Article_0", num_threads=args.threads,
+                              requests_per_second=None, base_url=server.base_url, data_dir=data_dir,
+                              max_depth=max_depth, max_pages_per_depth=max_pages_per_depth,
+                              checkpoint_interval=0)
+        busy, last_done = {}, [0.0]
+        process_page = crawler._process_page
+
+        def timed_process_page(url, depth):
+            start = time.perf_counter()
+            try:
+                return process_page(url, depth)
+            finally:
+                end = time.perf_counter()
+                thread = threading.get_ident()
+                busy[thread] = busy.get(thread, 0.0) + end - start
+                last_done[0] = max(last_done[0], end)
+
+        crawler._process_page = timed_process_page
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            crawler.start_crawl()
+            end = time.perf_counter()
+    elapsed = end - start
+    print(f"latency={latency:<5} pages={crawler.pages_crawled:<5} time={elapsed:6.2f}s  tail={end - last_done[0]:5.2f}s  "
+          f"utilization={sum(busy.values()) / (args.threads * elapsed):6.1%}  "
+          f"threads used={len(busy)}/{args.threads}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="server-side delay per request (s)")
+    parser.add_argument("--slow-latency", type=float, default=1.2, help="delay for the slow-server run (s)")
+    parser.add_argument("--page-kb", type=int, default=5, help="approximate article size (KB)")
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--max-pages-per-depth", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args, args.latency, args.max_depth, args.max_pages_per_depth)
+    run(args, args.slow_latency, 3, 5)
+
+
+if __name__ == "__main__":
+    main()
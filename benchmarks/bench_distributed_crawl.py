@@ -0,0 +1,55 @@
+# bench_distributed_crawl.py
+"""
+Distributed crawl scaling: the same crawl run by 1..N local node processes against a
+local Wikipedia stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_distributed_crawl
+    python -m benchmarks.bench_distributed_crawl --nodes 1 2 4 8 --latency 0.2
+
+Each node has a fixed number of fetch threads, as one machine would, and the server
+delays every response, so one node is bound by fetch latency the way a real crawl is.
+Speedup is pages/sec relative to the first node count; efficiency is speedup / nodes.
+On a machine with fewer cores than nodes, parsing eventually competes for CPU and
+efficiency drops below what separate machines would show.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.distributed_crawler import run_local_cluster
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4], help="node counts to compare")
+    parser.add_argument("--threads", type=int, default=3, help="fetch threads per node")
+    parser.add_argument("--latency", type=float, default=0.1, help="server-side delay per request (s)")
+    parser.add_argument("--page-kb", type=int, default=2, help="approximate article size (KB)")
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--max-depth", type=int, default=4)
+    parser.add_argument("--max-pages-per-depth", type=int, default=8)
+    args = parser.parse_args()
+
+    with MockWikiServer(links_per_page=args.links_per_page, page_kb=args.page_kb, latency=args.latency) as server:
+        baseline = None
+        for num_nodes in args.nodes:
+            with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                stats = run_local_cluster(f"{server.base_url}/wiki/Article_0", num_nodes, requests_per_second=None,
+                                          max_depth=args.max_depth, max_pages_per_depth=args.max_pages_per_depth,
+                                          base_url=server.base_url, data_dir=data_dir, num_threads=args.threads)
+                elapsed = time.perf_counter() - start
+            rate = stats["pages_crawled"] / elapsed
+            baseline = baseline or rate / num_nodes
+            speedup = rate / baseline
+            print(f"nodes={num_nodes:<3} pages={stats['pages_crawled']:<6} time={elapsed:6.2f}s "
+                  f"pages/sec={rate:7.1f}  speedup={speedup:5.2f}x  efficiency={speedup / num_nodes:5.1%}  "
+                  f"links forwarded={stats['links_forwarded']}")
+
+
+if __name__ == "__main__":
+    main()
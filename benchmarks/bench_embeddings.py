@@ -0,0 +1,67 @@
+# bench_embeddings.py
+"""
+SemanticEmbedder throughput on CPU:
+
+  get_embedding: one text per model call (the old path)
+  embed_batch:   length-bucketed batches, at each --batch-sizes value
+  cached:        embed_batch again with the persistent cache warm, as on a recrawl
+
+Texts mix article titles with lead sections of varying length, like a crawl.
+Needs torch, transformers and the model (downloaded on first use).
+
+Run from the repository root:
+    python -m benchmarks.bench_embeddings --texts 512 --threads 4
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from src.semantic_embedder import SemanticEmbedder
+
+_WORDS = ("history music game science city river film album player league war empire language "
+          "species theory school museum festival island mountain company software novel").split()
+
+
+def make_texts(count, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        words = rng.randint(2, 6) if i % 3 == 0 else rng.randint(20, 250)  # titles and lead sections
+        texts.append(" ".join(rng.choice(_WORDS) for _ in range(words)) + f" {i}")
+    return texts
+
+
+def rate(fn, count):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128])
+    parser.add_argument("--threads", type=int, default=4, help="torch CPU thread budget")
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    embedder = SemanticEmbedder(num_threads=args.threads)
+    embedder.embed_batch(texts[:8])  # warm up
+
+    single = rate(lambda: [embedder.get_embedding(text) for text in texts[:min(128, len(texts))]],
+                  min(128, len(texts)))
+    print(f"get_embedding        {single:8.1f} texts/s")
+    for batch_size in args.batch_sizes:
+        print(f"embed_batch bs={batch_size:<4}  {rate(lambda: embedder.embed_batch(texts, batch_size), len(texts)):8.1f} texts/s")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = SemanticEmbedder(cache_dir=cache_dir, num_threads=args.threads)
+        cold = rate(lambda: cached.embed_batch(texts), len(texts))
+        warm = rate(lambda: cached.embed_batch(texts), len(texts))
+        print(f"cache cold           {cold:8.1f} texts/s")
+        print(f"cache warm           {warm:8.1f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# bench_link_extraction.py
+"""
+Microbenchmark: byte-level LinkExtractor.extract_links vs the BeautifulSoup path.
+
+Run from the repository root:
+    python -m benchmarks.bench_link_extraction --sizes 300 1000
+"""
+import argparse
+import time
+
+from benchmarks.wiki_fixtures import make_article_html
+from src.link_extractor import LinkExtractor
+
+
+def time_per_page(func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[300, 1000], help="page sizes in KB")
+    parser.add_argument("--links-per-page", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    extractor = LinkExtractor()
+    for size in args.sizes:
+        pages = [make_article_html(f"Article_{i}", links_per_page=args.links_per_page, page_kb=size)
+                 for i in range(args.pages)]
+        for page in pages:
+            assert set(extractor.extract_links(page)) == set(extractor.extract_links_soup(page))
+
+        soup = time_per_page(extractor.extract_links_soup, pages, args.repeat)
+        fast = time_per_page(extractor.extract_links, pages, args.repeat)
+        print(f"{size:>5} KB  soup={soup * 1000:8.2f} ms/page  fast={fast * 1000:7.2f} ms/page  "
+              f"speedup={soup / fast:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# bench_link_graph.py
+"""
+LinkGraph build cost and footprint versus keeping crawl output's link lists:
+
+  lists: {title: [link URL, ...]}, what the stored pages hold today
+  csr:   LinkGraph, int32 targets + int64 offsets, forward and reverse
+
+Also times neighbour lookups, a full BFS from one page over the CSR arrays,
+and appending a batch of newly crawled pages then compacting.
+
+Run from the repository root:
+    python -m benchmarks.bench_link_graph --pages 50000 --links-per-page 150
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import deque
+
+from src.link_graph import LinkGraph
+
+BASE = "http://en.wikipedia.org"
+
+
+def make_pages(count, universe, links_per_page, seed=0):
+    rng = random.Random(seed)
+    return [(f"Article_{i}", {"links": [f"{BASE}/wiki/Article_{j}" for j in rng.sample(range(universe), links_per_page)]})
+            for i in range(count)]
+
+
+def deep_sizeof(links_by_title):
+    size = sys.getsizeof(links_by_title)
+    for title, links in links_by_title.items():
+        size += sys.getsizeof(title) + sys.getsizeof(links) + sum(sys.getsizeof(link) for link in links)
+    return size
+
+
+def bfs(graph, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for target in graph.successors(queue.popleft()).tolist():
+            if target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50000)
+    parser.add_argument("--universe", type=int, default=None, help="distinct titles (default 2x pages)")
+    parser.add_argument("--links-per-page", type=int, default=150)
+    parser.add_argument("--append", type=int, default=1000, help="pages added incrementally")
+    args = parser.parse_args()
+
+    universe = args.universe or 2 * args.pages
+    pages = make_pages(args.pages, universe, args.links_per_page)
+    edges = args.pages * args.links_per_page
+
+    lists_bytes = deep_sizeof({title: data["links"] for title, data in pages})
+    start = time.perf_counter()
+    graph = LinkGraph.build(pages)
+    build_seconds = time.perf_counter() - start
+    csr_bytes = graph.memory_bytes()
+    print(f"{graph.num_nodes} nodes, {graph.num_edges} edges, built in {build_seconds:.2f}s "
+          f"({edges / build_seconds:,.0f} edges/s)")
+    print(f"lists {lists_bytes / edges:7.1f} bytes/edge   csr {csr_bytes / edges:5.1f} bytes/edge "
+          f"({lists_bytes / csr_bytes:.0f}x smaller)")
+
+    rng = random.Random(1)
+    nodes = [rng.randrange(graph.num_nodes) for _ in range(100000)]
+    start = time.perf_counter()
+    for node in nodes:
+        graph.successors(node)
+        graph.predecessors(node)
+    print(f"successors+predecessors: {len(nodes) / (time.perf_counter() - start):,.0f} lookups/s")
+
+    with tempfile.TemporaryDirectory() as path:
+        graph.save(path)
+        start = time.perf_counter()
+        mapped = LinkGraph.load(path)
+        print(f"load (mmap): {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        reached = bfs(mapped, mapped.id_of("Article_0"))
+        print(f"BFS from Article_0 reached {reached} nodes in {time.perf_counter() - start:.2f}s")
+
+        extra = make_pages(args.append, universe, args.links_per_page, seed=2)
+        extra = [(f"Article_{args.pages + i}", data) for i, (_, data) in enumerate(extra)]
+        start = time.perf_counter()
+        mapped.add_pages(extra)
+        append_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        mapped.compact()
+        print(f"append {args.append} pages: {append_seconds:.2f}s, compact: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_page_archive.py
+"""
+Read paths over the same crawl output:
+
+  json:    PageDataStore.load_page_data, open + full JSON decode per lookup
+  sqlite:  SQLitePageDataStore.load_page_data, one keyed query + full decode
+  archive: PageArchive.get, hashed index in a memory-mapped file
+
+Measures random lookups, a full scan, and a scan that only needs the links field.
+
+Run from the repository root:
+    python -m benchmarks.bench_page_archive --pages 20000
+"""
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+
+from benchmarks.bench_page_store import make_record
+from src.data_store import PageDataStore, SQLitePageDataStore
+from src.page_archive import PageArchive, build_archive
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def report(name, lookups, lookup_seconds, pages, scan_seconds, links_seconds=None):
+    line = f"{name:<8} lookup {lookups / lookup_seconds:9.0f}/s  full scan {pages / scan_seconds:9.0f} pages/s"
+    if links_seconds is not None:
+        line += f"  links-only scan {pages / links_seconds:9.0f} pages/s"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20000)
+    parser.add_argument("--links-per-page", type=int, default=150)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    records = [make_record(i, args.links_per_page) for i in range(args.pages)]
+    queries = random.Random(0).choices([title for title, _ in records], k=args.lookups)
+
+    with tempfile.TemporaryDirectory() as json_dir, tempfile.TemporaryDirectory() as sqlite_dir:
+        json_store = PageDataStore(json_dir)
+        sqlite_store = SQLitePageDataStore(sqlite_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for title, data in records:
+                json_store.save_page_data(title, data)
+                sqlite_store.save_page_data(title, data)
+        sqlite_store.flush()
+
+        build_seconds, archive_path = timed(lambda: build_archive(json_store.iter_pages(),
+                                                                  f"{sqlite_dir}/pages.archive"))
+        print(f"converted {args.pages} JSON files in {build_seconds:.2f}s")
+
+        for name, store in [("json", json_store), ("sqlite", sqlite_store)]:
+            lookup_seconds, _ = timed(lambda: [store.load_page_data(q) for q in queries])
+            scan_seconds, _ = timed(lambda: sum(1 for _ in store.iter_pages()))
+            report(name, args.lookups, lookup_seconds, args.pages, scan_seconds)
+        sqlite_store.close()
+
+        with PageArchive(archive_path) as archive:
+            lookup_seconds, _ = timed(lambda: [archive.get(q) for q in queries])
+            scan_seconds, _ = timed(lambda: sum(1 for _ in archive.iter_pages()))
+            links_seconds, _ = timed(lambda: sum(1 for _ in archive.iter_pages(fields=["links"])))
+            report("archive", args.lookups, lookup_seconds, args.pages, scan_seconds, links_seconds)
+            projection_seconds, _ = timed(lambda: [archive.get(q, fields=["category"]) for q in queries])
+            print(f"archive  category-only lookup {args.lookups / projection_seconds:9.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# bench_page_classifier.py
+"""
+PageClassifier accuracy against throughput, on synthetic labelled pages:
+
+  hashed linear: train once per --features size (and with bigrams), then time
+                 classify end to end over held-out pages rendered as --page-kb article HTML:
+                 from the raw bytes through ParsedPage and the feature scan, one page per
+                 call as in the crawler. "model only" is classify_record on ready records.
+  zero-shot:     TopicClassifier.classify_batch over the same pages (--zero-shot,
+                 needs torch and the model), the slow labeller the model replaces
+
+Each label has its own vocabulary, but most of every lead section is shared filler
+and some words come from a confusable label, so the task is not trivially separable.
+
+Run from the repository root:
+    python -m benchmarks.bench_page_classifier --pages 20000
+"""
+import argparse
+import html
+import os
+import random
+import tempfile
+import time
+
+from src.page_classifier import LinearPageModel, PageClassifier, accuracy, train_classifier
+from src.parsed_page import ParsedPage
+
+LABELS = ["History", "Science", "Music", "Sports", "Politics", "Geography", "Technology", "Film",
+          "Literature", "Biology/Nature", "Religion", "Business"]
+
+
+def make_pages(count, seed=0):
+    """(title, record, [label]) triples; each label's vocabulary overlaps its neighbour's"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "qu", "de"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+    shared = [word() for _ in range(3000)]
+    vocab = {label: [word() for _ in range(150)] for label in LABELS}
+    pages = []
+    for i in range(count):
+        label = LABELS[i % len(LABELS)]
+        neighbour = LABELS[(i + 1) % len(LABELS)]
+        words = []
+        for _ in range(rng.randint(30, 200)):
+            draw = rng.random()
+            source = vocab[label] if draw < 0.12 else vocab[neighbour] if draw < 0.18 else shared
+            words.append(rng.choice(source))
+        categories = [f"{rng.choice(vocab[label])} {rng.choice(shared)}"] if rng.random() < 0.5 else []
+        categories.append(f"{rng.choice(shared)} stubs")
+        record = {"lead_text": " ".join(words), "categories": categories,
+                  "infobox": {key: "" for key in rng.sample(shared[:40], 3)}}
+        pages.append((f"{word().title()}_{i}", record, [label]))
+    return pages
+
+
+def page_html(title, record, page_kb):
+    """A record rendered as article markup, padded with navbox filler to about page_kb"""
+    rows = "".join(f"<tr><th scope=\"row\">{key}</th><td>x</td></tr>" for key in record["infobox"])
+    categories = "".join(f"<li><a href=\"/wiki/Category:{category.replace(' ', '_')}\">{category}</a></li>"
+                         for category in record["categories"])
+    head = (f"<html><body><h1 id=\"firstHeading\">{title}</h1><div id=\"mw-content-text\">"
+            f"<div class=\"mw-parser-output\"><table class=\"infobox\"><tbody>{rows}</tbody></table>"
+            f"<p>{html.escape(record['lead_text'])}<sup class=\"reference\"><a href=\"#n1\">[1]</a></sup></p>"
+            f"<div class=\"mw-heading mw-heading2\"><h2 id=\"History\">History</h2></div>")
+    filler = "<div class=\"navbox\"><p>Lorem ipsum <a href=\"/wiki/Filler\">dolor</a> sit amet.</p></div>"
+    tail = (f"</div></div><div id=\"catlinks\" class=\"catlinks\"><div id=\"mw-normal-catlinks\"><ul>"
+            f"{categories}</ul></div></div></body></html>")
+    padding = filler * max(0, (page_kb * 1024 - len(head) - len(tail)) // len(filler))
+    return (head + padding + tail).encode("utf-8")
+
+
+def throughput(classifier, pages, page_kb):
+    """(end-to-end pages/s from raw HTML, model-only pages/s on ready records)"""
+    documents = [(title, page_html(title, record, page_kb)) for title, record, _ in pages]
+    start = time.perf_counter()
+    for title, html_content in documents:
+        classifier.classify(ParsedPage(html_content, f"https://en.wikipedia.org/wiki/{title}"), title)
+    end_to_end = len(pages) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for title, record, _ in pages:
+        classifier.classify_record(title, record)
+    return end_to_end, len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20_000)
+    parser.add_argument("--test-pages", type=int, default=2_000)
+    parser.add_argument("--features", type=int, nargs="+", default=[2 ** 12, 2 ** 15, 2 ** 18, 2 ** 20])
+    parser.add_argument("--page-kb", type=int, default=100, help="size of the rendered article pages")
+    parser.add_argument("--zero-shot", action="store_true")
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages + args.test_pages)
+    train, test = pages[args.test_pages:], pages[:args.test_pages]
+    with tempfile.TemporaryDirectory() as root:
+        for n_features in args.features:
+            for bigrams in (False, True):
+                start = time.perf_counter()
+                model = train_classifier(train, n_features, bigrams)
+                trained = time.perf_counter() - start
+                path = os.path.join(root, "model.npz")
+                model.save(path)
+                classifier = PageClassifier(model=LinearPageModel.load(path), min_confidence=0)
+                end_to_end, model_only = throughput(classifier, test, args.page_kb)
+                print(f"features 2^{n_features.bit_length() - 1:<2} bigrams {str(bigrams):<5}  "
+                      f"accuracy {accuracy(classifier.model, test):.3f}  "
+                      f"{end_to_end:7.0f} pages/s ({model_only:6.0f} model only)  "
+                      f"model {os.path.getsize(path) / 1024:7.0f} KB  trained in {trained:.1f}s")
+
+    if args.zero_shot:
+        from src.topic_classifier import TopicClassifier
+        zero_shot = TopicClassifier(small=True, cache_size=0).warm_up()
+        sample = test[:64]
+        texts = [f"{title}. {record['lead_text']}" for title, record, _ in sample]
+        start = time.perf_counter()
+        zero_shot.classify_batch(texts, LABELS)
+        print(f"zero-shot (small model, batched)  {len(sample) / (time.perf_counter() - start):8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
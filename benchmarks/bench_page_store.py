@@ -0,0 +1,76 @@
+# bench_page_store.py
+"""
+Page store write throughput and on-disk footprint:
+
+  json:   PageDataStore, one pretty-printed file per page (the original layout)
+  sqlite: SQLitePageDataStore, write-behind batches committed to one WAL database
+
+Records look like what the crawler stores: --links-per-page link URLs, an infobox,
+categories and a lead paragraph. "save" is the time the crawler thread spends in
+save_page_data; "durable" also includes the final flush.
+
+Run from the repository root:
+    python -m benchmarks.bench_page_store --pages 20000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from src.data_store import PageDataStore, SQLitePageDataStore
+
+
+def make_record(i, links_per_page):
+    title = f"Article_{i}"
+    return title, {
+        "url": f"http://en.wikipedia.org/wiki/{title}",
+        "title": title,
+        "links": [f"http://en.wikipedia.org/wiki/Article_{(i * 31 + j) % 100000}" for j in range(links_per_page)],
+        "crawled_at": time.time(),
+        "category": None,
+        "infobox": {"Occupation": "Plumber", "Genre": "Jazz"},
+        "categories": ["Living people", "Plumbers", "Jazz musicians"],
+        "lead_text": "Lorem ipsum dolor sit amet. " * 20,
+    }
+
+
+def disk_usage(path):
+    files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    return len(files), sum(os.path.getsize(f) for f in files)
+
+
+def run(name, make_store, records):
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = make_store(data_dir)
+        with contextlib.redirect_stdout(io.StringIO()):  # save_json prints every file
+            start = time.perf_counter()
+            for title, data in records:
+                store.save_page_data(title, data)
+            saved = time.perf_counter() - start
+            store.flush()
+            durable = time.perf_counter() - start
+        store.close()
+        files, size = disk_usage(data_dir)
+    pages = len(records)
+    print(f"{name:<8} save {pages / saved:9.0f} pages/s  durable {pages / durable:9.0f} pages/s  "
+          f"files={files:<7} size={size / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20000)
+    parser.add_argument("--links-per-page", type=int, default=150)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    records = [make_record(i, args.links_per_page) for i in range(args.pages)]
+    run("json", PageDataStore, records)
+    run("sqlite", lambda d: SQLitePageDataStore(d, batch_size=args.batch_size,
+                                                flush_interval=args.flush_interval), records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_path_solver.py
+"""
+PathSolver query latency over random title pairs on a synthetic link graph.
+
+The graph has --nodes articles with --links-per-page outgoing links each, drawn with a
+popularity skew (a few articles are linked from everywhere, like real hub pages).
+The default is 5M edges. Reports p50/p90/p99 latency and the path-length histogram.
+--astar also times embedding-guided A* with SemanticEmbedder (needs torch and the model).
+
+Run from the repository root:
+    python -m benchmarks.bench_path_solver --nodes 100000 --links-per-page 50 --queries 500
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from src.link_graph import LinkGraph
+from src.path_solver import PathSolver
+
+
+def make_graph(nodes, links_per_page, seed=0):
+    rng = np.random.default_rng(seed)
+    sources = np.repeat(np.arange(nodes, dtype=np.int32), links_per_page)
+    # Zipf-like target popularity: ID k is picked with weight ~ 1 / (k + 10)
+    weights = 1.0 / (np.arange(nodes) + 10.0)
+    targets = rng.choice(nodes, size=len(sources), p=weights / weights.sum()).astype(np.int32)
+    permutation = rng.permutation(nodes).astype(np.int32)  # hubs get scattered IDs
+    return LinkGraph.from_edges([f"Article_{i}" for i in range(nodes)], sources, permutation[targets])
+
+
+def run(name, solve, pairs):
+    latencies, lengths = [], Counter()
+    for start, target in pairs:
+        began = time.perf_counter()
+        path = solve(start, target)
+        latencies.append(time.perf_counter() - began)
+        lengths[len(path) - 1 if path else None] += 1
+    p50, p90, p99 = np.percentile(np.array(latencies) * 1000, [50, 90, 99])
+    print(f"{name:<6} p50 {p50:7.2f} ms  p90 {p90:7.2f} ms  p99 {p99:7.2f} ms  max {max(latencies) * 1000:7.2f} ms")
+    print(f"       clicks: {dict(sorted(lengths.items(), key=lambda item: (item[0] is None, item[0] or 0)))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--links-per-page", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--astar", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = make_graph(args.nodes, args.links_per_page)
+    print(f"graph: {graph.num_nodes} nodes, {graph.num_edges} edges, built in {time.perf_counter() - start:.1f}s")
+
+    rng = np.random.default_rng(1)
+    pairs = [(f"Article_{a}", f"Article_{b}") for a, b in rng.integers(0, args.nodes, size=(args.queries, 2))]
+
+    solver = PathSolver(graph)
+    run("bfs", solver.shortest_path, pairs)
+
+    if args.astar:
+        from src.semantic_embedder import SemanticEmbedder
+        solver = PathSolver(graph, embedder=SemanticEmbedder())
+        run("astar", solver.astar_path, pairs[:50])
+
+
+if __name__ == "__main__":
+    main()
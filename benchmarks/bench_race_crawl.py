@@ -0,0 +1,86 @@
+# bench_race_crawl.py
+"""
+Fetches-to-solution for one game round on the topical fixture graph, where titles and
+categories carry topic signal the way real articles do:
+
+  bfs:      RaceCrawler with all weights at zero, i.e. the plain crawl's BFS order
+  tokens:   title-token overlap only
+  guided:   title-token overlap + category overlap (the default)
+  +embed:   adds SemanticEmbedder similarity (--embed, needs torch and the model)
+
+Each round races from a random start to a random target in another topic.
+
+Run from the repository root:
+    python -m benchmarks.bench_race_crawl --rounds 10
+"""
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import tempfile
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from benchmarks.wiki_fixtures import make_topical_article_html, topical_titles
+from src.race_crawler import RaceCrawler
+
+STRATEGIES = {
+    "bfs": dict(token_weight=0, category_weight=0),
+    "tokens": dict(category_weight=0),
+    "guided": dict(),
+}
+
+
+def race(server, start, target, budget, embedder=None, **weights):
+    with tempfile.TemporaryDirectory() as data_dir:
+        crawler = RaceCrawler(f"{server.base_url}/wiki/{start}", target, num_threads=1, requests_per_second=None,
+                              base_url=server.base_url, data_dir=data_dir, max_fetches=budget,
+                              embedder=embedder, **weights)
+        with contextlib.redirect_stdout(io.StringIO()):
+            crawler.start_crawl()
+        crawler.data_store.close()
+    return crawler.fetches, crawler.path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--per-topic", type=int, default=200)
+    parser.add_argument("--links-per-page", type=int, default=30)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--embed", action="store_true")
+    args = parser.parse_args()
+
+    strategies = dict(STRATEGIES)
+    embedder = None
+    if args.embed:
+        from src.semantic_embedder import SemanticEmbedder
+        embedder = SemanticEmbedder()
+        strategies["+embed"] = dict(embedder=embedder)
+
+    titles = topical_titles(args.per_topic)
+    rng = random.Random(0)
+    rounds = []
+    while len(rounds) < args.rounds:
+        start, target = rng.sample(titles, 2)
+        if start.split("_")[0] != target.split("_")[0]:
+            rounds.append((start, target))
+
+    results = {name: [] for name in strategies}
+    with MockWikiServer(titles, links_per_page=args.links_per_page, page_kb=2,
+                        page_builder=make_topical_article_html) as server:
+        for start, target in rounds:
+            line = f"{start:>24} -> {target:<24}"
+            for name, weights in strategies.items():
+                fetches, path = race(server, start, target, args.budget, **weights)
+                results[name].append(fetches if path else args.budget)
+                line += f"  {name} {fetches:5d}{'' if path else '!'} ({len(path) - 1 if path else '-'} clicks)"
+            print(line)
+
+    print()
+    for name, fetches in results.items():
+        print(f"{name:<8} median {statistics.median(fetches):7.0f} fetches  mean {statistics.mean(fetches):7.1f}")
+
+
+if __name__ == "__main__":
+    main()
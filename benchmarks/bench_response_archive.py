@@ -0,0 +1,102 @@
+# bench_response_archive.py
+"""
+Measures the ResponseArchive: put/get throughput and compression ratio over fixture pages,
+then how fast ArchiveReprocessor re-parses a crawl from the archive compared with
+re-crawling the same pages from a local Wikipedia stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_archive
+    python -m benchmarks.bench_response_archive --pages 2000 --page-kb 100 --latency 0.05
+
+The fixture pages repeat one filler sentence, so they compress far better than real
+articles; expect ratios around 4-6x on Wikipedia HTML rather than what is printed here.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from benchmarks.wiki_fixtures import CORPUS_TITLES, make_article_html
+from src.archive_reprocessor import ArchiveReprocessor
+from src import response_archive
+from src.response_archive import ResponseArchive
+from src.wiki_config import POOL_SIZE
+from src.wiki_crawler import WikiCrawler
+
+
+def bench_put_get(pages, page_kb, compression):
+    bodies = [(f"http://mock/wiki/{title}", make_article_html(title, page_kb=page_kb))
+              for title in CORPUS_TITLES[:pages]]
+    with tempfile.TemporaryDirectory() as path:
+        archive = ResponseArchive(path, compression=compression)
+        start = time.perf_counter()
+        for url, body in bodies:
+            archive.put(url, body, etag=f'"{url}"')
+        put_seconds = time.perf_counter() - start
+
+        urls = [url for url, _ in bodies]
+        random.Random(0).shuffle(urls)
+        start = time.perf_counter()
+        for url in urls:
+            archive.get(url)
+        get_seconds = time.perf_counter() - start
+
+        mib_per_second = archive.bytes_in / put_seconds / 2 ** 20
+        print(f"{archive.codec:<5} put {pages / put_seconds:8.0f} pages/s ({mib_per_second:6.1f} MiB/s)  "
+              f"get {pages / get_seconds:8.0f} pages/s  ratio {archive.bytes_in / archive.bytes_stored:5.1f}x  "
+              f"{archive.bytes_stored / 2 ** 20:.1f} MiB on disk")
+        archive.close()
+
+
+def bench_reprocess(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ResponseArchive(os.path.join(tmp, "archive"))
+        with MockWikiServer(links_per_page=args.links_per_page, page_kb=args.page_kb,
+                            latency=args.latency) as server:
+            crawler = WikiCrawler(f"{server.base_url}/wiki/Article_0", num_threads=POOL_SIZE,
+                                  requests_per_second=None, base_url=server.base_url,
+                                  data_dir=os.path.join(tmp, "crawl"), max_depth=args.max_depth,
+                                  max_pages_per_depth=args.max_pages_per_depth, response_archive=archive)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                crawler.start_crawl()
+                crawl_seconds = time.perf_counter() - start
+            base_url = server.base_url
+
+        print(f"crawl       pages={crawler.pages_crawled:<6} time={crawl_seconds:7.2f}s  "
+              f"pages/sec={crawler.pages_crawled / crawl_seconds:8.1f}  (latency={args.latency}s)")
+        for num_parsers in sorted({0, args.parsers or os.cpu_count() or 1}):
+            reprocessor = ArchiveReprocessor(archive, num_parsers=num_parsers, base_url=base_url,
+                                             data_dir=os.path.join(tmp, f"reprocessed_{num_parsers}"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                reprocessor.start_crawl()
+                elapsed = time.perf_counter() - start
+            print(f"reprocess   pages={reprocessor.pages_crawled:<6} time={elapsed:7.2f}s  "
+                  f"pages/sec={reprocessor.pages_crawled / elapsed:8.1f}  parsers={num_parsers}  "
+                  f"speedup={crawl_seconds / elapsed:.1f}x")
+        archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000, help="pages for the put/get measurement")
+    parser.add_argument("--page-kb", type=int, default=50, help="approximate article size (KB)")
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="server-side delay per request (s)")
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--max-pages-per-depth", type=int, default=20)
+    parser.add_argument("--parsers", type=int, default=None, help="parser processes (default: all cores)")
+    args = parser.parse_args()
+
+    for compression in ("zstd", "gzip") if response_archive.zstandard is not None else ("gzip",):
+        bench_put_get(args.pages, args.page_kb, compression)
+    bench_reprocess(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# bench_startup.py
+"""
+Startup time and peak RSS of main.py-style entry points, each in a fresh interpreter:
+
+  crawler:      the imports main.py makes, no NLP
+  nlp lazy:     also constructs a SemanticEmbedder and a TopicClassifier, which no
+                longer import torch/transformers or load a model until first use
+  eager import: crawler plus `import torch, transformers`, what every process that
+                touched the NLP modules paid before loading was deferred
+  nlp warm:     also calls warm_up() on both, loading the models (--warm)
+
+Cases that need torch/transformers are reported as failed when those are not installed.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 5 --warm
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+_CRAWLER = """
+from src.wiki_crawler import WikiCrawler
+from src.async_crawler import AsyncWikiCrawler
+from src.pipeline_crawler import PipelinedWikiCrawler
+from src.race_crawler import RaceCrawler
+from src.link_graph import LinkGraph
+from src.path_solver import PathSolver
+"""
+_NLP = _CRAWLER + """
+from src.semantic_embedder import SemanticEmbedder
+from src.topic_classifier import TopicClassifier
+embedder = SemanticEmbedder()
+classifier = TopicClassifier()
+"""
+_REPORT = """
+import resource, sys
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024))
+"""
+
+CASES = {
+    "crawler": _CRAWLER,
+    "nlp lazy": _NLP,
+    "eager import": _CRAWLER + "import torch, transformers\n",
+    "nlp warm": _NLP + "embedder.warm_up()\nclassifier.warm_up()\nassert classifier.classifier is not None, \"models did not load\"\n",
+}
+
+
+def run_case(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code + _REPORT], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    return elapsed, int(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warm", action="store_true", help="also time loading the models")
+    args = parser.parse_args()
+
+    for name, code in CASES.items():
+        if name == "nlp warm" and not args.warm:
+            continue
+        times, rss = [], []
+        for _ in range(args.runs if name != "nlp warm" else 1):
+            elapsed, peak = run_case(code)
+            if elapsed is None:
+                print(f"{name:<14} failed: {peak}")
+                break
+            times.append(elapsed)
+            rss.append(peak)
+        else:
+            print(f"{name:<14} startup {statistics.median(times) * 1000:8.0f} ms  "
+                  f"peak RSS {max(rss) / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# bench_topic_classifier.py
+"""
+TopicClassifier latency and throughput on CPU, per page against a fixed label set:
+
+  pipeline:       transformers zero-shot pipeline, one page per call (the old path)
+  classify_batch: hypotheses tokenized once, pairs from many pages per model call,
+                  at each --batch-sizes value
+  cached:         classify_batch again with the text-hash cache warm
+  --small:        the same, with TOPIC_MODEL_SMALL
+
+Pages are synthetic lead sections like a crawl's. Needs torch, transformers and
+the models (downloaded on first use).
+
+Run from the repository root:
+    python -m benchmarks.bench_topic_classifier --pages 64 --small
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+from transformers import pipeline
+
+from benchmarks.bench_embeddings import make_texts
+from src.topic_classifier import TopicClassifier
+from src.wiki_config import TOPIC_MODEL, TOPIC_MODEL_SMALL
+
+LABELS = ["history", "science", "music", "sports", "politics", "geography", "technology", "art"]
+
+
+def report(name, latencies, pages):
+    p50 = np.percentile(np.array(latencies) * 1000, 50)
+    print(f"{name:<26} {pages / sum(latencies):8.2f} pages/s  p50 {p50:9.1f} ms/page")
+
+
+def bench_model(model_name, texts, args):
+    print(f"--- {model_name}")
+    zero_shot = pipeline("zero-shot-classification", model=model_name)
+    zero_shot(texts[0], LABELS, multi_label=True)  # warm up
+    latencies = []
+    for text in texts[:args.pipeline_pages]:
+        start = time.perf_counter()
+        zero_shot(text, LABELS, multi_label=True)
+        latencies.append(time.perf_counter() - start)
+    report("pipeline", latencies, len(latencies))
+    del zero_shot
+
+    classifier = TopicClassifier(model_name=model_name, cache_size=0)
+    classifier.classify_batch(texts[:2], LABELS)  # warm up
+    for batch_size in args.batch_sizes:
+        classifier.batch_size = batch_size
+        start = time.perf_counter()
+        classifier.classify_batch(texts, LABELS)
+        elapsed = time.perf_counter() - start
+        report(f"classify_batch bs={batch_size}", [elapsed / len(texts)] * len(texts), len(texts))
+
+    classifier.cache_size = len(texts)
+    classifier.classify_batch(texts, LABELS)
+    start = time.perf_counter()
+    classifier.classify_batch(texts, LABELS)
+    elapsed = time.perf_counter() - start
+    report("cached", [elapsed / len(texts)] * len(texts), len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--pipeline-pages", type=int, default=16, help="pages timed on the slow pipeline path")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--threads", type=int, default=4, help="torch CPU thread budget")
+    parser.add_argument("--small", action="store_true", help="also run TOPIC_MODEL_SMALL")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    texts = [text for text in make_texts(args.pages * 3) if len(text.split()) > 10][:args.pages]
+    print(f"{len(texts)} pages x {len(LABELS)} labels, {args.threads} threads")
+    bench_model(TOPIC_MODEL, texts, args)
+    if args.small:
+        bench_model(TOPIC_MODEL_SMALL, texts, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_url_frontier.py
+"""
+Bytes per URL of the crawler's seen-set and frontier structures:
+    seen set:  Python set of URL strings vs CompactURLSet (64-bit hashes) vs BloomFilter (1%)
+    frontier:  queue.Queue of (url, depth) tuples vs SpillingFrontier (RAM-bounded)
+
+Memory is measured with tracemalloc and includes the URL strings each structure keeps alive.
+
+Run from the repository root:
+    python -m benchmarks.bench_url_frontier --sizes 1000000 10000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from queue import Queue
+
+from src.url_frontier import BloomFilter, CompactURLSet, SpillingFrontier
+
+
+def urls(count):
+    return (f"http://en.wikipedia.org/wiki/Article_{i}" for i in range(count))
+
+
+def measure(name, build, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    structure = build(count)
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {name:<28} {used / count:7.1f} bytes/URL  {used / 2 ** 20:9.1f} MB  build {elapsed:6.1f}s")
+    del structure
+    gc.collect()
+
+
+def build_set(count):
+    seen = set()
+    for url in urls(count):
+        seen.add(url)
+    return seen
+
+
+def build_compact(count):
+    seen = CompactURLSet()
+    for url in urls(count):
+        seen.add(url)
+    return seen
+
+
+def build_bloom(count):
+    seen = BloomFilter(capacity=count, error_rate=0.01)
+    for url in urls(count):
+        seen.add(url)
+    return seen
+
+
+def build_queue(count):
+    frontier = Queue()
+    for url in urls(count):
+        frontier.put((url, 1))
+    return frontier
+
+
+def build_spilling(max_in_memory):
+    def build(count):
+        frontier = SpillingFrontier(max_in_memory=max_in_memory)
+        for url in urls(count):
+            frontier.put((url, 1))
+        return frontier
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--frontier-ram-items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        print(f"{count:,} URLs")
+        print(" seen set")
+        measure("set[str]", build_set, count)
+        measure("CompactURLSet", build_compact, count)
+        measure("BloomFilter (1%)", build_bloom, count)
+        print(" frontier")
+        measure("Queue[(url, depth)]", build_queue, count)
+        measure(f"SpillingFrontier({args.frontier_ram_items:,})", build_spilling(args.frontier_ram_items), count)
+
+
+if __name__ == "__main__":
+    main()
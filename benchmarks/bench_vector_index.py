@@ -0,0 +1,84 @@
+# bench_vector_index.py
+"""
+Related-page query latency and recall@k for VectorIndex, against exact float32 search:
+
+  exact f32:  every row scored, float32 matrix
+  exact int8: every row scored, int8 matrix with per-row scales
+  ivf:        k-means lists, only the --nprobe closest lists scored
+
+Vectors are synthetic unit vectors around topic centres (384-d, like MiniLM),
+so neighbourhoods look like a crawl's. Indexes are saved and memory-mapped, as in use.
+
+Run from the repository root:
+    python -m benchmarks.bench_vector_index --pages 200000 --queries 200
+"""
+import argparse
+import math
+import tempfile
+import time
+
+import numpy as np
+
+from src.vector_index import VectorIndex
+
+
+def make_vectors(count, dim, topics, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(topics, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, topics, size=count)] + 0.6 * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def run(name, index, queries, k, truth, nprobe=None):
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows, _ = index.search(query, k, nprobe)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(rows.tolist()) & expected)
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    print(f"{name:<16} p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  recall@{k} {hits / (k * len(queries)):6.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (default 4*sqrt(pages))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.pages, args.dim, args.topics)
+    titles = [f"Article_{i}" for i in range(args.pages)]
+    query_rows = np.random.default_rng(1).choice(args.pages, size=args.queries, replace=False)
+    queries = vectors[query_rows]
+    nlist = args.nlist or int(4 * math.sqrt(args.pages))
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        VectorIndex.build(titles, vectors).save(f"{root}/f32")
+        VectorIndex.build(titles, vectors, quantize=True).save(f"{root}/int8")
+        print(f"built exact indexes in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        VectorIndex.build(titles, vectors, nlist=nlist).save(f"{root}/ivf")
+        print(f"built IVF index ({nlist} lists) in {time.perf_counter() - start:.1f}s")
+        del vectors
+
+        exact = VectorIndex.load(f"{root}/f32")
+        truth = [set(exact.search(query, args.k)[0].tolist()) for query in queries]
+        print(f"{args.pages} vectors x {args.dim}-d: float32 {exact.vectors.nbytes / 2**20:.0f} MiB")
+
+        run("exact f32", exact, queries, args.k, truth)
+        quantized = VectorIndex.load(f"{root}/int8")
+        print(f"int8 {quantized.vectors.nbytes / 2**20:.0f} MiB")
+        run("exact int8", quantized, queries, args.k, truth)
+        ivf = VectorIndex.load(f"{root}/ivf")
+        for nprobe in args.nprobe:
+            run(f"ivf nprobe={nprobe}", ivf, queries, args.k, truth, nprobe)
+
+
+if __name__ == "__main__":
+    main()
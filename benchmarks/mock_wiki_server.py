@@ -0,0 +1,93 @@
+# mock_wiki_server.py
+"""
+Local HTTP stand-in for Wikipedia. Serves canned article HTML from wiki_fixtures
+under /wiki/<title>, with keep-alive and optional per-request latency.
+"""
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from benchmarks.wiki_fixtures import CORPUS_TITLES, make_article_html
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the default backlog of 5 drops connects under hundreds of concurrent clients
+
+
+class MockWikiServer:
+    def __init__(self, titles=CORPUS_TITLES, links_per_page=150, page_kb=300, latency=0.0, page_builder=None):
+        self.titles = set(titles)
+        self._title_list = list(titles)
+        self.links_per_page = links_per_page
+        self.page_kb = page_kb
+        self.latency = latency
+        self.page_builder = page_builder or make_article_html  # (title, titles, links_per_page, page_kb) -> bytes
+        self.requests_served = 0
+        self.not_modified_served = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, keep-alive clients
+            # wait ~40 ms for the delayed ACK on every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                title = unquote(self.path.rsplit("/", 1)[-1])
+                if not self.path.startswith("/wiki/") or title not in server.titles:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                body = server._page(title)
+                etag = f'"{zlib.crc32(body):08x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    with server._lock:
+                        server.not_modified_served += 1
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=UTF-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.requests_served += 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = _Server(("127.0.0.1", 0), Handler)
+        self._thread = None
+
+    def _page(self, title):
+        body = self._cache.get(title)
+        if body is None:
+            body = self.page_builder(title, self._title_list, self.links_per_page, self.page_kb)
+            self._cache[title] = body
+        return body
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,111 @@
+# profile_page_parsing.py
+"""
+Per-page CPU and allocation profile of the page-handling path, before and after
+sharing one ParsedPage between LinkExtractor, WikiParser and PageClassifier.
+
+  separate:   links parsed with their own soup, body decoded for the classifier,
+              and WikiParser building a third soup
+  shared:     one ParsedPage; links scanned from its bytes, one soup for WikiParser,
+              text decoded only if the classifier reads it. This is what a crawl
+              pays per page with store_article_fields or a trained classifier model.
+  links only: what a default crawl pays per page: links scanned from the bytes,
+              no soup at all (no consumer reads the infobox, categories or lead text)
+
+The soup is most of the shared cost; the last line says how much of it.
+
+Run from the repository root, on saved article HTML or on generated fixtures:
+    python -m benchmarks.profile_page_parsing --pages-dir saved_pages/
+    python -m benchmarks.profile_page_parsing --page-kb 300
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+
+from benchmarks.wiki_fixtures import make_article_html
+from src.link_extractor import LinkExtractor
+from src.page_classifier import PageClassifier
+from src.parsed_page import ParsedPage
+from src.wiki_parser import WikiParser
+
+link_extractor = LinkExtractor()
+wiki_parser = WikiParser(link_extractor=link_extractor)
+page_classifier = PageClassifier(model_path=None)  # no trained model, as in a default crawl
+
+
+def separate_parses(html_content, url):
+    link_extractor.extract_links_soup(html_content)
+    text = html_content.decode('utf-8', errors='ignore')
+    page_classifier.classify(text, url)
+    wiki_parser.parse_articles(html_content, url)
+
+
+def shared_parse(html_content, url):
+    page = ParsedPage(html_content, url)
+    link_extractor.extract_links(page)
+    wiki_parser.parse_articles(page, url)
+    page_classifier.classify(page, url)
+
+
+def links_only(html_content, url):
+    page = ParsedPage(html_content, url)
+    link_extractor.extract_links(page)
+    page_classifier.classify(page, url)  # returns without reading the page
+
+
+def load_pages(pages_dir, count, page_kb):
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.html")))[:count]:
+            with open(path, "rb") as f:
+                pages.append((f.read(), "http://en.wikipedia.org/wiki/" + os.path.basename(path)[:-5]))
+        return pages
+    return [(make_article_html(f"Article_{i}", links_per_page=500, page_kb=page_kb),
+             f"http://en.wikipedia.org/wiki/Article_{i}") for i in range(count)]
+
+
+def profile(path, pages):
+    start = time.process_time()
+    for html_content, url in pages:
+        path(html_content, url)
+    cpu_ms = (time.process_time() - start) * 1000 / len(pages)
+
+    tracemalloc.start()
+    peaks = []
+    for html_content, url in pages:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        path(html_content, url)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return cpu_ms, sum(peaks) / len(peaks) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages-dir", help="directory of saved *.html article pages")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--page-kb", type=int, default=300, help="size of generated pages (no --pages-dir)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.pages, args.page_kb)
+    if not pages:
+        parser.error(f"no *.html pages found in {args.pages_dir}")
+    avg_kb = sum(len(html) for html, _ in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {avg_kb:.0f} KB average")
+
+    results = {}
+    for name, path in (("separate", separate_parses), ("shared", shared_parse), ("links only", links_only)):
+        results[name] = profile(path, pages)
+        cpu_ms, peak_kb = results[name]
+        print(f"{name:<10} cpu={cpu_ms:8.1f} ms/page  peak alloc={peak_kb:9.0f} KB/page")
+
+    (old_cpu, old_peak), (new_cpu, new_peak) = results["separate"], results["shared"]
+    print(f"savings    cpu={100 * (1 - new_cpu / old_cpu):5.1f}%  peak alloc={100 * (1 - new_peak / old_peak):5.1f}%")
+    links_cpu = results["links only"][0]
+    print(f"article    cpu={new_cpu - links_cpu:8.1f} ms/page, {100 * (1 - links_cpu / new_cpu):.1f}% of shared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# wiki_fixtures.py
+"""
+Canned Wikipedia-like article HTML for benchmarks and tests.
+Pages are generated deterministically from their title, so every run sees the same corpus.
+"""
+import random
+from urllib.parse import quote
+
+CORPUS_TITLES = [f"Article_{i}" for i in range(5000)]
+
+_CATEGORY_POOL = ["Video game characters", "Fictional characters", "Scientists", "Films", "Albums",
+                  "Cities", "Countries", "Programming languages", "Battles", "Philosophers"]
+
+_NOISE_LINKS = [
+    "/wiki/Special:Search", "/wiki/Template:Infobox_person", "/wiki/File:Example.jpg",
+    "/wiki/Portal:Science", "/wiki/Help:Contents", "/wiki/Main_Page#History",
+    "#cite_note-1", "https://www.wikidata.org/wiki/Q1", "//en.m.wikipedia.org/wiki/Mario",
+    "/w/index.php?title=Mario&action=edit",
+]
+
+_FILLER = ("The subject is discussed in several sources and has been covered extensively "
+           "in secondary literature, including <b>notable</b> commentary and <i>analysis</i>. ")
+
+
+def article_links(title, titles=CORPUS_TITLES, links_per_page=150):
+    rng = random.Random(title)
+    return rng.sample(titles, min(links_per_page, len(titles)))
+
+
+def make_article_html(title, titles=CORPUS_TITLES, links_per_page=150, page_kb=300, links=None, categories=None):
+    """Builds one article page: heading, infobox, lead, body links, padding and category links."""
+    rng = random.Random(title)
+    links = links if links is not None else article_links(title, titles, links_per_page)
+    sampled_categories = rng.sample(_CATEGORY_POOL, 3)
+    categories = categories if categories is not None else sampled_categories
+    display = title.replace("_", " ")
+
+    parts = [
+        "<!DOCTYPE html>\n<html class=\"client-nojs\" lang=\"en\" dir=\"ltr\"><head>",
+        f"<meta charset=\"UTF-8\"><title>{display} - Wikipedia</title>",
+        "<script>document.documentElement.className=\"client-js\";</script></head><body>",
+        f"<h1 id=\"firstHeading\" class=\"firstHeading\">{display}</h1>",
+        "<div id=\"mw-content-text\"><div class=\"mw-parser-output\">",
+        "<table class=\"infobox\"><tr><th>Occupation</th><td>Plumber<sup class=\"reference\">[1]</sup></td></tr>",
+        f"<tr><th>Genre</th><td><a href=\"/wiki/{quote(links[0])}\">{links[0]}</a></td></tr></table>",
+        f"<p><b>{display}</b> is a fictional subject used as a benchmark fixture.<sup class=\"reference\">[1]</sup></p>",
+        "<div class=\"mw-heading mw-heading2\"><h2 id=\"History\">History</h2></div>",
+    ]
+    for i, target in enumerate(links):
+        parts.append(f"<p>{_FILLER}See <a href=\"/wiki/{quote(target)}\" title=\"{target}\">{target}</a>"
+                     f"<sup class=\"reference\"><a href=\"{_NOISE_LINKS[i % len(_NOISE_LINKS)]}\">[{i}]</a></sup>.</p>")
+
+    body_size = sum(len(p) for p in parts)
+    padding = []
+    while body_size < page_kb * 1024:
+        chunk = f"<div class=\"navbox\"><span>{_FILLER * 4}</span></div>"
+        padding.append(chunk)
+        body_size += len(chunk)
+    parts.extend(padding)
+
+    parts.append("</div></div><div id=\"catlinks\" class=\"catlinks\"><div id=\"mw-normal-catlinks\"><ul>")
+    for cat in categories:
+        parts.append(f"<li><a href=\"/wiki/Category:{quote(cat.replace(' ', '_'))}\">{cat}</a></li>")
+    parts.append("</ul></div></div></body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+# Topical corpus: titles share a topic word with their neighbours, most links stay inside the
+# topic and pages carry a per-topic category, like real article clusters
+TOPICS = ["Jazz", "Volcano", "Football", "Chess", "Orchid", "Galaxy", "Pasta", "Samurai", "Glacier", "Robot"]
+_SUBJECTS = ["history", "festival", "museum", "theory", "society", "league", "school", "record", "award",
+             "journal", "expedition", "archive", "method", "legend", "model", "survey"]
+
+
+def topical_titles(per_topic=200):
+    return [f"{topic}_{_SUBJECTS[i % len(_SUBJECTS)]}_{i}" for topic in TOPICS for i in range(per_topic)]
+
+
+def topical_links(title, titles, links_per_page=30, off_topic=0.15):
+    """Mostly same-topic links; topic entry pages ("<Topic>_history_0") are linked from every topic"""
+    rng = random.Random(title)
+    topic = title.split("_", 1)[0]
+    same = [t for t in titles if t.startswith(topic + "_") and t != title]
+    other = [t for t in titles if not t.startswith(topic + "_")]
+    hubs = [f"{other_topic}_history_0" for other_topic in TOPICS if other_topic != topic]
+    off = max(1, int(links_per_page * off_topic))
+    return rng.sample(same, links_per_page - off) + rng.sample(other, off - 1) + [rng.choice(hubs)]
+
+
+def make_topical_article_html(title, titles, links_per_page=30, page_kb=5):
+    topic = title.split("_", 1)[0]
+    return make_article_html(title, titles, page_kb=page_kb, links=topical_links(title, titles, links_per_page),
+                             categories=[f"{topic} topics", random.Random(title).choice(_CATEGORY_POOL)])
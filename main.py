@@ -1,6 +1,13 @@
 # main.py
 from src.wiki_crawler import WikiCrawler
-from src.wiki_config import WIKIPEDIA_BASE_URL
+from src.async_crawler import AsyncWikiCrawler
+from src.pipeline_crawler import PipelinedWikiCrawler
+from src.race_crawler import RaceCrawler
+from src.archive_reprocessor import ArchiveReprocessor
+from src.response_archive import ResponseArchive
+from src.link_graph import LinkGraph
+from src.path_solver import PathSolver
+from src.wiki_config import WIKIPEDIA_BASE_URL, RESPONSE_ARCHIVE_DIR
 import time
 import sys
 
@@ -16,8 +23,18 @@ if __name__ == "__main__":
     print("2. Moderate (5 threads, 1 request/sec) - Balanced")
     print("3. Aggressive (10 threads, 2 requests/sec) - Faster")
     print("4. Custom configuration")
+    print("5. Asyncio engine (hundreds of concurrent fetches, e.g. for a local mirror)")
+    print("6. Pipelined engine (fetch threads + one parser process per core)")
+    print("7. Race to a target page (best-first crawl, stops when the target is reached)")
+    print("8. Reprocess the response archive (re-parse every archived page, no network)")
+    print("9. Resume the last interrupted crawl from its checkpoint")
 
-    choice = input("\nSelect configuration (1-4) [default: 2]: ").strip()
+    choice = input("\nSelect configuration (1-9) [default: 2]: ").strip()
+    use_async = False
+    use_pipeline = False
+    race_target = None
+    reprocess = False
+    resume = False
 
     if choice == "1":
         num_threads = 2
@@ -30,31 +47,94 @@ if __name__ == "__main__":
         num_threads = max(1, min(20, num_threads))  # Clamp between 1-20
         requests_per_second = float(input("Requests per second (0.1-5): ") or "1")
         requests_per_second = max(0.1, min(5, requests_per_second))  # Clamp between 0.1-5
+    elif choice == "5":
+        use_async = True
+        num_threads = int(input("Number of concurrent fetch tasks (1-1000): ") or "200")
+        num_threads = max(1, min(1000, num_threads))
+        requests_per_second = float(input("Requests per second (0 = unlimited) [default: 2]: ") or "2")
+    elif choice == "6":
+        use_pipeline = True
+        num_threads = 10
+        requests_per_second = float(input("Requests per second (0 = unlimited) [default: 2]: ") or "2")
+    elif choice == "7":
+        race_target = input("Target page title: ").strip() or "Philosophy"
+        num_threads = 5
+        requests_per_second = 1
+    elif choice == "8":
+        reprocess = True
+        num_threads = 0
+        requests_per_second = 0
+    elif choice == "9":
+        resume = True
+        num_threads = 5
+        requests_per_second = 1
     else:  # Default to moderate
         num_threads = 5
         requests_per_second = 1
 
     start_url = f"{WIKIPEDIA_BASE_URL}/wiki/{start_page_title.replace(' ', '_')}"
 
+    # Archived bodies let parser changes be re-run with option 8 instead of a re-crawl. Archiving
+    # costs a compression and a disk write per page, so crawls only do it when asked.
+    response_archive = None
+    if reprocess or input("Archive fetched pages for offline reprocessing? (y/N): ").strip().lower() == "y":
+        response_archive = ResponseArchive(RESPONSE_ARCHIVE_DIR)
+
     # Create and start crawler
-    crawler = WikiCrawler(
-        start_url,
-        num_threads=num_threads,
-        requests_per_second=requests_per_second
-    )
+    if reprocess:
+        crawler = ArchiveReprocessor(response_archive)
+    elif use_async:
+        crawler = AsyncWikiCrawler(
+            start_url,
+            num_workers=num_threads,
+            requests_per_second=requests_per_second,
+            response_archive=response_archive
+        )
+    elif race_target:
+        crawler = RaceCrawler(
+            start_url,
+            race_target,
+            num_threads=num_threads,
+            requests_per_second=requests_per_second,
+            response_archive=response_archive
+        )
+    elif use_pipeline:
+        crawler = PipelinedWikiCrawler(
+            start_url,
+            num_threads=num_threads,
+            requests_per_second=requests_per_second,
+            response_archive=response_archive
+        )
+    else:
+        crawler = WikiCrawler(
+            start_url,
+            num_threads=num_threads,
+            requests_per_second=requests_per_second,
+            response_archive=response_archive
+        )
 
-    print(f"\nStarting crawl from: {start_url}")
-    print(f"Configuration: {num_threads} threads, {requests_per_second} requests/second")
+    if resume:
+        print("\nResuming the interrupted crawl in crawled_data")
+    elif reprocess:
+        print(f"\nReprocessing {len(response_archive)} archived pages from {RESPONSE_ARCHIVE_DIR}")
+    else:
+        print(f"\nStarting crawl from: {start_url}")
+        print(f"Configuration: {num_threads} {'tasks' if use_async else 'threads'}, "
+              f"{requests_per_second or 'unlimited'} requests/second")
     print("Press Ctrl+C to stop crawling gracefully\n")
 
     try:
         start_time = time.time()
-        crawler.start_crawl()
+        if resume:
+            crawler.resume()
+            start_page_title = crawler.link_extractor.get_page_title(crawler.start_url)
+        else:
+            crawler.start_crawl()
         end_time = time.time()
 
     except KeyboardInterrupt:
-        print("\n\nCrawl interrupted by user. Waiting for threads to finish...")
-        # The crawler will handle cleanup gracefully
+        # The crawler finished its in-flight pages and wrote a checkpoint before re-raising
+        print("\n\nCrawl interrupted by user. Run again and pick option 9 to resume it.")
         sys.exit(0)
 
     # Example: Retrieve data for the starting page
@@ -77,10 +157,29 @@ if __name__ == "__main__":
     visited_pages = crawler.get_visited_pages()
     print(f"\nTotal unique pages visited: {len(visited_pages)}")
 
-    # Example: Get related wikis using the API
-    print(f"\nFetching related articles for '{start_page_title}' via API...")
-    related_api = crawler.get_related_wikis_api(start_page_title)
-    if related_api:
-        print(f"Related articles: {', '.join(related_api[:5])}...")
-    else:
-        print("Could not fetch related articles.")
\ No newline at end of file
+    # Example: Get related wikis (local vector index if one is loaded, otherwise the API).
+    # build_page_index embeds each page's lead text, so index a crawl run with store_article_fields=True.
+    # Reprocessing works offline, so it skips the API.
+    if not reprocess:
+        print(f"\nFetching related articles for '{start_page_title}'...")
+        related_api = crawler.get_related_wikis(start_page_title)
+        if related_api:
+            print(f"Related articles: {', '.join(related_api[:5])}...")
+        else:
+            print("Could not fetch related articles.")
+
+    # Wikipedia game: shortest click path from the start page over what was just crawled
+    target_title = input(f"\nFind a click path from '{start_page_title}' to (blank to skip): ").strip()
+    if target_title:
+        graph = LinkGraph.build(crawler.data_store.iter_pages())
+        # The fetcher's own limiter: it is synchronous for every engine, unlike the asyncio engine's rate_limiter.
+        # After a reprocess the search stays inside the archive's pages instead of fetching missing ones.
+        page_fetcher = None if reprocess else crawler.page_fetcher
+        solver = PathSolver(graph, page_fetcher=page_fetcher, rate_limiter=crawler.page_fetcher.rate_limiter)
+        path = solver.shortest_path(start_page_title.replace(' ', '_'), target_title.replace(' ', '_'))
+        if path:
+            print(f"{len(path) - 1} clicks: {' -> '.join(path)}")
+        else:
+            print(f"No path found to '{target_title}'.")
+        if solver.pages_fetched:
+            print(f"Fetched {solver.pages_fetched} pages outside the crawl")
@@ -0,0 +1,121 @@
+# archive_reprocessor.py
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+
+from src.pipeline_crawler import _init_parser_worker, parse_page, parser_pool
+from src.response_archive import ResponseArchive, read_blob
+from src.wiki_config import REPROCESS_BATCH_SIZE, REPROCESS_BATCH_TIMEOUT
+from src.wiki_crawler import WikiCrawler
+
+
+def _parse_archived(archive_path: str, batch) -> list:
+    """
+    Runs in a parser process: reads, decompresses and parses a batch of (url, location)
+    itself, so the parent only ships index rows and never the page bodies.
+    """
+    results = []
+    for url, location in batch:
+        try:
+            results.append((url, parse_page(read_blob(archive_path, *location), url)))
+        except Exception as e:
+            results.append((url, e))
+    return results
+
+
+class ArchiveReprocessor(WikiCrawler):
+    """
+    Re-runs the parsing pipeline (LinkExtractor, WikiParser, PageClassifier) over the latest
+    archived body of every URL in a ResponseArchive and stores the results as a crawl would.
+    Nothing is fetched: there is no frontier and no rate limit, so the run is CPU-bound and
+    uses one parser process per core (num_parsers=0 parses in this process). A parser process
+    that dies raises BrokenProcessPool; one stuck on a batch for batch_timeout seconds is
+    killed and the run raises TimeoutError.
+    """
+
+    def __init__(self, response_archive: ResponseArchive, num_parsers=None, batch_size=REPROCESS_BATCH_SIZE,
+                 batch_timeout=REPROCESS_BATCH_TIMEOUT, store_article_fields=True, **kwargs):
+        # Rebuilding the records is the point here, and nothing waits on the network, so article fields default on
+        super().__init__(None, num_threads=1, requests_per_second=None, response_archive=response_archive,
+                         store_article_fields=store_article_fields, **kwargs)
+        self.num_parsers = (os.cpu_count() or 1) if num_parsers is None else num_parsers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.parse_cpu_seconds = 0.0
+
+    def _batches(self):
+        batch = []
+        for url, etag, last_modified, location in self.response_archive.iter_latest():
+            batch.append((url, etag, last_modified, location))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _store_results(self, batch, results):
+        validators = {url: (etag, last_modified) for url, etag, last_modified, _ in batch}
+        for url, parsed in results:
+            self.visited_urls.add_if_new(url)
+            if isinstance(parsed, Exception):
+                print(f"[Reprocess] Error processing {url}: {parsed}")
+                with self.stats_lock:
+                    self.pages_failed += 1
+                continue
+            # The archived validators stay valid: the next crawl can still send conditional GETs
+            self._store_page(url, parsed["title"], parsed["links"], parsed["category"], parsed["article"],
+                             *validators[url])
+            with self.stats_lock:
+                self.parse_cpu_seconds += parsed["cpu_seconds"]
+
+    def _batch_result(self, worker_pids, future):
+        try:
+            return future.result(timeout=self.batch_timeout)
+        except TimeoutError:
+            # shutdown() would wait for the stuck worker forever, so every worker is killed first,
+            # by the PIDs they reported when they started
+            while not worker_pids.empty():
+                try:
+                    os.kill(worker_pids.get(), getattr(signal, "SIGKILL", signal.SIGTERM))
+                except OSError:
+                    pass  # already gone
+            raise TimeoutError(f"A parser process spent over {self.batch_timeout}s on one batch of "
+                               f"{self.batch_size} pages; reprocessing aborted") from None
+
+    def start_crawl(self):
+        """Reprocess the whole archive"""
+        start_time = time.time()
+        archive_path = self.response_archive.path
+        print(f"Reprocessing {archive_path} with {self.num_parsers or 'no'} parser processes...")
+
+        if self.num_parsers == 0:
+            _init_parser_worker(self.link_extractor.base_url, self.store_article_fields)
+            for batch in self._batches():
+                self._store_results(batch, _parse_archived(archive_path, [(b[0], b[3]) for b in batch]))
+        else:
+            worker_pids = multiprocessing.get_context("spawn").SimpleQueue()
+            executor = parser_pool(self.num_parsers, self.link_extractor.base_url, self.store_article_fields,
+                                   worker_pids)
+            try:
+                # Two batches in flight per process keeps every core busy without reading ahead unboundedly
+                in_flight = deque()
+                for batch in self._batches():
+                    in_flight.append((batch, executor.submit(_parse_archived, archive_path,
+                                                             [(b[0], b[3]) for b in batch])))
+                    if len(in_flight) >= 2 * self.num_parsers:
+                        done, future = in_flight.popleft()
+                        self._store_results(done, self._batch_result(worker_pids, future))
+                while in_flight:
+                    done, future = in_flight.popleft()
+                    self._store_results(done, self._batch_result(worker_pids, future))
+            finally:
+                executor.shutdown(cancel_futures=True)
+                worker_pids.close()
+
+        self.data_store.close()
+
+        elapsed = time.time() - start_time
+        self._print_final_stats(elapsed)
+        print(f"Reprocessed {self.pages_crawled / elapsed if elapsed else 0.0:.1f} pages/sec\n")
@@ -0,0 +1,249 @@
+# async_crawler.py
+import asyncio
+import time
+
+import aiohttp
+
+from src.http_session import host_of
+from src.page_fetcher import FetchResult, THROTTLE_STATUSES
+from src.rate_limiter import ARTICLE_ENDPOINT, AsyncRateLimiter, parse_retry_after
+from src.wiki_config import ASYNC_NUM_WORKERS, ASYNC_POOL_SIZE
+from src.wiki_crawler import LOG_LEVELS, WikiCrawler
+
+
+class AsyncPageFetcher:
+    """
+    Async counterpart of PageFetcher. All fetches share one aiohttp session,
+    so connections are kept alive and reused across worker tasks.
+    """
+
+    def __init__(self, pool_size=ASYNC_POOL_SIZE, retries=3, delay=1, timeout=10, rate_limiter=None,
+                 endpoint=ARTICLE_ENDPOINT):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.delay = delay
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.endpoint = endpoint
+        self._session = None
+        self._connection_stats = {}
+
+    def _host_stats(self, host):
+        return self._connection_stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+
+    async def _on_request_start(self, session, ctx, params):
+        self._host_stats(ctx.trace_request_ctx["host"])["requests"] += 1
+
+    async def _on_connection_create_end(self, session, ctx, params):
+        self._host_stats(ctx.trace_request_ctx["host"])["connections"] += 1
+
+    async def _on_connection_reuseconn(self, session, ctx, params):
+        self._host_stats(ctx.trace_request_ctx["host"])["reused"] += 1
+
+    async def __aenter__(self):
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[trace_config],
+        )
+        return self
+
+    def connection_stats(self) -> dict:
+        """Per-host request and connection counts, same shape as SessionPool.connection_stats"""
+        return {host: dict(counts) for host, counts in self._connection_stats.items()}
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    async def fetch(self, url: str) -> bytes | None:
+        """
+        Fetches the content of a given URL with retries and backoff.
+        Returns content as bytes, or None on failure.
+        """
+        return (await self.fetch_conditional(url)).content
+
+    async def fetch_conditional(self, url: str, etag: str = None, last_modified: str = None) -> FetchResult:
+        """Async counterpart of PageFetcher.fetch_conditional"""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        for i in range(self.retries):
+            throttled = False
+            try:
+                async with self._session.get(url, headers=headers,
+                                             trace_request_ctx={"host": host_of(url)}) as response:
+                    if response.status == 304:
+                        self._record_success()
+                        return FetchResult(None, 304, etag, last_modified)
+                    if response.status in THROTTLE_STATUSES:
+                        throttled = self._throttle(response.status, response.headers.get("Retry-After"))
+                    response.raise_for_status()
+                    self._record_success()
+                    return FetchResult(await response.read(), response.status,
+                                       response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            except asyncio.TimeoutError:
+                print(f"Timeout fetching {url}. Attempt {i + 1}/{self.retries}")
+            except aiohttp.ClientError as e:
+                print(f"Error fetching {url}: {e}. Attempt {i + 1}/{self.retries}")
+
+            if i < self.retries - 1:  # Don't sleep after last attempt
+                if throttled:
+                    await self.rate_limiter.wait_if_needed(self.endpoint)  # honours Retry-After
+                else:
+                    await asyncio.sleep(self.delay * (i + 1))
+        return FetchResult(None, None)
+
+    def _throttle(self, status, retry_after_header) -> bool:
+        """Same policy as PageFetcher._throttle"""
+        if self.rate_limiter is None:
+            return False
+        retry_after = parse_retry_after(retry_after_header)
+        if status == 503 and retry_after is None:
+            return False
+        return self.rate_limiter.throttle(self.endpoint, retry_after)
+
+    def _record_success(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success(self.endpoint)
+
+
+class AsyncWikiCrawler(WikiCrawler):
+    """
+    asyncio crawl engine. Runs a bounded number of worker tasks on one event loop
+    instead of one OS thread per worker, so hundreds of fetches can be in flight.
+    Page handling, storage and stats are shared with WikiCrawler.
+    """
+
+    def __init__(self, start_url, num_workers=ASYNC_NUM_WORKERS, requests_per_second=1,
+                 pool_size=ASYNC_POOL_SIZE, **kwargs):
+        super().__init__(start_url, num_threads=1, requests_per_second=requests_per_second, **kwargs)
+        self.num_workers = num_workers
+        self.pool_size = pool_size
+        self.rate_limiter = AsyncRateLimiter(self.rate_limiter.requests_per_second, burst=self.rate_limiter.burst,
+                                             endpoint_rates=self.rate_limiter.endpoint_rates())
+        self.frontier = None
+        self._fetcher_stats = {}
+        self._loop = None
+        self._stopped = None  # asyncio.Event set by stop()
+
+    async def _async_process_page(self, fetcher, url, current_depth):
+        """Async equivalent of WikiCrawler._process_page"""
+        stage = self.metrics.stage
+        if self.log_level <= LOG_LEVELS["debug"]:
+            print(f"[Task] Crawling: {url} (Depth: {current_depth})")
+
+        try:
+            page_title = self.link_extractor.get_page_title(url)
+            stored_page = await asyncio.to_thread(self._load_stored_page, page_title)
+            if self._stored_before_resume(stored_page):
+                return self._handle_stored_before_resume(stored_page, current_depth)
+            start = time.perf_counter()
+            await self.rate_limiter.wait_if_needed()
+            stage["rate_limit_wait"].observe(time.perf_counter() - start)
+            with self.metrics.in_flight.track(), stage["fetch"].time():
+                result = await fetcher.fetch_conditional(url, stored_page.get("etag"),
+                                                         stored_page.get("last_modified"))
+            self._count_fetch(result)
+            if result.not_modified:
+                return self._handle_not_modified(stored_page, current_depth)
+            # Parsing and storing are blocking, keep them off the event loop
+            return await asyncio.to_thread(self._handle_page_content, url, current_depth, result.content,
+                                           result.etag, result.last_modified)
+
+        except Exception as e:
+            print(f"[Task] Error processing {url}: {e}")
+            with self.stats_lock:
+                self.pages_failed += 1
+            return None
+
+    async def _async_worker(self, fetcher):
+        """Worker task: pulls from the frontier until cancelled"""
+        while True:
+            url, depth = await self.frontier.get()
+            try:
+                if depth >= self.max_depth:
+                    continue
+
+                result = await self._async_process_page(fetcher, url, depth)
+
+                if result:
+                    # Add new links to frontier
+                    self._enqueue_links(*result, parent_url=url)
+
+            except Exception as e:
+                print(f"[Task] Worker error: {e}")
+            finally:
+                self.frontier.task_done()
+
+    def _queue_depth(self):
+        return self.frontier.qsize() if self.frontier is not None else 0
+
+    def _enqueue(self, url, depth):
+        self.frontier.put_nowait((url, depth))
+
+    def _enqueue_many(self, items):
+        for item in items:
+            self.frontier.put_nowait(item)
+
+    async def _async_monitor(self, start_time):
+        while True:
+            await asyncio.sleep(10)
+            self._print_progress(start_time, f"Worker tasks: {self.num_workers}")
+
+    def stop(self):
+        super().stop()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _crawl(self, start_time):
+        self.frontier = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._enqueue_start()
+        self._start_metrics()
+
+        async with AsyncPageFetcher(pool_size=self.pool_size, rate_limiter=self.rate_limiter) as fetcher:
+            tasks = [asyncio.create_task(self._async_worker(fetcher)) for _ in range(self.num_workers)]
+            tasks.append(asyncio.create_task(self._async_monitor(start_time)))
+
+            # Every item is marked done only after its links were enqueued,
+            # so join() returns exactly when the crawl has run out of work.
+            waiters = [asyncio.create_task(self.frontier.join()), asyncio.create_task(self._stopped.wait())]
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            tasks += waiters
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._fetcher_stats = fetcher.connection_stats()
+
+    def start_crawl(self):
+        """Start the asyncio crawl"""
+        start_time = time.time()
+
+        print(f"Starting async crawl with {self.num_workers} worker tasks "
+              f"(connection pool: {self.pool_size})...")
+        self._print_rate_limit()
+
+        try:
+            asyncio.run(self._crawl(start_time))
+        finally:
+            # Also on Ctrl+C: pages in flight are not in the checkpoint and are redone on resume
+            self.data_store.close()
+            self._close_checkpoint()
+            self._stop_metrics()
+
+        self._print_final_stats(time.time() - start_time)
+
+    def _connection_stats(self):
+        return self._fetcher_stats
@@ -0,0 +1,410 @@
+# category_index.py
+import argparse
+from array import array
+from bisect import bisect_right
+import json
+import math
+import os
+import re
+import zlib
+
+import numpy as np
+
+from src.wiki_config import CATEGORY_CLOSURE_DEPTH
+
+_META_FILE = "meta.json"
+_ARRAYS = ("parent_offsets", "parents", "closure_offsets", "ancestors", "depths")
+_NAME_ARRAYS = ("name_offsets", "name_blob", "name_table")
+_COMPILED_SUFFIX = ".index"  # a JSON mapping file's compiled index is kept beside it
+_MAX_VALUE_CHARS = 1 << 26  # a single mapping entry longer than this is treated as malformed JSON
+_CLOSURE_BLOCK = 1 << 16  # categories whose closure rows are built together
+_DECODED_NAMES = 1 << 16  # category names kept decoded per index
+_WHITESPACE = re.compile(r"\s*")
+_COMPLETE = 255  # max_depth of a closure that holds every ancestor, however deep
+
+
+def _clean(category: str) -> str:
+    return category.replace("Category:", "").strip()
+
+
+def _gather(offsets: np.ndarray, values: np.ndarray, nodes: np.ndarray):
+    """(position in nodes, value) for every CSR entry of every node, without a Python loop"""
+    starts, counts = offsets[nodes], offsets[nodes + 1] - offsets[nodes]
+    owners = np.repeat(np.arange(len(nodes)), counts)
+    positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+    return owners, values[positions]
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """np.unique by sorting; much faster than its hash table on tens of millions of int64 keys"""
+    values = np.sort(values)
+    if len(values):
+        values = values[np.concatenate(([True], values[1:] != values[:-1]))]
+    return values
+
+
+def _in_sorted(values: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    """Mask of values found in sorted_keys"""
+    if not len(sorted_keys):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, values), len(sorted_keys) - 1)
+    return sorted_keys[positions] == values
+
+
+def _name_key(encoded: bytes) -> int:
+    """Hash-table key of a name: crc32 (cheap; names are compared on a match) and length, never 0"""
+    return (len(encoded) << 32 | zlib.crc32(encoded)) + 1
+
+
+class CategoryNames:
+    """
+    Interned category names: one UTF-8 blob with per-ID offsets, and an open-addressing
+    table of (name key, ID) pairs for name -> ID lookups. All three are flat arrays,
+    so a saved index maps them from disk instead of rebuilding a dict of millions of strings.
+    """
+
+    def __init__(self, name_offsets, name_blob, name_table):
+        self.name_offsets, self.name_blob, self.name_table = name_offsets, name_blob, name_table
+        # memoryviews index to plain ints and bytes, without numpy's per-item overhead
+        self._offsets = memoryview(name_offsets)
+        self._blob = memoryview(name_blob)
+        self._table = memoryview(name_table)
+        self._mask = len(name_table) // 2 - 1
+        # Ancestor lists are dominated by a few hub categories, so their decoded names are kept
+        self._decoded = {}
+
+    @classmethod
+    def build(cls, names):
+        encoded = [name.encode("utf-8") for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+        slots = 1 << max(4, math.ceil(math.log2(max(len(encoded), 1) * 2)))  # at most half full
+        table = array('Q', bytes(16 * slots))
+        mask = slots - 1
+        for node, name in enumerate(encoded):
+            key = _name_key(name)
+            index = key & mask
+            while table[2 * index]:
+                index = (index + 1) & mask
+            table[2 * index], table[2 * index + 1] = key, node
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                   np.frombuffer(table.tobytes(), dtype=np.uint64))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, node: int) -> str:
+        return str(self._blob[self._offsets[node]:self._offsets[node + 1]], "utf-8")
+
+    def decode(self, nodes) -> list[str]:
+        """Names of many IDs, the most frequent ones from a bounded cache"""
+        decoded, blob, offsets = self._decoded, self._blob, self._offsets
+        names = []
+        for node in nodes:
+            name = decoded.get(node)
+            if name is None:
+                name = str(blob[offsets[node]:offsets[node + 1]], "utf-8")
+                if len(decoded) < _DECODED_NAMES:
+                    decoded[node] = name
+            names.append(name)
+        return names
+
+    def __iter__(self):
+        return (self[node] for node in range(len(self)))
+
+    def get(self, name: str) -> int | None:
+        """ID of name, or None"""
+        encoded = name.encode("utf-8")
+        key = _name_key(encoded)
+        table, mask, blob, offsets = self._table, self._mask, self._blob, self._offsets
+        index = key & mask
+        while True:
+            slot_key = table[2 * index]
+            if slot_key == 0:
+                return None
+            node = table[2 * index + 1]
+            if slot_key == key and blob[offsets[node]:offsets[node + 1]] == encoded:
+                return node
+            index = (index + 1) & mask
+
+
+def iter_mapping_file(path: str, chunk_size: int = 1 << 20):
+    """
+    (category, parents) pairs of a JSON {category: [parent categories]} file, parsed a
+    chunk at a time, so the whole mapping is never held as one Python dict.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer, pos = "", 0
+
+        def fill() -> bool:
+            nonlocal buffer, pos
+            chunk = f.read(chunk_size)
+            buffer, pos = buffer[pos:] + chunk, 0
+            return bool(chunk)
+
+        def next_char() -> str:
+            """Next non-whitespace character, without consuming it; "" at end of file"""
+            nonlocal pos
+            while True:
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ""
+
+        def next_value():
+            nonlocal pos
+            while True:
+                try:
+                    value, pos = decoder.raw_decode(buffer, pos)
+                    return value
+                except json.JSONDecodeError:
+                    # Most likely cut off at the end of the buffer: read on, unless it cannot be that
+                    if len(buffer) - pos > _MAX_VALUE_CHARS or not fill():
+                        raise
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            char = next_char()
+            if char == "" or char not in chars:
+                raise json.JSONDecodeError(f"Expecting one of {chars!r}", buffer, pos)
+            pos += 1
+            return char
+
+        expect("{")
+        if next_char() == "}":
+            return
+        while True:
+            if next_char() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, pos)
+            category = next_value()
+            expect(":")
+            next_char()
+            yield category, next_value()
+            if expect(",}") == "}":
+                return
+
+
+class CategoryIndex:
+    """
+    Category hierarchy with every category's ancestors precomputed up to max_depth levels.
+
+    Categories are interned to integer IDs (names without the "Category:" prefix). Direct
+    parents are a CSR array; the closure is a second CSR whose rows list each category's
+    ancestors nearest first, with the level each was first reached at, so an ancestor query
+    for any depth up to max_depth is one slice. Cycles are harmless: an ancestor is recorded
+    once, at its shortest distance, and a category is never its own ancestor. Deeper queries
+    walk the parent CSR from the precomputed frontier. Saved indexes are a directory of
+    .npy files, names included (see CategoryNames), that load() memory-maps, so opening
+    one takes milliseconds at any size. open_category_index() picks the right loader.
+    """
+
+    def __init__(self, names, parent_offsets, parents, closure_offsets, ancestors, depths, max_depth):
+        self.names = names if isinstance(names, CategoryNames) else CategoryNames.build(names)
+        self.parent_offsets, self.parents = parent_offsets, parents
+        self.closure_offsets, self.ancestors, self.depths = closure_offsets, ancestors, depths
+        self.max_depth = max_depth  # levels in the closure; _COMPLETE if no category has ancestors beyond it
+
+    @classmethod
+    def from_mapping(cls, mapping: dict, max_depth: int = CATEGORY_CLOSURE_DEPTH):
+        """Index from a {category: [parent categories]} mapping such as CategoryResolver's JSON file"""
+        return cls.from_pairs(mapping.items(), max_depth)
+
+    @classmethod
+    def from_pairs(cls, pairs, max_depth: int = CATEGORY_CLOSURE_DEPTH):
+        """Index from (category, parents) pairs, e.g. iter_mapping_file(); edges are kept as int arrays"""
+        names, name_ids = [], {}
+
+        def intern(name):
+            node = name_ids.get(name)
+            if node is None:
+                node = name_ids[name] = len(names)
+                names.append(name)
+            return node
+
+        children, parents = array('i'), array('i')
+        for child, child_parents in pairs:
+            child = intern(_clean(child))
+            for parent in child_parents:
+                children.append(child)
+                parents.append(intern(_clean(parent)))
+        return cls.from_edges(names, children, parents, max_depth)
+
+    @classmethod
+    def from_edges(cls, names, children, parents, max_depth: int = CATEGORY_CLOSURE_DEPTH):
+        """Index from parallel child/parent ID arrays"""
+        n = len(names)
+        children = np.asarray(children, dtype=np.int64)
+        parents = np.asarray(parents, dtype=np.int64)
+        order = np.argsort(children, kind="stable")
+        parent_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(children, minlength=n), out=parent_offsets[1:])
+        parent_ids = parents[order].astype(np.int32)
+
+        # Closure rows are built for a block of categories at a time, which bounds the
+        # temporaries; blocks are in ID order, so their rows concatenate into the final CSR
+        counts = np.zeros(n, dtype=np.int64)
+        ancestor_blocks, depth_blocks, complete = [], [], True
+        for low in range(0, n, _CLOSURE_BLOCK):
+            high = min(n, low + _CLOSURE_BLOCK)
+            block_children = np.repeat(np.arange(low, high), np.diff(parent_offsets[low:high + 1]))
+            keys, depths, block_complete = cls._closure_block(
+                block_children, parent_ids[parent_offsets[low]:parent_offsets[high]], parent_offsets, parent_ids,
+                n, max_depth)
+            complete &= block_complete
+            categories, ancestors = keys // n, keys % n
+            order = np.lexsort((ancestors, depths, categories))  # by category, then nearest first
+            counts[low:high] = np.bincount(categories - low, minlength=high - low)
+            ancestor_blocks.append(ancestors[order].astype(np.int32))
+            depth_blocks.append(depths[order])
+
+        closure_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=closure_offsets[1:])
+        ancestors = np.concatenate(ancestor_blocks) if ancestor_blocks else np.zeros(0, dtype=np.int32)
+        depths = np.concatenate(depth_blocks) if depth_blocks else np.zeros(0, dtype=np.uint8)
+        return cls(names, parent_offsets, parent_ids, closure_offsets, ancestors, depths,
+                   _COMPLETE if complete else max_depth)
+
+    @staticmethod
+    def _closure_block(children, parents, parent_offsets, parent_ids, n, max_depth):
+        """
+        (keys, depths, complete) of the closure rows of some categories, level by level over
+        (category, ancestor) pairs encoded as category * n + ancestor: the next level is the
+        parents of the last level's new ancestors, minus every pair seen before
+        """
+        level = _sorted_unique(children * n + parents)
+        level = level[level // n != level % n]
+        seen, levels = level, [level]
+        for _ in range(max_depth - 1):
+            if not len(level):
+                break
+            owners, reached = _gather(parent_offsets, parent_ids, level % n)
+            categories = (level // n)[owners]
+            level = _sorted_unique(categories * n + reached)
+            level = level[(level // n != level % n) & ~_in_sorted(level, seen)]
+            seen = np.sort(np.concatenate((seen, level)))
+            levels.append(level)
+        depths = np.repeat(np.arange(1, len(levels) + 1, dtype=np.uint8), [len(level) for level in levels])
+        return np.concatenate(levels), depths, not len(level)
+
+    def __len__(self):
+        return len(self.names)
+
+    def id_of(self, category: str) -> int | None:
+        return self.names.get(_clean(category))
+
+    def parents_of(self, category: str) -> list[str]:
+        node = self.id_of(category)
+        if node is None:
+            return []
+        return self.names.decode(self.parents[self.parent_offsets[node]:self.parent_offsets[node + 1]].tolist())
+
+    def ancestor_ids(self, node: int, max_depth: int = CATEGORY_CLOSURE_DEPTH) -> np.ndarray:
+        """IDs of the ancestors at most max_depth levels up, nearest first"""
+        start, end = int(self.closure_offsets[node]), int(self.closure_offsets[node + 1])
+        if max_depth <= self.max_depth:
+            if start == end or self.depths[end - 1] <= max_depth:
+                return self.ancestors[start:end]
+            # Rows are short, so bisect on a list beats np.searchsorted's call overhead
+            return self.ancestors[start:start + bisect_right(self.depths[start:end].tolist(), max_depth)]
+
+        # Beyond the precomputed levels: walk up from the deepest ones
+        found = [int(a) for a in self.ancestors[start:end]]
+        seen = set(found)
+        seen.add(node)
+        frontier = [a for a, d in zip(found, self.depths[start:end].tolist()) if d == self.max_depth]
+        for _ in range(max_depth - self.max_depth):
+            next_frontier = []
+            for category in frontier:
+                for parent in self.parents[self.parent_offsets[category]:self.parent_offsets[category + 1]].tolist():
+                    if parent not in seen:
+                        seen.add(parent)
+                        next_frontier.append(parent)
+            found += next_frontier
+            frontier = next_frontier
+        return np.array(found, dtype=np.int32)
+
+    def ancestors_of(self, category: str, max_depth: int = CATEGORY_CLOSURE_DEPTH) -> list[str]:
+        """Names of a category's ancestors at most max_depth levels up; [] for unknown categories"""
+        node = self.id_of(category)
+        if node is None or max_depth < 1:
+            return []
+        return self.names.decode(self.ancestor_ids(node, max_depth).tolist())
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            target = os.path.join(path, f"{name}.npy")
+            with open(target + ".tmp", "wb") as f:
+                np.save(f, getattr(self, name))
+            os.replace(target + ".tmp", target)
+        for name in _NAME_ARRAYS:
+            target = os.path.join(path, f"{name}.npy")
+            with open(target + ".tmp", "wb") as f:
+                np.save(f, getattr(self.names, name))
+            os.replace(target + ".tmp", target)
+        # Written last: a directory with meta.json is a complete index
+        target = os.path.join(path, _META_FILE)
+        with open(target + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"max_depth": self.max_depth}, f)
+        os.replace(target + ".tmp", target)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        # asarray drops the memmap subclass (same pages), whose per-slice overhead dominates a lookup
+        def load_array(name):
+            return np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None))
+
+        with open(os.path.join(path, _META_FILE), encoding="utf-8") as f:
+            max_depth = json.load(f)["max_depth"]
+        names = CategoryNames(*[load_array(name) for name in _NAME_ARRAYS])
+        return cls(names, *[load_array(name) for name in _ARRAYS], max_depth)
+
+    def memory_bytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in _ARRAYS) + \
+            sum(getattr(self.names, name).nbytes for name in _NAME_ARRAYS)
+
+
+def is_category_index(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, _META_FILE))
+
+
+def open_category_index(path: str, max_depth: int = CATEGORY_CLOSURE_DEPTH) -> CategoryIndex:
+    """
+    Opens a category hierarchy in whichever format path holds:
+      - a saved CategoryIndex directory: memory-mapped as is
+      - a JSON {category: [parents]} file: streamed into an index, which is saved beside it
+        as "<file>.index" and reused while it is newer than the file and as deep as max_depth
+    Raises FileNotFoundError, or json.JSONDecodeError for malformed JSON.
+    """
+    if os.path.isdir(path):
+        if not is_category_index(path):
+            raise FileNotFoundError(f"{path} is not a category index directory")
+        return CategoryIndex.load(path)
+
+    compiled = path + _COMPILED_SUFFIX
+    source_mtime = os.path.getmtime(path)
+    if is_category_index(compiled) and os.path.getmtime(os.path.join(compiled, _META_FILE)) >= source_mtime:
+        index = CategoryIndex.load(compiled)
+        if index.max_depth >= max_depth:
+            return index
+
+    index = CategoryIndex.from_pairs(iter_mapping_file(path), max_depth)
+    try:
+        index.save(compiled)
+    except OSError as e:
+        print(f"Could not save the compiled category index to '{compiled}': {e}")
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute a category ancestor index from a mapping file")
+    parser.add_argument("mapping", help="JSON {category: [parent categories]}")
+    parser.add_argument("index", help="output directory, usable as CategoryResolver's category_mapping_file")
+    parser.add_argument("--depth", type=int, default=CATEGORY_CLOSURE_DEPTH)
+    args = parser.parse_args()
+    index = CategoryIndex.from_pairs(iter_mapping_file(args.mapping), args.depth)
+    index.save(args.index)
+    print(f"Indexed {len(index)} categories, {len(index.ancestors)} ancestor entries, "
+          f"{index.memory_bytes() / 2**20:.1f} MiB")
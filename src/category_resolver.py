@@ -1,6 +1,8 @@
 # category_resolver.py
 import json
-from functools import lru_cache
+
+from src.category_index import CategoryIndex, open_category_index
+from src.wiki_config import CATEGORY_CLOSURE_DEPTH
 
 
 class CategoryResolver:
@@ -9,59 +11,45 @@ class CategoryResolver:
     and inferring broader topics from infobox data and categories.
     """
 
-    def __init__(self, category_mapping_file: str = None):
+    def __init__(self, category_mapping_file: str = None, category_index: CategoryIndex = None,
+                 closure_depth: int = CATEGORY_CLOSURE_DEPTH):
         """
         Initializes the CategoryResolver.
         Args:
             category_mapping_file (str, optional): Path to a JSON file containing 
-                                                   a pre-built category hierarchy.
+                                                   a pre-built category hierarchy, or to a
+                                                   CategoryIndex directory saved from one
+                                                   (the format is detected).
                                                    Defaults to None, in which case
                                                    _fetch_category_parents_from_wiki
                                                    is used (conceptually).
+            category_index (CategoryIndex, optional): An already built index, used instead of the file.
+            closure_depth (int): Ancestor levels precomputed when indexing a JSON mapping file.
         """
-        self.category_tree = {}  # {category_name: [parent_categories_names]}
-        if category_mapping_file:
+        self.category_index = category_index if category_index is not None else CategoryIndex.from_mapping({})
+        if category_mapping_file and category_index is None:
             try:
-                with open(category_mapping_file, 'r', encoding='utf-8') as f:
-                    self.category_tree = json.load(f)
+                # A JSON mapping is streamed into a compact index the first time, later runs map that index
+                self.category_index = open_category_index(category_mapping_file, closure_depth)
                 print(f"Loaded category tree from {category_mapping_file}")
             except FileNotFoundError:
                 print(f"Warning: Category mapping file '{category_mapping_file}' not found. "
                       "Category resolution will be limited to direct categories unless manually overridden.")
             except json.JSONDecodeError:
                 print(f"Error decoding JSON from '{category_mapping_file}'. Category resolution will be limited.")
-                self.category_tree = {}
 
-    @lru_cache(maxsize=100000)  # Cache to avoid repeated lookups for category parents
     def _get_parents_from_tree(self, category_name: str) -> list[str]:
         """
-        Retrieves direct parent categories from the loaded category_tree.
+        Retrieves direct parent categories from the category index.
         """
-        # Wikipedia categories are usually like "Category:Science"
-        # We need to make sure we're looking up the consistent format.
-        # Clean the category name for lookup.
-        cleaned_cat_name = category_name.replace("Category:", "").strip()
-
-        # In a real comprehensive system, this tree would be very deep.
-        # For now, it's a simple lookup.
-        parents = self.category_tree.get(cleaned_cat_name, [])
-        return [f"Category:{p}" for p in parents]  # Return in "Category:X" format
+        return [f"Category:{p}" for p in self.category_index.parents_of(category_name)]  # Return in "Category:X" format
 
     def _recursively_resolve_parents(self, category_name: str, max_depth: int = 3, current_depth: int = 0) -> set[str]:
         """
-        Recursively finds all ancestor categories up to a certain depth.
+        Finds all ancestor categories up to a certain depth, from the precomputed closure.
         """
-        if current_depth >= max_depth:
-            return set()
-
-        all_parents = set()
-        direct_parents = self._get_parents_from_tree(category_name)
-
-        for parent in direct_parents:
-            all_parents.add(parent)
-            all_parents.update(self._recursively_resolve_parents(parent, max_depth, current_depth + 1))
-
-        return all_parents
+        ancestors = self.category_index.ancestors_of(category_name, max_depth - current_depth)
+        return {f"Category:{a}" for a in ancestors}
 
     def resolve_categories_and_hierarchy(self, raw_categories: list[str], max_depth: int = 2) -> list[str]:
         """
@@ -70,12 +58,12 @@ class CategoryResolver:
         """
         resolved = set()
         for cat in raw_categories:
-            resolved.add(cat)
-            # Add parents recursively based on the pre-built category_tree
-            resolved.update(self._recursively_resolve_parents(cat, max_depth=max_depth))
+            # "Category:" prefixes are removed for cleaner topic names
+            resolved.add(cat.replace("Category:", "").strip())
+            # One slice of the precomputed ancestor closure per category
+            resolved.update(self.category_index.ancestors_of(cat, max_depth))
 
-        # Remove "Category:" prefix for cleaner topic names
-        return sorted([c.replace("Category:", "").strip() for c in resolved])
+        return sorted(resolved)
 
     # --- FIX STARTS HERE ---
     def get_canonical_topics(self, raw_categories: list[str], infobox_data: dict, article_title: str) -> list[str]:
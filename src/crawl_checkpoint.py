@@ -0,0 +1,150 @@
+# crawl_checkpoint.py
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from src.wiki_config import CHECKPOINT_INTERVAL
+
+# Journal lines, tab separated, appended in checkpoint-sized batches:
+#   m  <json>                               crawl metadata, first line only
+#   e  <depth> <parent url> <url> <url>...  parent is done and these URLs were claimed at depth
+#                                           (no parent for the start page)
+#   s  <json>                               stats counters as of this checkpoint
+# A line is only valid once its newline is written, so a crash mid-write loses at most the
+# batch being written and a torn tail is cut off on resume.
+
+
+class CheckpointState(NamedTuple):
+    meta: dict
+    seen: list  # every claimed URL, in claim order
+    pending: list  # (url, depth) claimed but not done, in claim order
+    pages_done: int
+    stats: dict
+    valid_bytes: int  # journal length up to the last complete line
+
+
+def load_checkpoint(path: str) -> CheckpointState:
+    """Replays a crawl journal"""
+    meta, stats = None, {}
+    seen, pending = [], {}
+    pages_done = 0
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # torn by a crash
+            valid_bytes += len(raw)
+            kind, _, rest = raw.decode("utf-8").rstrip("\n").partition("\t")
+            if kind == "e":
+                depth, parent, *claimed = rest.split("\t")
+                if parent:
+                    pending.pop(parent, None)
+                    pages_done += 1
+                depth = int(depth)
+                for url in claimed:
+                    pending[url] = depth
+                seen.extend(claimed)
+            elif kind == "s":
+                stats = json.loads(rest)
+            elif kind == "m":
+                meta = json.loads(rest)
+    if meta is None:
+        raise ValueError(f"{path} is not a crawl checkpoint")
+    return CheckpointState(meta, seen, list(pending.items()), pages_done, stats, valid_bytes)
+
+
+class CrawlCheckpoint:
+    """
+    Incremental crawl checkpoint: an append-only journal of frontier deltas.
+
+    Workers only append a tuple to an in-memory deque per finished page (record_expanded);
+    a background thread writes whatever accumulated every `interval` seconds. Before it
+    writes, it flushes the page store, so every page the journal calls done is on disk.
+    Replaying the journal (load_checkpoint) gives back the seen set, the frontier and the
+    counters. A page that finished after the last checkpoint is simply not done in the
+    journal and gets processed again on resume.
+    """
+
+    def __init__(self, path: str, interval: float = CHECKPOINT_INTERVAL, flush_store=None, stats=None):
+        self.path = path
+        self.interval = interval
+        self._flush_store = flush_store
+        self._stats = stats
+        self._events = deque()  # appends and poplefts are thread-safe without a lock
+        self._file = None
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+        self.checkpoints_written = 0
+        self.write_seconds = 0.0  # wall time, including waits for the page store flush
+        self.cpu_seconds = 0.0  # CPU time spent journaling
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> CheckpointState:
+        return load_checkpoint(self.path)
+
+    def begin(self, meta: dict):
+        """Starts a new journal for a new crawl"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(("m\t" + json.dumps(meta) + "\n").encode("utf-8"))
+        self._start()
+
+    def reopen(self, state: CheckpointState):
+        """Appends to the journal `state` was loaded from, dropping a torn last line"""
+        self._file = open(self.path, "r+b")
+        self._file.truncate(state.valid_bytes)
+        self._file.seek(state.valid_bytes)
+        self._start()
+
+    def _start(self):
+        self._closed.clear()
+        self._thread = threading.Thread(target=self._run, name="crawl-checkpoint", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record_expanded(self, parent_url, depth: int, claimed):
+        """parent_url is done and its links `claimed` were queued at depth"""
+        self._events.append((parent_url, depth, claimed))
+
+    def _run(self):
+        while not self._closed.wait(self.interval):
+            self.write()
+
+    def write(self):
+        """Appends everything recorded since the last checkpoint"""
+        with self._write_lock:
+            if self._file is None:
+                return
+            start, start_cpu = time.perf_counter(), time.thread_time()
+            events = [self._events.popleft() for _ in range(len(self._events))]
+            if self._flush_store is not None:
+                self._flush_store()
+            lines = ["\t".join(["e", str(depth), parent or "", *claimed]) + "\n" for parent, depth, claimed in events]
+            if self._stats is not None:
+                lines.append("s\t" + json.dumps(self._stats()) + "\n")
+            self._file.write("".join(lines).encode("utf-8"))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.checkpoints_written += 1
+            self.write_seconds += time.perf_counter() - start
+            self.cpu_seconds += time.thread_time() - start_cpu
+
+    def close(self):
+        """Writes a final checkpoint and stops the background thread"""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        atexit.unregister(self.close)
@@ -0,0 +1,246 @@
+# crawl_metrics.py
+"""
+Crawl metrics: counters, gauges and latency histograms in one registry.
+
+Read them in-process with CrawlMetrics.snapshot(), scrape them as Prometheus text from
+MetricsServer, or let MetricsReporter write the snapshot to a JSON file periodically.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Pipeline stages every engine times, in the order a page goes through them
+CRAWL_STAGES = ("rate_limit_wait", "fetch", "parse", "classify", "store")
+
+
+class Counter:
+    """Monotonic count. With fn, the value is read from fn() instead (e.g. an existing stat)."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text="", fn=None):
+        self.name = name
+        self.help = help_text
+        self._fn = fn
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._fn() if self._fn is not None else self._value
+
+
+class Gauge(Counter):
+    """Value that goes up and down, such as fetches in flight or a queue's depth"""
+
+    kind = "gauge"
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    @contextmanager
+    def track(self):
+        """Counts the block as in progress while it runs"""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Histogram:
+    """Latency distribution in fixed buckets, cheap enough to observe every page"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text="", buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float, counts=None) -> float:
+        """Estimated by interpolating inside the bucket the quantile falls in"""
+        counts = counts or self._counts
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    @property
+    def value(self) -> dict:
+        with self._lock:
+            counts, total_seconds = list(self._counts), self._sum
+        count = sum(counts)
+        return {
+            "count": count,
+            "sum": total_seconds,
+            "mean": total_seconds / count if count else 0.0,
+            "p50": self.quantile(0.5, counts),
+            "p95": self.quantile(0.95, counts),
+            "p99": self.quantile(0.99, counts),
+            "buckets": counts,
+        }
+
+
+class CrawlMetrics:
+    """Registry of one crawl's metrics. Every metric name gets the wiki_crawler_ prefix when exported."""
+
+    prefix = "wiki_crawler_"
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.stage = {stage: self.histogram(f"stage_{stage}_seconds", f"Time per page spent in the {stage} stage")
+                      for stage in CRAWL_STAGES}
+        self.in_flight = self.gauge("fetches_in_flight", "HTTP fetches currently waiting on the server")
+        self.bytes_downloaded = self.counter("bytes_downloaded_total", "Response body bytes received")
+        self.fetches = self.counter("fetches_total", "HTTP fetches completed, including failures and 304s")
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text="", fn=None) -> Counter:
+        return self._register(Counter(name, help_text, fn))
+
+    def gauge(self, name, help_text="", fn=None) -> Gauge:
+        return self._register(Gauge(name, help_text, fn))
+
+    def histogram(self, name, help_text="", buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def snapshot(self) -> dict:
+        """Current value of every metric, by name; histograms as count, sum, mean, quantiles and buckets"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {"time": time.time(), "metrics": {metric.name: metric.value for metric in metrics}}
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            name = self.prefix + metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            value = metric.value
+            if metric.kind != "histogram":
+                lines.append(f"{name} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, "+Inf"), value["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum {value['sum']}")
+            lines.append(f"{name}_count {value['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        """Writes the snapshot atomically, so readers never see a half-written file"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+
+class MetricsServer:
+    """Serves GET /metrics as Prometheus text on a local port, from a daemon thread"""
+
+    def __init__(self, metrics: CrawlMetrics, port: int, host="127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # one line per scrape would drown the crawl's own output
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MetricsReporter:
+    """Writes a JSON snapshot to path every interval seconds, and once more on close"""
+
+    def __init__(self, metrics: CrawlMetrics, path, interval: float):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self.metrics.write_json(self.path)
+        except OSError as e:
+            print(f"Could not write metrics snapshot {self.path}: {e}")
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        self._write()
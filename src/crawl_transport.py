@@ -0,0 +1,111 @@
+# crawl_transport.py
+import multiprocessing
+import queue
+import threading
+from multiprocessing.connection import Client, Listener
+
+COORDINATOR = "coordinator"  # endpoint name of the coordinator; nodes are named by their int id
+
+
+class Transport:
+    """
+    Message passing between the endpoints of a distributed crawl. Messages are picklable
+    tuples; those from one sender to one destination arrive in the order they were sent.
+    """
+
+    def send(self, destination, message):
+        raise NotImplementedError
+
+    def receive(self, timeout: float = None):
+        """Next message for this endpoint, or None once timeout seconds pass without one"""
+        raise NotImplementedError
+
+    def add_peers(self, addresses: dict):
+        """Endpoint name -> address, for transports that connect by address"""
+
+    def close(self):
+        pass
+
+
+class LocalTransport(Transport):
+    """Endpoints are processes on this machine, each with a multiprocessing.Queue inbox"""
+
+    def __init__(self, name, inboxes: dict):
+        self.name = name
+        self.address = None
+        self._inboxes = inboxes
+
+    @classmethod
+    def create(cls, names, context=multiprocessing) -> dict:
+        """One connected transport per endpoint name; pass each to a process started from the same context"""
+        inboxes = {name: context.Queue() for name in names}
+        return {name: cls(name, inboxes) for name in names}
+
+    def send(self, destination, message):
+        self._inboxes[destination].put(message)
+
+    def receive(self, timeout: float = None):
+        try:
+            return self._inboxes[self.name].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class SocketTransport(Transport):
+    """
+    Endpoints on different machines. Each one listens on its own address; messages to a
+    peer go over one lazily opened multiprocessing.connection per destination. Messages are
+    pickled, so authkey must be a secret shared by the crawl's endpoints only.
+    """
+
+    def __init__(self, name, listen_address, authkey: bytes, peers: dict = None):
+        self.name = name
+        self._authkey = authkey
+        self._listener = Listener(listen_address, authkey=authkey)
+        self.address = self._listener.address
+        self._peers = dict(peers or {})
+        self._connections = {}
+        self._send_locks = {}
+        self._locks_lock = threading.Lock()
+        self._inbox = queue.Queue()
+        threading.Thread(target=self._accept_loop, name=f"transport-accept-{name}", daemon=True).start()
+
+    def add_peers(self, addresses: dict):
+        self._peers.update({name: tuple(address) for name, address in addresses.items()})
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except multiprocessing.AuthenticationError:
+                continue
+            except OSError:
+                return  # listener closed
+            threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+
+    def _read_loop(self, conn):
+        try:
+            while True:
+                self._inbox.put(conn.recv())
+        except (EOFError, OSError):
+            conn.close()
+
+    def send(self, destination, message):
+        with self._locks_lock:
+            lock = self._send_locks.setdefault(destination, threading.Lock())
+        with lock:
+            conn = self._connections.get(destination)
+            if conn is None:
+                conn = self._connections[destination] = Client(self._peers[destination], authkey=self._authkey)
+            conn.send(message)
+
+    def receive(self, timeout: float = None):
+        try:
+            return self._inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._listener.close()
+        for conn in self._connections.values():
+            conn.close()
@@ -1,7 +1,14 @@
 # data_store.py
 from src._JSON import save_json, load_json
+from src.wiki_config import PAGE_STORE_BACKEND, PAGE_STORE_BATCH_SIZE, PAGE_STORE_FLUSH_INTERVAL
+import atexit
+import glob
+import json
 import os
 import re
+import sqlite3
+import threading
+import time
 
 class PageDataStore:
     """Manages storing and retrieving crawled Wikipedia page data."""
@@ -24,10 +31,203 @@ class PageDataStore:
         file_path_without_ext = os.path.join(self.base_dir, sanitized_title)
         return load_json(file_path_without_ext)
 
+    def has_page(self, title: str) -> bool:
+        """Checks whether data for a page has been stored."""
+        sanitized_title = self._sanitize_filename(title)
+        return os.path.exists(os.path.join(self.base_dir, sanitized_title) + ".json")
+
+    def iter_pages(self):
+        """Yields (title, data) for every stored page."""
+        for path in sorted(glob.glob(os.path.join(self.base_dir, "*.json"))):
+            data = load_json(path[:-len(".json")])
+            if data is not None:
+                yield data.get("title", os.path.basename(path)[:-len(".json")]), data
+
+    def flush(self):
+        """Every save is already on disk."""
+
+    def close(self):
+        pass
+
     def _sanitize_filename(self, title: str) -> str:
         """Sanitizes a title to be a valid filename."""
         sanitized = re.sub(r'[\\/:*?"<>|]', '_', title)
         # Ensure it's not empty after sanitization
         if not sanitized:
             sanitized = "untitled_page"
-        return sanitized[:200] # Limit length to prevent issues on some file systems
\ No newline at end of file
+        return sanitized[:200] # Limit length to prevent issues on some file systems
+
+
+class SQLitePageDataStore:
+    """
+    Write-behind page store: one SQLite database in WAL mode instead of one JSON file per page.
+
+    save_page_data only queues the record in memory. A background thread commits queued
+    records in one transaction once `batch_size` are waiting or `flush_interval` seconds
+    have passed, whichever comes first, so at most that much work is lost if the process
+    dies. Reads see queued records immediately. flush() forces a commit, and close(),
+    also run at interpreter exit, commits whatever is left.
+
+    If a commit fails, the flusher stops and keeps the error: flush(), close() and further
+    saves raise it instead of waiting on a thread that is gone.
+    """
+
+    def __init__(self, base_dir="crawled_data", batch_size=PAGE_STORE_BATCH_SIZE,
+                 flush_interval=PAGE_STORE_FLUSH_INTERVAL, filename="pages.sqlite3"):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.path = os.path.join(base_dir, filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Producers block past this many unflushed records instead of growing memory without bound
+        self.max_pending = 10 * batch_size
+
+        self._pending = {}  # title -> serialized record, not yet handed to the flusher
+        self._flushing = {}  # batch currently being committed, still visible to readers
+        self._flush_requested = False
+        self._closed = False
+        self._error = None  # what stopped the flusher, raised to every caller after it
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS pages (title TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="page-store-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside the flusher"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Commits survive a process crash; only an OS crash can lose the last ones
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save_page_data(self, title: str, data: dict):
+        """Queues data for a specific Wikipedia page."""
+        record = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with self._cond:
+            self._raise_if_failed()
+            if self._closed:
+                self._write_batch(self._connection(), {title: record})
+                return
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+                self._raise_if_failed()
+            self._pending[title] = record
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def load_page_data(self, title: str) -> dict | None:
+        """Loads data for a specific Wikipedia page."""
+        with self._cond:
+            record = self._pending.get(title) or self._flushing.get(title)
+        if record is None:
+            row = self._connection().execute("SELECT data FROM pages WHERE title = ?", (title,)).fetchone()
+            record = row[0] if row else None
+        return json.loads(record) if record is not None else None
+
+    def has_page(self, title: str) -> bool:
+        """Checks whether data for a page has been stored."""
+        with self._cond:
+            if title in self._pending or title in self._flushing:
+                return True
+        return self._connection().execute("SELECT 1 FROM pages WHERE title = ?", (title,)).fetchone() is not None
+
+    def iter_pages(self):
+        """Yields (title, data) for every stored page."""
+        self.flush()
+        for title, record in self._connection().execute("SELECT title, data FROM pages ORDER BY title"):
+            yield title, json.loads(record)
+
+    def _flush_loop(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._pending) < self.batch_size and not self._flush_requested
+                       and not self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._flushing, self._pending = self._pending, {}
+                self._flush_requested = False
+                closing = self._closed
+                self._cond.notify_all()  # wake producers blocked on max_pending
+
+            try:
+                if self._flushing:
+                    self._write_batch(conn, self._flushing)
+            except Exception as e:
+                print(f"Page store {self.path}: commit failed, no further pages will be written: {e}")
+                conn.close()
+                with self._cond:
+                    self._error = e  # the failed batch stays readable in _flushing
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._flushing = {}
+                self._cond.notify_all()  # wake flush() waiters
+                if closing and not self._pending:
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # fold the WAL back into the database
+                    conn.close()
+                    return
+
+    @staticmethod
+    def _write_batch(conn, batch: dict):
+        with conn:  # one transaction per batch
+            conn.executemany("INSERT OR REPLACE INTO pages (title, data) VALUES (?, ?)", batch.items())
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise self._error
+
+    def flush(self):
+        """Blocks until every queued record is committed."""
+        with self._cond:
+            self._raise_if_failed()
+            if self._closed:
+                return
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._flushing:
+                self._cond.wait()
+                self._raise_if_failed()
+
+    def close(self):
+        """Commits everything still queued and stops the flush thread. Reads keep working."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        atexit.unregister(self.close)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:  # later reads from this thread reconnect
+            conn.close()
+            self._local.conn = None
+        self._raise_if_failed()
+
+
+def open_page_store(base_dir="crawled_data", backend=PAGE_STORE_BACKEND):
+    """Page store for the crawler: "sqlite" (batched, write-behind) or "json" (one file per page)"""
+    if backend == "sqlite":
+        return SQLitePageDataStore(base_dir)
+    if backend == "json":
+        return PageDataStore(base_dir)
+    raise ValueError(f"Unknown page store backend: {backend}")
+
+
+def open_crawl_dir(data_dir="crawled_data"):
+    """Opens an existing crawl output directory with whichever backend wrote it"""
+    if os.path.exists(os.path.join(data_dir, "pages.sqlite3")):
+        return SQLitePageDataStore(data_dir)
+    return PageDataStore(data_dir)
@@ -0,0 +1,381 @@
+# distributed_crawler.py
+"""
+Distributed crawl: several CrawlNodes, on one machine or many, and a CrawlCoordinator.
+
+Every URL has one owner node, chosen by hashing its page title. Only the owner keeps it
+in a seen set and a frontier, so no state is shared: a node fetches and parses its own
+URLs and forwards the links it finds to their owners in batches. The coordinator admits
+the nodes, splits the global request rate between them and detects when the whole
+crawl is done. Membership is fixed once the crawl starts.
+
+One difference from a single-node crawl: max_pages_per_depth caps the links taken from
+each page before dedup, not after (see CrawlNode). Pages whose first links were already
+seen add fewer new pages, so on real articles the crawl covers a smaller set.
+
+One machine, N node processes:
+    python -m src.distributed_crawler local Mario --nodes 4
+Across machines (the same WIKI_CRAWL_AUTHKEY everywhere):
+    python -m src.distributed_crawler coordinator Mario --nodes 2 --listen 0.0.0.0:7000
+    python -m src.distributed_crawler node --id 0 --coordinator host-a:7000 --listen 0.0.0.0:7001 --advertise host-b:7001
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from queue import Empty
+
+from src.crawl_transport import COORDINATOR, LocalTransport, SocketTransport
+from src.url_frontier import url_hash64
+from src.wiki_config import WIKIPEDIA_BASE_URL, MAX_DEPTH, MAX_PAGES_PER_DEPTH, DISTRIBUTED_BATCH_SIZE, \
+    DISTRIBUTED_FLUSH_INTERVAL, DISTRIBUTED_PROBE_INTERVAL
+from src.wiki_crawler import WikiCrawler
+
+
+class CrawlNode(WikiCrawler):
+    """
+    One node of a distributed crawl: a threaded crawler over the URLs it owns.
+
+    max_pages_per_depth caps the links taken from each page before dedup rather than
+    after, as WikiCrawler does: whether a link owned by another node was seen is only
+    known to that node, and asking it would cost a round trip per page. Links already
+    seen still use up the page's budget.
+    """
+
+    def __init__(self, node_id: int, num_nodes: int, transport, start_url, num_threads=3,
+                 batch_size=DISTRIBUTED_BATCH_SIZE, flush_interval=DISTRIBUTED_FLUSH_INTERVAL, **kwargs):
+        kwargs.setdefault("checkpoint_interval", 0)
+        super().__init__(start_url, num_threads=num_threads, **kwargs)
+        self.node_id = node_id
+        self.num_nodes = num_nodes
+        self.transport = transport
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._outbox = {}  # owner -> [(url, depth)] waiting to be forwarded
+        self._outbox_lock = threading.Lock()
+        # URLs queued or being processed on this node
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        # Completion detection counts messages, not links: every batch sent must be received
+        self.batches_sent = 0
+        self.batches_received = 0
+        self.links_forwarded = 0
+
+    def owner_of(self, url: str) -> int:
+        return url_hash64(self.link_extractor.get_page_title(url)) % self.num_nodes
+
+    def _enqueue(self, url, depth):
+        with self._pending_cond:
+            self._pending += 1
+        self.crawl_queue.put((url, depth))
+
+    def _finish_item(self):
+        with self._pending_cond:
+            self._pending -= 1
+
+    def _claim_and_enqueue(self, urls, depth):
+        for url in self.visited_urls.claim_batch(urls):
+            self._enqueue(url, depth)
+
+    def _enqueue_links(self, extracted_links, current_depth, parent_url=None):
+        """Claims the links this node owns and forwards the rest to their owners"""
+        next_depth = current_depth + 1
+        if next_depth >= self.max_depth:
+            return
+        local, full = [], []
+        with self._outbox_lock:
+            for link in extracted_links[:self.max_pages_per_depth]:
+                owner = self.owner_of(link)
+                if owner == self.node_id:
+                    local.append(link)
+                    continue
+                batch = self._outbox.setdefault(owner, [])
+                batch.append((link, next_depth))
+                if len(batch) >= self.batch_size:
+                    full.append((owner, self._outbox.pop(owner)))
+        self._claim_and_enqueue(local, next_depth)
+        for owner, batch in full:
+            self._send_links(owner, batch)
+
+    def _send_links(self, owner, batch):
+        with self.stats_lock:
+            self.batches_sent += 1  # before the send: a batch in transit must count as sent
+            self.links_forwarded += len(batch)
+        self.transport.send(owner, ("links", self.node_id, batch))
+
+    def _flush_outbox(self):
+        with self._outbox_lock:
+            batches, self._outbox = self._outbox, {}
+        for owner, batch in batches.items():
+            self._send_links(owner, batch)
+
+    def _forward_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush_outbox()
+
+    def _idle(self) -> bool:
+        with self._pending_cond:
+            if self._pending:
+                return False
+        with self._outbox_lock:
+            return not self._outbox
+
+    def _status(self) -> dict:
+        idle = self._idle()
+        with self.stats_lock:
+            return {"idle": idle, "sent": self.batches_sent, "received": self.batches_received,
+                    "pages_crawled": self.pages_crawled}
+
+    def _receive_loop(self, early_messages=()):
+        """
+        Handles messages from peers and the coordinator until told to stop, starting with
+        early_messages: those that arrived before this node was started
+        """
+        messages = itertools.chain(early_messages, iter(self.transport.receive, object()))
+        for kind, sender, payload in messages:
+            if kind == "links":
+                by_depth = {}
+                for url, depth in payload:
+                    by_depth.setdefault(depth, []).append(url)
+                for depth, urls in by_depth.items():
+                    self._claim_and_enqueue(urls, depth)
+                with self.stats_lock:
+                    self.batches_received += 1  # after enqueueing, so the node is busy before it counts
+            elif kind == "probe":
+                self.transport.send(COORDINATOR, ("status", self.node_id, dict(self._status(), round=payload)))
+            elif kind == "stop":
+                self.stop()
+                return
+
+    def _node_worker(self):
+        while not self._stop.is_set():
+            try:
+                url, depth = self.crawl_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            try:
+                result = self._process_page(url, depth)
+                if result:
+                    self._enqueue_links(*result, parent_url=url)
+            except Exception as e:
+                print(f"[Node-{self.node_id}] Worker error: {e}")
+            finally:
+                self._finish_item()
+
+    def start_crawl(self, early_messages=()):
+        """Crawls this node's partition until the coordinator sends stop"""
+        start_time = time.time()
+        if self.owner_of(self.start_url) == self.node_id:
+            self._claim_and_enqueue([self.start_url], 0)
+        print(f"Node {self.node_id}/{self.num_nodes} crawling with {self.num_threads} threads...")
+        self._print_rate_limit()
+
+        threads = [threading.Thread(target=self._node_worker) for _ in range(self.num_threads)]
+        threads.append(threading.Thread(target=self._forward_loop))
+        self._start_metrics()
+        for thread in threads:
+            thread.start()
+        self._receive_loop(early_messages)
+        for thread in threads:
+            thread.join()
+        self.data_store.close()
+        self._stop_metrics()
+
+        elapsed = time.time() - start_time
+        self._print_final_stats(elapsed)
+        with self.stats_lock:
+            stats = {"pages_crawled": self.pages_crawled, "pages_failed": self.pages_failed,
+                     "pages_not_modified": self.pages_not_modified, "links_forwarded": self.links_forwarded,
+                     "batches_sent": self.batches_sent, "elapsed": elapsed}
+        self.transport.send(COORDINATOR, ("stats", self.node_id, stats))
+
+
+class CrawlCoordinator:
+    """
+    Admits num_nodes nodes, gives each an equal share of the global request rate, and
+    stops them all once the crawl is complete. Complete means two consecutive probe rounds
+    in which every node was idle and the totals of batches sent and received matched and
+    did not change, so no batch was in transit that could wake a node up again.
+    """
+
+    def __init__(self, transport, num_nodes: int, requests_per_second=1,
+                 probe_interval=DISTRIBUTED_PROBE_INTERVAL):
+        self.transport = transport
+        self.num_nodes = num_nodes
+        self.requests_per_second = requests_per_second
+        self.probe_interval = probe_interval
+        self.probe_rounds = 0
+
+    def _receive(self, kind):
+        """The next message of this kind; others arriving meanwhile are stale and dropped"""
+        while True:
+            message = self.transport.receive()
+            if message[0] == kind:
+                return message
+
+    def _broadcast(self, message):
+        for node in range(self.num_nodes):
+            self.transport.send(node, message)
+
+    def run(self, start_url, max_depth=MAX_DEPTH, max_pages_per_depth=MAX_PAGES_PER_DEPTH,
+            base_url=WIKIPEDIA_BASE_URL) -> dict:
+        """Runs the crawl to completion; returns the summed and per-node stats"""
+        addresses = {}
+        while len(addresses) < self.num_nodes:
+            _, node, address = self._receive("join")
+            addresses[node] = address
+            if address is not None:
+                self.transport.add_peers({node: address})
+            print(f"Coordinator: node {node} joined ({len(addresses)}/{self.num_nodes})")
+
+        share = self.requests_per_second / self.num_nodes if self.requests_per_second else None
+        start_time = time.time()
+        self._broadcast(("start", COORDINATOR, {
+            "num_nodes": self.num_nodes, "addresses": {n: a for n, a in addresses.items() if a is not None},
+            "start_url": start_url, "base_url": base_url, "max_depth": max_depth,
+            "max_pages_per_depth": max_pages_per_depth, "requests_per_second": share}))
+
+        previous = None
+        last_progress = start_time
+        while True:
+            time.sleep(self.probe_interval)
+            self.probe_rounds += 1
+            self._broadcast(("probe", COORDINATOR, self.probe_rounds))
+            statuses = {}
+            while len(statuses) < self.num_nodes:
+                _, node, status = self._receive("status")
+                if status["round"] == self.probe_rounds:
+                    statuses[node] = status
+            sent = sum(s["sent"] for s in statuses.values())
+            received = sum(s["received"] for s in statuses.values())
+            quiet = all(s["idle"] for s in statuses.values()) and sent == received
+            if quiet and previous == (sent, received):
+                break
+            previous = (sent, received) if quiet else None
+            if time.time() - last_progress >= 10:
+                last_progress = time.time()
+                print(f"Coordinator: {sum(s['pages_crawled'] for s in statuses.values())} pages crawled, "
+                      f"{sum(not s['idle'] for s in statuses.values())}/{self.num_nodes} nodes busy, "
+                      f"{last_progress - start_time:.1f}s elapsed")
+
+        self._broadcast(("stop", COORDINATOR, None))
+        per_node = {}
+        while len(per_node) < self.num_nodes:
+            _, node, stats = self._receive("stats")
+            per_node[node] = stats
+        totals = {key: sum(stats[key] for stats in per_node.values())
+                  for key in ("pages_crawled", "pages_failed", "pages_not_modified", "links_forwarded")}
+        totals["elapsed"] = time.time() - start_time
+        totals["per_node"] = per_node
+        print(f"Coordinator: crawl complete, {totals['pages_crawled']} pages on {self.num_nodes} nodes "
+              f"in {totals['elapsed']:.2f}s ({self.probe_rounds} probe rounds)")
+        return totals
+
+
+def run_node(transport, node_id: int, data_dir="crawled_data", num_threads=3, **kwargs) -> CrawlNode:
+    """Joins the coordinator, waits for the crawl settings, then crawls until stopped"""
+    transport.send(COORDINATOR, ("join", node_id, transport.address))
+    # A peer that got "start" first may already be forwarding links; they are kept for the node,
+    # since a dropped batch would count as sent but never as received, and the crawl would not end
+    early_messages = []
+    while True:
+        message = transport.receive()
+        if message[0] == "start":
+            config = message[2]
+            break
+        early_messages.append(message)
+    transport.add_peers(config["addresses"])
+    node = CrawlNode(node_id, config["num_nodes"], transport, config["start_url"], num_threads=num_threads,
+                     requests_per_second=config["requests_per_second"], base_url=config["base_url"],
+                     max_depth=config["max_depth"], max_pages_per_depth=config["max_pages_per_depth"],
+                     data_dir=os.path.join(data_dir, f"node-{node_id}"), **kwargs)
+    node.start_crawl(early_messages)
+    return node
+
+
+def _node_process(transport, node_id, data_dir, num_threads, kwargs):
+    run_node(transport, node_id, data_dir, num_threads, **kwargs)
+
+
+def run_local_cluster(start_url, num_nodes: int, requests_per_second=1, max_depth=MAX_DEPTH,
+                      max_pages_per_depth=MAX_PAGES_PER_DEPTH, base_url=WIKIPEDIA_BASE_URL,
+                      data_dir="crawled_data", num_threads=3, **node_kwargs) -> dict:
+    """
+    A whole distributed crawl on this machine: one process per node, coordinated from this
+    process over LocalTransport. Node n stores its pages in data_dir/node-n.
+
+    Nodes are spawned, never forked: a forked node would inherit this process's sockets,
+    SQLite connections and any lock another thread holds at that instant.
+    """
+    context = multiprocessing.get_context("spawn")
+    transports = LocalTransport.create([COORDINATOR, *range(num_nodes)], context)
+    processes = [context.Process(target=_node_process, name=f"crawl-node-{node}",
+                                 args=(transports[node], node, data_dir, num_threads, node_kwargs))
+                 for node in range(num_nodes)]
+    for process in processes:
+        process.start()
+    try:
+        coordinator = CrawlCoordinator(transports[COORDINATOR], num_nodes, requests_per_second)
+        return coordinator.run(start_url, max_depth, max_pages_per_depth, base_url)
+    except BaseException:
+        # Without a coordinator the nodes would wait for messages forever
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+
+
+def _address(value: str):
+    host, _, port = value.rpartition(":")
+    return host, int(port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    roles = parser.add_subparsers(dest="role", required=True)
+    local = roles.add_parser("local", help="coordinator and all nodes on this machine")
+    coordinator = roles.add_parser("coordinator", help="coordinate nodes on other machines")
+    node = roles.add_parser("node", help="one node, joining a coordinator")
+    for role in (local, coordinator):
+        role.add_argument("start_page")
+        role.add_argument("--nodes", type=int, default=2)
+        role.add_argument("--rps", type=float, default=1.0, help="requests per second for the whole crawl")
+        role.add_argument("--max-depth", type=int, default=MAX_DEPTH)
+        role.add_argument("--max-pages-per-depth", type=int, default=MAX_PAGES_PER_DEPTH,
+                          help="links taken per page, counted before dedup: unlike a single-node crawl, "
+                               "links already seen use up the budget, so fewer pages are crawled")
+        role.add_argument("--base-url", default=WIKIPEDIA_BASE_URL)
+    for role in (local, node):
+        role.add_argument("--threads", type=int, default=3, help="fetch threads per node")
+        role.add_argument("--data-dir", default="crawled_data")
+    coordinator.add_argument("--listen", type=_address, required=True, help="host:port")
+    node.add_argument("--id", type=int, required=True)
+    node.add_argument("--coordinator", type=_address, required=True, help="host:port")
+    node.add_argument("--listen", type=_address, required=True, help="host:port")
+    node.add_argument("--advertise", type=_address, help="host:port other nodes reach this one at")
+    args = parser.parse_args()
+
+    authkey = os.environ.get("WIKI_CRAWL_AUTHKEY", "").encode()
+    if args.role != "local" and not authkey:
+        parser.error("set WIKI_CRAWL_AUTHKEY to a secret shared by the coordinator and every node")
+
+    if args.role == "node":
+        transport = SocketTransport(args.id, args.listen, authkey, peers={COORDINATOR: args.coordinator})
+        if args.advertise:
+            transport.address = args.advertise
+        run_node(transport, args.id, args.data_dir, args.threads)
+        transport.close()
+    else:
+        start_url = f"{args.base_url}/wiki/{args.start_page.replace(' ', '_')}"
+        if args.role == "local":
+            run_local_cluster(start_url, args.nodes, args.rps or None, args.max_depth, args.max_pages_per_depth,
+                              args.base_url, args.data_dir, args.threads)
+        else:
+            transport = SocketTransport(COORDINATOR, args.listen, authkey)
+            CrawlCoordinator(transport, args.nodes, args.rps or None).run(
+                start_url, args.max_depth, args.max_pages_per_depth, args.base_url)
+            transport.close()
@@ -0,0 +1,111 @@
+# embedding_cache.py
+import hashlib
+import json
+import os
+import threading
+from array import array
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by a hash of the text content.
+
+    Vectors are float32 rows appended to `vectors.f32` and read back through a memory map;
+    `keys.u64` holds the matching 64-bit content hashes in the same order. A vector is
+    written before its key, so a crash leaves at worst a trailing vector with no key,
+    which is trimmed on the next open. The model name is part of the hash, so vectors
+    from another model are never returned.
+    """
+
+    def __init__(self, path: str, dimension: int, model_name: str = ""):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dimension = dimension
+        self.model_name = model_name
+        self._keys_path = os.path.join(path, "keys.u64")
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._check_meta(os.path.join(path, "meta.json"))
+
+        keys = array('Q')
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, "rb") as f:
+                data = f.read()
+            keys.frombytes(data[:len(data) - len(data) % 8])
+        row_bytes = 4 * dimension
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        self._count = min(len(keys), vector_rows)
+        self._index = {key: row for row, key in enumerate(keys[:self._count])}
+
+        # Drop any half-written tail so appends stay aligned
+        self._keys_file = open(self._keys_path, "ab")
+        self._vectors_file = open(self._vectors_path, "ab")
+        self._keys_file.truncate(8 * self._count)
+        self._vectors_file.truncate(row_bytes * self._count)
+        self._vectors = None  # memory map, re-created once it falls behind _count
+        self._lock = threading.Lock()
+
+    def _check_meta(self, meta_path):
+        meta = {"dimension": self.dimension, "model": self.model_name}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("dimension") != self.dimension:
+                raise ValueError(f"Embedding cache {self.path} holds {stored.get('dimension')}-d vectors, "
+                                 f"not {self.dimension}-d")
+        else:
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+    def _key(self, text: str) -> int:
+        digest = hashlib.blake2b(f"{self.model_name}\0{text}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, text: str) -> bool:
+        return self._key(text) in self._index
+
+    def _matrix(self):
+        if self._vectors is None or len(self._vectors) < self._count:
+            self._vectors_file.flush()
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                      shape=(self._count, self.dimension))
+        return self._vectors
+
+    def get_many(self, texts) -> dict:
+        """{text: vector} for the texts that are cached"""
+        with self._lock:
+            rows = {text: self._index.get(self._key(text)) for text in texts}
+            rows = {text: row for text, row in rows.items() if row is not None}
+            if not rows:
+                return {}
+            matrix = self._matrix()
+            return {text: np.array(matrix[row]) for text, row in rows.items()}
+
+    def put_many(self, texts, vectors):
+        """Stores one row of `vectors` per text; texts already cached are skipped"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            new_keys, new_rows = array('Q'), []
+            for text, vector in zip(texts, vectors):
+                key = self._key(text)
+                if key not in self._index:
+                    self._index[key] = self._count + len(new_rows)
+                    new_keys.append(key)
+                    new_rows.append(vector)
+            if not new_rows:
+                return
+            self._vectors_file.write(np.stack(new_rows).tobytes())
+            self._vectors_file.flush()
+            self._keys_file.write(new_keys.tobytes())
+            self._keys_file.flush()
+            self._count += len(new_rows)
+
+    def close(self):
+        with self._lock:
+            self._vectors = None
+            self._keys_file.close()
+            self._vectors_file.close()
@@ -0,0 +1,77 @@
+# http_session.py
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.wiki_config import HTTP_POOL_SIZE
+
+
+class SessionPool:
+    """
+    Keep-alive HTTP session shared by every caller (page fetches, API lookups).
+    requests.Session is safe to share across threads for plain GETs; the adapter's
+    urllib3 pools hand each thread its own connection and return it for reuse.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE):
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        # pool_block makes threads wait for a free connection instead of opening throwaway ones
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def connection_stats(self) -> dict:
+        """Per-host request and connection counts: {host: {"requests", "connections", "reused"}}"""
+        stats = {}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_host}:{key.key_port}" if key.key_port else key.key_host
+            entry = stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+            entry["reused"] += max(0, pool.num_requests - pool.num_connections)
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> SessionPool:
+    """Returns the process-wide SessionPool, creating it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = SessionPool()
+        return _shared_pool
+
+
+def configure_shared_pool(pool_size: int) -> SessionPool:
+    """Replaces the process-wide SessionPool with one of the given size."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None and _shared_pool.pool_size == pool_size:
+            return _shared_pool
+        old_pool = _shared_pool
+        _shared_pool = SessionPool(pool_size)
+    if old_pool is not None:
+        old_pool.close()
+    return _shared_pool
+
+
+def host_of(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.netloc
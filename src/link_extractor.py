@@ -1,13 +1,76 @@
 from bs4 import BeautifulSoup
 import re
+from html import unescape
 from urllib.parse import unquote
 from src.wiki_config import WIKIPEDIA_BASE_URL, VALID_WIKI_LINK_REGEX
+from src.parsed_page import ParsedPage
+
+# Single pass over the raw bytes. Comments and <script>/<style> bodies are matched
+# (and skipped) as whole units so an <a> inside them is ignored, exactly like html.parser.
+# Quoted attribute values are consumed as units, so a '>' inside a value doesn't end the tag.
+_ANCHOR_SCAN_REGEX = re.compile(
+    rb'<!--.*?(?:-->|\Z)'
+    rb'|<(script|style)(?=[\s/>]).*?(?:</\1\s*>|\Z)'
+    rb'|<a(?=[\s/>])((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>',
+    re.IGNORECASE | re.DOTALL,
+)
+# Same attribute grammar html.parser uses (name, optional '=' and a quoted or bare value)
+_ATTRIBUTE_REGEX = re.compile(
+    rb'([^\s/>"\'=][^\s/=>]*)(?:\s*=+\s*("[^"]*"|\'[^\']*\'|(?![\'"])[^>\s]*))?'
+)
 
 
 class LinkExtractor:
     """entity responsible for extracting links from HTML content"""
 
+    def __init__(self, base_url=WIKIPEDIA_BASE_URL):
+        # Prefix for absolute URLs. Overridable so a local mirror can be crawled.
+        self.base_url = base_url
+
     def extract_links(self, html_content):
+        """
+        Returns the absolute URLs of all valid article links, in document order.
+        Scans the raw bytes directly instead of building a DOM; the output is the
+        same set of links extract_links_soup returns. Accepts bytes, str or a ParsedPage
+        (whose result is cached, so other readers of the page get it for free).
+        """
+        if isinstance(html_content, ParsedPage):
+            page = html_content
+            return page.memoize(("links", self.base_url), lambda: self.extract_links(page.html_content))
+        if not html_content:
+            return []
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+
+        links = {}
+        for match in _ANCHOR_SCAN_REGEX.finditer(html_content):
+            attributes = match.group(2)
+            if not attributes:
+                continue
+            href = self._href_from_attributes(attributes)
+            if href and VALID_WIKI_LINK_REGEX.match(href):
+                links[self.base_url + href] = None
+        return list(links)
+
+    @staticmethod
+    def _href_from_attributes(attributes: bytes) -> str | None:
+        href = None
+        for name, value in _ATTRIBUTE_REGEX.findall(attributes):
+            if name.lower() != b'href':
+                continue
+            if value[:1] in (b'"', b"'"):
+                value = value[1:-1]
+            # Duplicate attributes: the last one wins, as in BeautifulSoup
+            href = value
+        if href is None:
+            return None
+        href = href.decode('utf-8', errors='replace')
+        return unescape(href) if '&' in href else href
+
+    def extract_links_soup(self, html_content):
+        """Reference BeautifulSoup implementation, kept for equivalence tests and benchmarks."""
+        if isinstance(html_content, ParsedPage):
+            html_content = html_content.html_content
         if not html_content:
             return []
 
@@ -17,7 +80,7 @@ class LinkExtractor:
         for anchor_tag in soup.find_all("a", href=True):
             href = anchor_tag.get("href")
             if href and VALID_WIKI_LINK_REGEX.match(href):
-                absolute_url = WIKIPEDIA_BASE_URL + href
+                absolute_url = self.base_url + href
                 links.add(absolute_url)
         return list(links)
 
@@ -37,4 +100,4 @@ class LinkExtractor:
             # Replace underscores with spaces
             #title = title.replace('_', ' ')
             return title
-        return 'Unknown'
\ No newline at end of file
+        return 'Unknown'
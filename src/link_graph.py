@@ -0,0 +1,195 @@
+# link_graph.py
+import json
+import os
+from array import array
+
+import numpy as np
+
+from src.link_extractor import LinkExtractor
+from src.wiki_config import WIKIPEDIA_BASE_URL
+
+_TITLES_FILE = "titles.txt"
+_ARRAYS = ("offsets", "targets", "rev_offsets", "rev_sources", "crawled")
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, num_nodes: int):
+    """(offsets, targets sorted by source); a stable sort keeps each page's link order"""
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+    return offsets, targets[order].astype(np.int32)
+
+
+class LinkGraph:
+    """
+    Article link graph in compressed sparse row form.
+
+    Titles get dense integer IDs. successors(id) is a slice of `targets` between
+    offsets[id] and offsets[id + 1]; predecessors(id) reads the reverse CSR the same way.
+    Linked-to titles that were never crawled are nodes with no outgoing edges, marked
+    False in `crawled`. Saved graphs are a directory of .npy files that load() memory-maps.
+
+    add_pages() appends newly crawled pages without rebuilding: their edges go to an
+    in-memory overlay that lookups merge in, and compact() or save() folds it into the arrays.
+    """
+
+    def __init__(self, titles, offsets, targets, rev_offsets, rev_sources, crawled):
+        self.titles = list(titles)
+        self.title_ids = {title: i for i, title in enumerate(self.titles)}
+        self.offsets, self.targets = offsets, targets
+        self.rev_offsets, self.rev_sources = rev_offsets, rev_sources
+        self.crawled = crawled
+        self._base_nodes = len(offsets) - 1
+        # Overlay from add_pages: new or replaced out-edges and the reverse edges they add
+        self._extra_out = {}
+        self._extra_in = {}
+
+    @classmethod
+    def from_edges(cls, titles, sources, targets, crawled=None):
+        """Graph from parallel source/target ID arrays; `crawled` defaults to nodes with links"""
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        num_nodes = len(titles)
+        offsets, forward = _csr(sources, targets, num_nodes)
+        rev_offsets, reverse = _csr(targets, sources, num_nodes)
+        if crawled is None:
+            crawled = np.diff(offsets) > 0
+        return cls(titles, offsets, forward, rev_offsets, reverse, np.asarray(crawled, dtype=bool))
+
+    @classmethod
+    def build(cls, pages, base_url=WIKIPEDIA_BASE_URL):
+        """Graph from (title, data) pairs such as a page store's iter_pages()"""
+        titles, title_ids = [], {}
+
+        def intern(title):
+            node = title_ids.get(title)
+            if node is None:
+                node = title_ids[title] = len(titles)
+                titles.append(title)
+            return node
+
+        title_of = LinkExtractor(base_url=base_url).get_page_title
+        out_edges = {}  # a repeated title keeps its last link list, as in add_pages
+        for title, data in pages:
+            source = intern(title)
+            out_edges[source] = array('i', [intern(title_of(link)) for link in data.get("links", [])])
+
+        crawled = np.zeros(len(titles), dtype=bool)
+        crawled[list(out_edges)] = True
+        sources = np.repeat(np.fromiter(out_edges, dtype=np.int32, count=len(out_edges)),
+                            [len(targets) for targets in out_edges.values()])
+        targets = np.frombuffer(b"".join(t.tobytes() for t in out_edges.values()), dtype=np.int32)
+        return cls.from_edges(titles, sources, targets, crawled)
+
+    def _intern(self, title: str) -> int:
+        node = self.title_ids.get(title)
+        if node is None:
+            node = self.title_ids[title] = len(self.titles)
+            self.titles.append(title)
+        return node
+
+    def add_pages(self, pages, base_url=WIKIPEDIA_BASE_URL):
+        """Adds or replaces the outgoing links of crawled pages"""
+        title_of = LinkExtractor(base_url=base_url).get_page_title
+        for title, data in pages:
+            source = self._intern(title)
+            targets = np.array([self._intern(title_of(link)) for link in data.get("links", [])], dtype=np.int32)
+            for target in self.successors(source):
+                self._drop_reverse(source, int(target))
+            self._extra_out[source] = targets
+            for target in targets.tolist():
+                self._extra_in.setdefault(target, []).append(source)
+
+    def _drop_reverse(self, source: int, target: int):
+        sources = self._extra_in.get(target)
+        if sources and source in sources:
+            sources.remove(source)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.titles)
+
+    @property
+    def num_edges(self) -> int:
+        base = int(self.offsets[-1]) - sum(int(self.offsets[s + 1] - self.offsets[s])
+                                             for s in self._extra_out if s < self._base_nodes)
+        return base + sum(len(targets) for targets in self._extra_out.values())
+
+    def id_of(self, title: str) -> int | None:
+        return self.title_ids.get(title)
+
+    def title_of(self, node: int) -> str:
+        return self.titles[node]
+
+    def is_crawled(self, node: int) -> bool:
+        return node in self._extra_out or (node < self._base_nodes and bool(self.crawled[node]))
+
+    def successors(self, node: int) -> np.ndarray:
+        targets = self._extra_out.get(node)
+        if targets is not None:
+            return targets
+        if node >= self._base_nodes:
+            return self.targets[:0]
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> np.ndarray:
+        if node < self._base_nodes:
+            sources = self.rev_sources[self.rev_offsets[node]:self.rev_offsets[node + 1]]
+        else:
+            sources = self.rev_sources[:0]
+        if self._extra_out:
+            # Pages re-added through the overlay contribute their new edges below instead
+            sources = sources[[int(s) not in self._extra_out for s in sources]] if len(sources) else sources
+        extra = self._extra_in.get(node)
+        if extra:
+            sources = np.concatenate([sources, np.array(extra, dtype=np.int32)])
+        return sources
+
+    def compact(self):
+        """Folds the add_pages overlay into fresh CSR arrays"""
+        if not self._extra_out and self._base_nodes == self.num_nodes:
+            return
+        num_nodes = self.num_nodes
+        base_sources = np.repeat(np.arange(self._base_nodes, dtype=np.int32), np.diff(self.offsets))
+        keep = ~np.isin(base_sources, np.fromiter(self._extra_out, dtype=np.int32, count=len(self._extra_out)))
+        extra_sources = [np.full(len(t), s, dtype=np.int32) for s, t in self._extra_out.items()]
+        sources = np.concatenate([base_sources[keep], *extra_sources])
+        targets = np.concatenate([self.targets[keep], *self._extra_out.values()]).astype(np.int32)
+
+        crawled = np.zeros(num_nodes, dtype=bool)
+        crawled[:self._base_nodes] = self.crawled
+        crawled[list(self._extra_out)] = True
+
+        self.offsets, self.targets = _csr(sources, targets, num_nodes)
+        self.rev_offsets, self.rev_sources = _csr(targets, sources, num_nodes)
+        self.crawled = crawled
+        self._base_nodes = num_nodes
+        self._extra_out, self._extra_in = {}, {}
+
+    def save(self, path: str):
+        """Writes the compacted graph as .npy arrays plus a title list"""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        # Write beside and rename, so a graph memory-mapped from `path` is never truncated under it
+        for name in _ARRAYS:
+            target = os.path.join(path, f"{name}.npy")
+            with open(target + ".tmp", "wb") as f:
+                np.save(f, getattr(self, name))
+            os.replace(target + ".tmp", target)
+        target = os.path.join(path, _TITLES_FILE)
+        with open(target + ".tmp", "w", encoding="utf-8") as f:
+            for title in self.titles:
+                f.write(json.dumps(title, ensure_ascii=False) + "\n")
+        os.replace(target + ".tmp", target)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Opens a saved graph; with mmap the arrays are paged in from disk on demand"""
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None) for name in _ARRAYS]
+        with open(os.path.join(path, _TITLES_FILE), encoding="utf-8") as f:
+            titles = [json.loads(line) for line in f]
+        return cls(titles, *arrays)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the CSR arrays"""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
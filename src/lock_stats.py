@@ -0,0 +1,42 @@
+# lock_stats.py
+import threading
+import time
+
+
+class InstrumentedLock:
+    """
+    threading.Lock that records how often it was taken, how often a thread had
+    to wait for it, and the total time spent waiting. Use it as a context manager.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_seconds = 0.0
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            # Counters are only touched while holding the lock
+            self.contended += 1
+            self.wait_seconds += time.perf_counter() - start
+        self.acquisitions += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lock.release()
+
+
+def summarize_locks(locks) -> dict:
+    """Totals over a group of InstrumentedLocks (e.g. all shards of one structure)"""
+    acquisitions = sum(lock.acquisitions for lock in locks)
+    contended = sum(lock.contended for lock in locks)
+    return {
+        "locks": len(locks),
+        "acquisitions": acquisitions,
+        "contended": contended,
+        "contended_ratio": contended / acquisitions if acquisitions else 0.0,
+        "wait_seconds": sum(lock.wait_seconds for lock in locks),
+    }
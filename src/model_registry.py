@@ -0,0 +1,42 @@
+# model_registry.py
+import threading
+
+_models = {}  # (kind, model name) -> whatever the loader returned
+_locks = {}  # (kind, model name) -> lock held while that model loads
+_registry_lock = threading.Lock()
+
+
+def get_model(kind: str, model_name: str, loader):
+    """
+    The process-wide instance of a model, calling loader() the first time it is asked for.
+
+    Every SemanticEmbedder or TopicClassifier in a process (one per crawler worker, say)
+    shares one copy of its weights. Concurrent first calls for the same model wait for a
+    single load; different models load in parallel. A loader that raises is not cached,
+    so the next call tries again.
+    """
+    key = (kind, model_name)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        model = _models.get(key)
+        if model is None:
+            model = loader()
+            _models[key] = model
+    return model
+
+
+def loaded_models() -> list[tuple[str, str]]:
+    """(kind, model name) of every model loaded so far"""
+    return list(_models)
+
+
+def release(kind: str = None, model_name: str = None):
+    """Drops registry references, all of them or those matching kind/model_name"""
+    with _registry_lock:
+        for key in list(_models):
+            if kind in (None, key[0]) and model_name in (None, key[1]):
+                del _models[key]
@@ -0,0 +1,212 @@
+# page_archive.py
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+from array import array
+
+from src.data_store import open_crawl_dir
+from src.url_frontier import url_hash64
+
+# File layout, little-endian:
+#   header   magic, page count, record count, end of records, field-name table (offset, length), index (offset, slots)
+#   records  per page: u32 record length, u16 title length, u16 field count, title,
+#            (u16 field id, u32 value start, u32 value length) per field, then the page as one
+#            JSON object; value spans point into it so single fields decode on their own
+#   fields   JSON list of field names, indexed by field id
+#   index    open-addressing table of (title hash, record offset) u64 pairs, linear probing
+_MAGIC = b"WPARCH01"
+_HEADER = struct.Struct("<8sQQQQQQQ")
+_DATA_START = 64
+_RECORD_HEADER = struct.Struct("<IHH")
+_FIELD_ENTRY = struct.Struct("<HII")
+_MAX_LOAD = 0.7
+
+
+class PageArchiveWriter:
+    """Writes pages into a PageArchive file. The file only appears, atomically, on close()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(bytes(_DATA_START))
+        self._field_ids = {}
+        self._entries = array('Q')  # (title hash, record offset) pairs
+        self._offset = _DATA_START
+
+    def add(self, title: str, data: dict):
+        title_bytes = title.encode("utf-8")
+        entries, parts, position = [], [], 1  # position 0 holds the opening brace
+        for name, value in data.items():
+            field_id = self._field_ids.setdefault(name, len(self._field_ids))
+            key = json.dumps(name, ensure_ascii=False).encode("utf-8") + b":"
+            encoded = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+            entries.append(_FIELD_ENTRY.pack(field_id, position + len(key), len(encoded)))
+            parts.append(key + encoded)
+            position += len(key) + len(encoded) + 1  # the comma or closing brace
+        body = b"".join([title_bytes, *entries, b"{", b",".join(parts), b"}"])
+        self._file.write(_RECORD_HEADER.pack(_RECORD_HEADER.size + len(body), len(title_bytes), len(entries)))
+        self._file.write(body)
+        self._entries.extend((url_hash64(title), self._offset))
+        self._offset += _RECORD_HEADER.size + len(body)
+
+    def close(self) -> str:
+        records = len(self._entries) // 2
+        fields = json.dumps(sorted(self._field_ids, key=self._field_ids.get)).encode("utf-8")
+        fields_offset = self._offset
+        table_offset = fields_offset + len(fields)
+        table_offset += -table_offset % 8  # the index is read as an aligned u64 array
+        slots = 1 << max(4, math.ceil(math.log2(max(records, 1) / _MAX_LOAD)))
+
+        table = array('Q', bytes(16 * slots))
+        mask = slots - 1
+        count = 0
+        for i in range(0, len(self._entries), 2):
+            key, offset = self._entries[i], self._entries[i + 1]
+            index = key & mask
+            # A repeated title overwrites its slot, so the last copy added wins
+            while table[2 * index] and table[2 * index] != key:
+                index = (index + 1) & mask
+            count += not table[2 * index]
+            table[2 * index], table[2 * index + 1] = key, offset
+
+        self._file.write(fields)
+        self._file.write(bytes(table_offset - fields_offset - len(fields)))
+        self._file.write(table.tobytes())
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, count, records, self._offset, fields_offset, len(fields), table_offset, slots))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+
+class PageArchive:
+    """
+    Read-only, memory-mapped page store built by PageArchiveWriter.
+
+    Lookups hash the title into the on-disk index, so nothing is loaded at open time and
+    a lookup touches two pages of the file. Each field is stored as its own JSON value,
+    so get(title, fields=["links"]) decodes only the links. Offers the same
+    load_page_data/has_page/iter_pages reads as the page stores.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._records, self._data_end, fields_offset, fields_len, table_offset, slots = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a page archive")
+        self._fields = json.loads(self._mm[fields_offset:fields_offset + fields_len])
+        self._table = memoryview(self._mm)[table_offset:table_offset + 16 * slots].cast('Q')
+        self._mask = slots - 1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, title: str) -> bool:
+        return self._find(title) is not None
+
+    def _find(self, title: str) -> int | None:
+        """Record offset for title, or None"""
+        key = url_hash64(title)
+        table, mask = self._table, self._mask
+        index = key & mask
+        while True:
+            slot_key = table[2 * index]
+            if slot_key == 0:
+                return None
+            if slot_key == key and self._title_at(table[2 * index + 1]) == title:
+                return table[2 * index + 1]
+            index = (index + 1) & mask
+
+    def _title_at(self, offset: int) -> str:
+        _, title_len, _ = _RECORD_HEADER.unpack_from(self._mm, offset)
+        start = offset + _RECORD_HEADER.size
+        return self._mm[start:start + title_len].decode("utf-8")
+
+    def _decode(self, offset: int, fields=None) -> dict:
+        length, title_len, field_count = _RECORD_HEADER.unpack_from(self._mm, offset)
+        directory = offset + _RECORD_HEADER.size + title_len
+        start = directory + _FIELD_ENTRY.size * field_count
+        if fields is None:
+            return json.loads(self._mm[start:offset + length])
+        page = {}
+        for field_id, value_start, value_len in _FIELD_ENTRY.iter_unpack(self._mm[directory:start]):
+            name = self._fields[field_id]
+            if name in fields:
+                page[name] = json.loads(self._mm[start + value_start:start + value_start + value_len])
+        return page
+
+    def get(self, title: str, fields=None) -> dict | None:
+        """Page data for title, or None. `fields` limits which fields are decoded."""
+        offset = self._find(title)
+        return None if offset is None else self._decode(offset, fields)
+
+    def load_page_data(self, title: str) -> dict | None:
+        return self.get(title)
+
+    def has_page(self, title: str) -> bool:
+        return title in self
+
+    def _live_records(self):
+        """(title, offset, length) in file order, skipping records superseded by a later copy"""
+        offset = _DATA_START
+        while offset < self._data_end:
+            length, _, _ = _RECORD_HEADER.unpack_from(self._mm, offset)
+            title = self._title_at(offset)
+            if self._records == self._count or self._find(title) == offset:
+                yield title, offset, length
+            offset += length
+
+    def iter_records(self):
+        """Yields (title, memoryview of the raw record) in file order, without copying records"""
+        view = memoryview(self._mm)
+        for title, offset, length in self._live_records():
+            yield title, view[offset:offset + length]
+
+    def iter_pages(self, fields=None):
+        """Yields (title, data) in file order, decoding only `fields` when given"""
+        for title, offset, _ in self._live_records():
+            yield title, self._decode(offset, fields)
+
+    def close(self):
+        self._table.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def build_archive(pages, path: str) -> str:
+    """Writes (title, data) pairs, e.g. from a page store's iter_pages(), into an archive"""
+    writer = PageArchiveWriter(path)
+    for title, data in pages:
+        writer.add(title, data)
+    return writer.close()
+
+
+def convert_crawl_dir(data_dir: str, path: str) -> str:
+    """Archives a crawl output directory, either per-page JSON files or the SQLite page store"""
+    store = open_crawl_dir(data_dir)
+    try:
+        return build_archive(store.iter_pages(), path)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a crawl output directory into a page archive")
+    parser.add_argument("data_dir", nargs="?", default="crawled_data")
+    parser.add_argument("archive", nargs="?", default="crawled_data.archive")
+    args = parser.parse_args()
+    with PageArchive(convert_crawl_dir(args.data_dir, args.archive)) as archive:
+        print(f"Archived {len(archive)} pages to {args.archive}")
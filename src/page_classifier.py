@@ -1,10 +1,313 @@
-
 """
-This is a palceholder page classification logic.
-This must use custom NLP. Using an LLM would take too much runtime + computation. Which means money (and I do not have all of that)
+Cheap page classification that runs inline at crawl rate.
+An LLM or a zero-shot NLI model per page would take too much runtime + computation, so instead
+a linear model over hashed bag-of-words features (title, lead text, categories, infobox keys)
+is trained offline from labels those slower tools produce. At crawl time the features come from
+a scan of the raw page bytes (scan_page_record), not a DOM, so a page costs about as much as its
+link extraction; bench_page_classifier reports the end-to-end rate.
+
+Train from a crawl run with store_article_fields=True (labels from
+CategoryResolver.get_canonical_topics, or --labels zero-shot):
+    python -m src.page_classifier crawled_data --out models/page_classifier.npz
 """
+import argparse
+import json
+import os
+import re
+import zlib
+from html import unescape
+
+import numpy as np
+
+from src.parsed_page import ParsedPage
+from src.wiki_config import PAGE_CLASSIFIER_MODEL, PAGE_CLASSIFIER_FEATURES, PAGE_CLASSIFIER_MIN_CONFIDENCE
+
+_WORD_RE = re.compile(r"\w\w+")
+_MAX_LEAD_CHARS = 2000  # the first paragraphs carry the topic; the rest only costs time
+
+# Byte patterns for scan_page_record; they approximate WikiParser's tree walks on MediaWiki markup
+_HEADING_REGEX = re.compile(rb'<h2[\s>]|<div class="mw-heading')
+_PARAGRAPH_REGEX = re.compile(rb'<p(?:\s[^>]*)?>(.*?)</p\s*>', re.DOTALL)
+_INFOBOX_REGEX = re.compile(rb'<table[^>]*\bclass="[^"]*\binfobox\b[^"]*"[^>]*>(.*?)</table\s*>', re.DOTALL)
+_ROW_REGEX = re.compile(rb'<tr(?:\s[^>]*)?>(.*?)(?=<tr[\s>]|\Z)', re.DOTALL)
+_HEADER_CELL_REGEX = re.compile(rb'<th(?:\s[^>]*)?>(.*?)</th\s*>', re.DOTALL)
+_CATEGORY_REGEX = re.compile(rb'<a\s[^>]*?href="/wiki/Category:[^"]*"[^>]*>(.*?)</a\s*>', re.DOTALL)
+_REFERENCE_REGEX = re.compile(rb'<sup[^>]*\bclass="[^"]*\breference\b[^"]*"[^>]*>.*?</sup\s*>|<!--.*?-->',
+                              re.DOTALL)
+_TAG_REGEX = re.compile(rb'<[^>]*>')
+_SPACE_REGEX = re.compile(r'\s+')
+
+
+def _fragment_text(fragment: bytes) -> str:
+    text = _TAG_REGEX.sub(b"", _REFERENCE_REGEX.sub(b"", fragment)).decode("utf-8", errors="ignore")
+    return _SPACE_REGEX.sub(" ", unescape(text)).strip()
+
+
+def scan_page_record(html_content: bytes | ParsedPage) -> dict:
+    """
+    lead_text, categories and infobox (keys only) of a raw article page, found by scanning
+    its bytes for the MediaWiki markers instead of building a soup. Close enough to
+    WikiParser's output for features; the lead text stops once it has _MAX_LEAD_CHARS.
+    With a ParsedPage the result is memoized on the page.
+    """
+    if isinstance(html_content, ParsedPage):
+        page = html_content
+        return page.memoize("classifier_record", lambda: scan_page_record(page.html_content))
+    html = html_content or b""
+
+    start = html.find(b'class="mw-parser-output"')
+    if start < 0:
+        start = max(html.find(b"<body"), 0)
+    heading = _HEADING_REGEX.search(html, start)
+    end = heading.start() if heading else len(html)
+
+    infobox = {}
+    box = _INFOBOX_REGEX.search(html, start, end)
+    if box:
+        for row in _ROW_REGEX.finditer(box.group(1)):
+            header = _HEADER_CELL_REGEX.search(row.group(1))
+            if header and b"<td" in row.group(1):
+                infobox[_fragment_text(header.group(1))] = ""
+    skip = box.span() if box else (0, 0)
+
+    paragraphs, length = [], 0
+    for paragraph in _PARAGRAPH_REGEX.finditer(html, start, end):
+        if skip[0] <= paragraph.start() < skip[1]:
+            continue  # inside the infobox, not a lead paragraph
+        text = _fragment_text(paragraph.group(1))
+        if text:
+            paragraphs.append(text)
+            length += len(text)
+            if length >= _MAX_LEAD_CHARS:
+                break
+
+    categories = []
+    catlinks = html.rfind(b'id="mw-normal-catlinks"')
+    if catlinks < 0:
+        catlinks = html.rfind(b'id="catlinks"')
+    if catlinks >= 0:
+        hidden = html.find(b'id="mw-hidden-catlinks"', catlinks)
+        for anchor in _CATEGORY_REGEX.finditer(html, catlinks, hidden if hidden >= 0 else len(html)):
+            categories.append(_fragment_text(anchor.group(1)))
+    return {"lead_text": "\n".join(paragraphs), "categories": categories, "infobox": infobox}
+
+
+def page_features(title: str, lead_text: str, categories, infobox_keys, n_features: int, bigrams: bool = False):
+    """
+    Hashed feature ids and weights of one page, log-scaled counts with unit L2 norm.
+    Id 0 is a bias feature every page has. Training and inference share this function.
+    """
+    words = _WORD_RE.findall(lead_text[:_MAX_LEAD_CHARS].lower())
+    tokens = ["t:" + word for word in _WORD_RE.findall(title.replace("_", " ").lower())]
+    tokens += words
+    if bigrams:
+        tokens += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for category in categories:
+        category = category.lower()
+        tokens.append("c:" + category)
+        tokens += ["cw:" + word for word in _WORD_RE.findall(category)]
+    tokens += ["i:" + key.lower() for key in infobox_keys]
+
+    hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint32, count=len(tokens))
+    ids, counts = np.unique(hashes % np.uint32(n_features - 1) + np.uint32(1), return_counts=True)
+    values = 1.0 + np.log(counts, dtype=np.float32)
+    values /= max(float(np.sqrt(values @ values)), 1e-12)
+    return np.concatenate(([0], ids)).astype(np.int64), np.concatenate(([1.0], values)).astype(np.float32)
+
+
+def record_features(title: str, record: dict, n_features: int, bigrams: bool = False):
+    """page_features of a stored page record or WikiParser article"""
+    return page_features(title, record.get("lead_text") or "", record.get("categories") or [],
+                         (record.get("infobox") or {}).keys(), n_features, bigrams)
+
+
+class LinearPageModel:
+    """
+    Softmax regression over hashed features. Only features seen in training keep a weight row;
+    rows are stored as int8 with one scale each, so a model is a few hundred KB to a few MB.
+    """
+
+    def __init__(self, labels, feature_ids, weights, n_features: int, bigrams: bool = False):
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.bigrams = bigrams
+        self.feature_ids = np.asarray(feature_ids, dtype=np.int64)
+        # The extra all-zero last row answers every feature the model never saw
+        self.weights = np.vstack([np.asarray(weights, dtype=np.float32), np.zeros((1, len(self.labels)), np.float32)])
+        self.row_of = np.full(n_features, len(self.feature_ids), dtype=np.int32)
+        self.row_of[self.feature_ids] = np.arange(len(self.feature_ids), dtype=np.int32)
+
+    @classmethod
+    def train(cls, features, targets, labels, n_features: int, bigrams: bool = False, epochs: int = 8,
+              batch_size: int = 256, learning_rate: float = 0.5, l2: float = 1e-6, seed: int = 0):
+        """
+        features: (ids, values) per page from page_features; targets: the labels of each page,
+        several labels share the page's target mass. Trained with mini-batch Adagrad.
+        """
+        label_ids = {label: i for i, label in enumerate(labels)}
+        used, inverse = np.unique(np.concatenate([ids for ids, _ in features]), return_inverse=True)
+        lengths = np.array([len(ids) for ids, _ in features])
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        columns = inverse.astype(np.int64)  # compact feature row of every (page, feature) entry
+        values = np.concatenate([v for _, v in features])
+        y = np.zeros((len(features), len(labels)), dtype=np.float32)
+        for page, page_labels in enumerate(targets):
+            for label in page_labels:
+                y[page, label_ids[label]] = 1.0 / len(page_labels)
+
+        weights = np.zeros((len(used), len(labels)), dtype=np.float32)
+        squared = np.full_like(weights, 1e-8)
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), batch_size):
+                pages = order[start:start + batch_size]
+                spans = [np.arange(offsets[p], offsets[p + 1]) for p in pages]
+                entries = np.concatenate(spans)
+                starts = np.concatenate(([0], np.cumsum([len(s) for s in spans])[:-1]))
+                rows, vals = columns[entries], values[entries][:, None]
+
+                logits = np.add.reduceat(weights[rows] * vals, starts)  # every page has the bias, so no empty spans
+                logits -= logits.max(axis=1, keepdims=True)
+                probabilities = np.exp(logits)
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+                error = (probabilities - y[pages]) / len(pages)
+
+                touched, local = np.unique(rows, return_inverse=True)
+                gradient = np.zeros((len(touched), len(labels)), dtype=np.float32)
+                np.add.at(gradient, local, np.repeat(error, [len(s) for s in spans], axis=0) * vals)
+                gradient += l2 * weights[touched]
+                squared[touched] += gradient * gradient
+                weights[touched] -= learning_rate * gradient / np.sqrt(squared[touched])
+
+        keep = np.abs(weights).max(axis=1) > 1e-4 * np.abs(weights).max()
+        return cls(labels, used[keep], weights[keep], n_features, bigrams)
+
+    def predict_features(self, ids, values) -> np.ndarray:
+        """Label probabilities for one page's features"""
+        logits = values @ self.weights[self.row_of[ids]]
+        probabilities = np.exp(logits - logits.max())
+        return probabilities / probabilities.sum()
+
+    def predict(self, title: str, record: dict) -> tuple[str, float]:
+        """(best label, its probability) for a stored page record or WikiParser article"""
+        probabilities = self.predict_features(*record_features(title, record, self.n_features, self.bigrams))
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path: str):
+        weights = self.weights[:-1]
+        scales = np.abs(weights).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            np.savez_compressed(f, labels=np.array(self.labels), feature_ids=self.feature_ids.astype(np.uint32),
+                                weights=np.round(weights / scales[:, None]).astype(np.int8),
+                                scales=scales.astype(np.float32),
+                                meta=np.array(json.dumps({"n_features": self.n_features, "bigrams": self.bigrams})))
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            weights = data["weights"].astype(np.float32) * data["scales"][:, None]
+            return cls(data["labels"].tolist(), data["feature_ids"], weights, meta["n_features"], meta["bigrams"])
+
+
 class PageClassifier:
-    def __init__(self):
-        pass
+    def __init__(self, model_path: str = PAGE_CLASSIFIER_MODEL, min_confidence: float = PAGE_CLASSIFIER_MIN_CONFIDENCE,
+                 model: LinearPageModel = None):
+        """Without a trained model (model, or a file at model_path) every page is left unclassified."""
+        self.min_confidence = min_confidence
+        self.model = model
+        if self.model is None and model_path and os.path.exists(model_path):
+            self.model = LinearPageModel.load(model_path)
+            print(f"PageClassifier loaded {len(self.model.labels)} labels from {model_path}")
+
     def classify(self, page_content, page_title):
-        pass
\ No newline at end of file
+        """
+        page_content is the crawler's shared ParsedPage. Its features come from
+        scan_page_record, so classifying never builds the page's soup.
+        """
+        if self.model is None:
+            return None
+        return self.classify_record(page_title, scan_page_record(page_content))
+
+    def classify_record(self, page_title: str, record: dict) -> str | None:
+        """Label of a stored page record or WikiParser article, None below min_confidence"""
+        if self.model is None:
+            return None
+        label, confidence = self.model.predict(page_title, record)
+        return label if confidence >= self.min_confidence else None
+
+
+def label_pages(pages, source: str = "categories", candidate_labels=None, category_resolver=None):
+    """(title, record, labels) for every page the label source gives at least one label"""
+    pages = list(pages)
+    if source == "zero-shot":
+        from src.topic_classifier import TopicClassifier
+        classifier = TopicClassifier()
+        texts = [f"{title.replace('_', ' ')}. {record.get('lead_text', '')}" for title, record in pages]
+        results = classifier.classify_batch(texts, candidate_labels, confidence_threshold=0.5)
+        labels = [[topic["label"] for topic in result[:1]] for result in results]
+    else:
+        from src.category_resolver import CategoryResolver
+        resolver = category_resolver or CategoryResolver()
+        labels = [resolver.get_canonical_topics(record.get("categories") or [], record.get("infobox") or {}, title)
+                  for title, record in pages]
+    return [(title, record, page_labels) for (title, record), page_labels in zip(pages, labels) if page_labels]
+
+
+def train_classifier(labelled, n_features: int = PAGE_CLASSIFIER_FEATURES, bigrams: bool = False,
+                     epochs: int = 8) -> LinearPageModel:
+    """Trains a model on label_pages output"""
+    labels = sorted({label for _, _, page_labels in labelled for label in page_labels})
+    features = [record_features(title, record, n_features, bigrams) for title, record, _ in labelled]
+    return LinearPageModel.train(features, [page_labels for _, _, page_labels in labelled], labels,
+                                 n_features, bigrams, epochs)
+
+
+def accuracy(model: LinearPageModel, labelled) -> float:
+    """Share of pages whose predicted label is one of their labels"""
+    hits = sum(model.predict(title, record)[0] in page_labels for title, record, page_labels in labelled)
+    return hits / max(1, len(labelled))
+
+
+if __name__ == "__main__":
+    from src.data_store import open_crawl_dir
+
+    parser = argparse.ArgumentParser(description="Train a PageClassifier model from a crawl output directory. "
+                                                 "The crawl must have stored article fields "
+                                                 "(store_article_fields=True, or an archive reprocess).")
+    parser.add_argument("data_dir", nargs="?", default="crawled_data",
+                        help="crawl output whose records carry lead_text, categories and infobox")
+    parser.add_argument("--out", default=PAGE_CLASSIFIER_MODEL)
+    parser.add_argument("--labels", choices=["categories", "zero-shot"], default="categories",
+                        help="CategoryResolver canonical topics, or TopicClassifier (needs torch)")
+    parser.add_argument("--candidate-labels", nargs="+", help="labels for --labels zero-shot")
+    parser.add_argument("--features", type=int, default=PAGE_CLASSIFIER_FEATURES)
+    parser.add_argument("--bigrams", action="store_true")
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--holdout", type=float, default=0.1, help="share of pages kept back to report accuracy")
+    args = parser.parse_args()
+    if args.labels == "zero-shot" and not args.candidate_labels:
+        parser.error("--labels zero-shot needs --candidate-labels")
+
+    store = open_crawl_dir(args.data_dir)
+    pages = list(store.iter_pages())
+    store.close()
+    if pages and not any("lead_text" in record for _, record in pages):
+        raise SystemExit(f"The pages in {args.data_dir} have no article fields (lead_text, categories, infobox). "
+                         f"Crawl with store_article_fields=True, or reprocess the response archive, then train.")
+    labelled = label_pages(pages, args.labels, args.candidate_labels)
+    if not labelled:
+        raise SystemExit(f"No labelled pages in {args.data_dir}")
+    np.random.default_rng(0).shuffle(labelled)
+    held_out = int(len(labelled) * args.holdout)
+    model = train_classifier(labelled[held_out:], args.features, args.bigrams, args.epochs)
+    model.save(args.out)
+    print(f"Trained on {len(labelled) - held_out} pages, {len(model.labels)} labels, "
+          f"{len(model.feature_ids)} features; saved {os.path.getsize(args.out) / 1024:.0f} KB to {args.out}")
+    if held_out:
+        print(f"Held-out accuracy on {held_out} pages: {accuracy(model, labelled[:held_out]):.3f}")
@@ -1,29 +1,92 @@
 # page_fetcher.py
-import requests
+from typing import NamedTuple
+
 from requests.exceptions import RequestException, Timeout
 import time
 
+from src.http_session import get_shared_pool
+from src.rate_limiter import ARTICLE_ENDPOINT, parse_retry_after
+
+# Statuses that mean "slow down" rather than "broken"
+THROTTLE_STATUSES = (429, 503)
+
+
+class FetchResult(NamedTuple):
+    content: bytes | None
+    status: int | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
 
 class PageFetcher:
-    def __init__(self, retries=3, delay=1):
+    def __init__(self, retries=3, delay=1, session_pool=None, rate_limiter=None, endpoint=ARTICLE_ENDPOINT):
         self.retries = retries
         self.delay = delay  # seconds to wait between retries
+        self.session_pool = session_pool  # None means the process-wide shared pool
+        # When set, 429/503 responses throttle this endpoint's bucket and retries wait on it
+        self.rate_limiter = rate_limiter
+        self.endpoint = endpoint
+
+    def _pool(self):
+        return self.session_pool or get_shared_pool()
 
     def fetch(self, url: str) -> bytes | None:
         """
         Fetches the content of a given URL with retries and exponential backoff.
         Returns content as bytes, or None on failure.
         """
+        return self.fetch_conditional(url).content
+
+    def fetch_conditional(self, url: str, etag: str = None, last_modified: str = None) -> FetchResult:
+        """
+        Like fetch, but sends If-None-Match / If-Modified-Since when validators from a
+        previous crawl are given. An unchanged page comes back as a 304 result with no content.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
         for i in range(self.retries):
+            throttled = False
             try:
-                response = requests.get(url, timeout=10)  # Added timeout
+                response = self._pool().get(url, headers=headers, timeout=10)  # Added timeout
+                if response.status_code == 304:
+                    self._record_success()
+                    return FetchResult(None, 304, etag, last_modified)
+                if response.status_code in THROTTLE_STATUSES:
+                    throttled = self._throttle(response.status_code, response.headers.get("Retry-After"))
                 response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-                return response.content
+                self._record_success()
+                return FetchResult(response.content, response.status_code,
+                                   response.headers.get("ETag"), response.headers.get("Last-Modified"))
             except Timeout:
                 print(f"Timeout fetching {url}. Attempt {i + 1}/{self.retries}")
             except RequestException as e:
                 print(f"Error fetching {url}: {e}. Attempt {i + 1}/{self.retries}")
 
             if i < self.retries - 1:  # Don't sleep after last attempt
-                time.sleep(self.delay * (i + 1))  # Exponential backoff
-        return None
\ No newline at end of file
+                if throttled:
+                    self.rate_limiter.wait_if_needed(self.endpoint)  # honours Retry-After
+                else:
+                    time.sleep(self.delay * (i + 1))  # Exponential backoff
+        return FetchResult(None, None)
+
+    def _throttle(self, status, retry_after_header) -> bool:
+        """Tells the rate limiter the server pushed back; True if it will pace the retry"""
+        if self.rate_limiter is None:
+            return False
+        retry_after = parse_retry_after(retry_after_header)
+        if status == 503 and retry_after is None:
+            return False  # a plain 503 is an outage, not a rate limit
+        # False for an unlimited bucket and no Retry-After: the backoff sleep paces the retry instead
+        return self.rate_limiter.throttle(self.endpoint, retry_after)
+
+    def _record_success(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success(self.endpoint)
@@ -0,0 +1,35 @@
+# parsed_page.py
+from functools import cached_property
+
+from bs4 import BeautifulSoup
+
+
+class ParsedPage:
+    """
+    Shared document model for one fetched page.
+
+    The raw bytes are decoded and parsed at most once, and only when a component
+    actually asks for them. LinkExtractor scans the raw bytes, WikiParser reads the
+    soup, and PageClassifier reads the text, so no component re-parses the page.
+    """
+
+    def __init__(self, html_content: bytes, url: str):
+        self.html_content = html_content
+        self.url = url
+        self._memo = {}
+
+    @cached_property
+    def text(self) -> str:
+        """The page body decoded to str"""
+        return self.html_content.decode('utf-8', errors='ignore')
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """The parsed DOM. Readers must not modify it, other components share it."""
+        return BeautifulSoup(self.html_content, 'html.parser')
+
+    def memoize(self, key, compute):
+        """Returns the cached result for key, computing it on first use"""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
@@ -0,0 +1,241 @@
+# path_solver.py
+import argparse
+import heapq
+import math
+from urllib.parse import quote
+
+import numpy as np
+
+from src.data_store import open_crawl_dir
+from src.link_extractor import LinkExtractor
+from src.link_graph import LinkGraph
+from src.wiki_config import WIKIPEDIA_BASE_URL, SOLVER_MAX_FETCHES, SOLVER_FETCH_BATCH
+
+
+def _gather(offsets, targets, frontier):
+    """All neighbours of the frontier nodes in one vectorised slice, with the node each came from"""
+    starts = offsets[frontier]
+    lengths = offsets[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return targets[:0], frontier[:0]
+    shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return targets[np.arange(total) + shift], np.repeat(frontier, lengths)
+
+
+class PathSolver:
+    """
+    Shortest click paths between articles over a LinkGraph.
+
+    shortest_path() runs a bidirectional BFS: each round expands whichever side has the
+    smaller frontier by one full level, over the CSR arrays with NumPy, until the sides meet.
+    With an embedder (anything with get_embedding(text), e.g. SemanticEmbedder), astar_path()
+    searches from the start only, guided by h = (1 - cosine(title, target)) / 2. That never
+    exceeds one click, so the path is still a shortest one; weight > 1 trades that for speed.
+
+    With a page_fetcher, a search that runs out of crawled pages fetches the nearest
+    uncrawled pages it reached (at most max_fetches), adds their links and searches again.
+    """
+
+    def __init__(self, graph: LinkGraph, page_fetcher=None, rate_limiter=None, embedder=None,
+                 base_url=WIKIPEDIA_BASE_URL, max_fetches=SOLVER_MAX_FETCHES, fetch_batch=SOLVER_FETCH_BATCH):
+        self.graph = graph
+        self.page_fetcher = page_fetcher
+        self.rate_limiter = rate_limiter
+        self.embedder = embedder
+        self.base_url = base_url
+        self.link_extractor = LinkExtractor(base_url=base_url)
+        self.max_fetches = max_fetches
+        self.fetch_batch = fetch_batch
+        self.pages_fetched = 0
+        self._embeddings = {}  # title -> unit vector
+        self.graph.compact()  # the vectorised search reads the CSR arrays directly
+
+    def shortest_path(self, start_title: str, target_title: str) -> list[str] | None:
+        """Titles along a shortest path, including both ends, or None"""
+        return self._solve(start_title, target_title, self._bidirectional_bfs)
+
+    def astar_path(self, start_title: str, target_title: str, weight: float = 1.0) -> list[str] | None:
+        """Like shortest_path, but expands pages whose titles embed closest to the target first"""
+        if self.embedder is None:
+            raise ValueError("A* search needs an embedder")
+        return self._solve(start_title, target_title, lambda s, t: self._astar(s, t, weight))
+
+    def _solve(self, start_title, target_title, search):
+        graph = self.graph
+        start, target = graph.id_of(start_title), graph.id_of(target_title)
+        if start is None and self.page_fetcher is not None and self._fetch_pages([start_title]):
+            start = graph.id_of(start_title)
+        if start is None:
+            return None
+        while True:
+            target = graph.id_of(target_title) if target is None else target
+            if target is not None:
+                path, reached = search(start, target)
+                if path is not None:
+                    return [graph.title_of(node) for node in path]
+            else:
+                reached = self._forward_reach(start)
+            if self.page_fetcher is None or not self._fetch_frontier(reached):
+                return None
+
+    def _bidirectional_bfs(self, start, target):
+        """(path as node IDs or None, forward-reached nodes ordered by distance)"""
+        graph = self.graph
+        n = graph.num_nodes
+        dist = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        parent = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        arrays = [(graph.offsets, graph.targets), (graph.rev_offsets, graph.rev_sources)]
+        frontier = [np.array([start], dtype=np.int32), np.array([target], dtype=np.int32)]
+        depth = [0, 0]
+        dist[0][start] = dist[1][target] = 0
+        reached = [frontier[0]]
+        if start == target:
+            return [start], reached
+
+        while len(frontier[0]) and len(frontier[1]):
+            side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+            neighbours, parents = _gather(*arrays[side], frontier[side])
+            fresh = dist[side][neighbours] < 0
+            neighbours, first = np.unique(neighbours[fresh], return_index=True)
+            depth[side] += 1
+            dist[side][neighbours] = depth[side]
+            parent[side][neighbours] = parents[fresh][first]
+            frontier[side] = neighbours
+            if side == 0:
+                reached.append(neighbours)
+
+            meets = neighbours[dist[1 - side][neighbours] >= 0]
+            if len(meets):
+                # Everything in this level is equally far from its own side; take the meeting
+                # point closest to the other side
+                meet = int(meets[np.argmin(dist[1 - side][meets])])
+                return self._join(parent, meet), reached
+        return None, reached
+
+    @staticmethod
+    def _join(parent, meet):
+        path = [meet]
+        while parent[0][path[0]] >= 0:
+            path.insert(0, int(parent[0][path[0]]))
+        while parent[1][path[-1]] >= 0:
+            path.append(int(parent[1][path[-1]]))
+        return path
+
+    def _forward_reach(self, start):
+        """Nodes reachable from start, level by level, when the target is not in the graph yet"""
+        seen = np.zeros(self.graph.num_nodes, dtype=bool)
+        frontier = np.array([start], dtype=np.int32)
+        seen[start] = True
+        reached = [frontier]
+        while len(frontier):
+            neighbours, _ = _gather(self.graph.offsets, self.graph.targets, frontier)
+            frontier = np.unique(neighbours[~seen[neighbours]])
+            seen[frontier] = True
+            reached.append(frontier)
+        return reached
+
+    def _embedding(self, title):
+        vector = self._embeddings.get(title)
+        if vector is None:
+            vector = np.asarray(self.embedder.get_embedding(title), dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            vector = self._embeddings[title] = vector / norm if norm else vector
+        return vector
+
+    def _astar(self, start, target, weight):
+        graph = self.graph
+        goal = self._embedding(graph.title_of(target))
+
+        def h(node):
+            if node == target:
+                return 0.0
+            return max(0.0, (1.0 - float(self._embedding(graph.title_of(node)) @ goal)) / 2)
+
+        best = {start: 0}
+        parent = {start: None}
+        heap = [(weight * h(start), 0, start)]
+        while heap:
+            _, g, node = heapq.heappop(heap)
+            if node == target:
+                path = []
+                while node is not None:
+                    path.insert(0, node)
+                    node = parent[node]
+                return path, [np.fromiter(best, dtype=np.int32)]
+            if g > best[node]:
+                continue  # stale entry
+            for neighbour in graph.successors(node).tolist():
+                if g + 1 < best.get(neighbour, math.inf):
+                    best[neighbour] = g + 1
+                    parent[neighbour] = node
+                    heapq.heappush(heap, (g + 1 + weight * h(neighbour), g + 1, neighbour))
+        # Closest-first order so the fetch fallback grows the search where it stopped
+        return None, [np.array(sorted(best, key=best.get), dtype=np.int32)]
+
+    def _fetch_frontier(self, reached) -> bool:
+        """Fetches the nearest reached pages that were never crawled; False if there are none"""
+        graph = self.graph
+        batch = []
+        for level in reached:
+            for node in level.tolist():
+                if not graph.is_crawled(node):
+                    batch.append(graph.title_of(node))
+                    if len(batch) >= self.fetch_batch:
+                        break
+            if len(batch) >= self.fetch_batch:
+                break
+        return self._fetch_pages(batch)
+
+    def _fetch_pages(self, titles) -> bool:
+        """Adds the links of freshly fetched pages to the graph. Unreachable pages are added with no links."""
+        titles = titles[:max(0, self.max_fetches - self.pages_fetched)]
+        if not titles:
+            return False
+        pages = []
+        for title in titles:
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait_if_needed()
+            content = self.page_fetcher.fetch(f"{self.base_url}/wiki/{quote(title.replace(' ', '_'))}")
+            self.pages_fetched += 1
+            pages.append((title, {"links": self.link_extractor.extract_links(content) if content else []}))
+        self.graph.add_pages(pages, self.base_url)
+        self.graph.compact()
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find a shortest click path between two articles")
+    parser.add_argument("start")
+    parser.add_argument("target")
+    parser.add_argument("--data-dir", default="crawled_data", help="crawl output to build the graph from")
+    parser.add_argument("--graph", help="saved LinkGraph directory, used instead of --data-dir")
+    parser.add_argument("--fetch", action="store_true", help="fetch uncrawled pages when the search runs out")
+    parser.add_argument("--astar", action="store_true", help="use embedding-guided A* search")
+    args = parser.parse_args()
+
+    if args.graph:
+        graph = LinkGraph.load(args.graph)
+    else:
+        store = open_crawl_dir(args.data_dir)
+        graph = LinkGraph.build(store.iter_pages())
+        store.close()
+
+    fetcher = limiter = embedder = None
+    if args.fetch:
+        from src.page_fetcher import PageFetcher
+        from src.rate_limiter import RateLimiter
+        limiter = RateLimiter(1)
+        fetcher = PageFetcher(rate_limiter=limiter)
+    if args.astar:
+        from src.semantic_embedder import SemanticEmbedder
+        embedder = SemanticEmbedder()
+
+    solver = PathSolver(graph, page_fetcher=fetcher, rate_limiter=limiter, embedder=embedder)
+    path = solver.astar_path(args.start, args.target) if args.astar else solver.shortest_path(args.start, args.target)
+    if path:
+        print(f"{len(path) - 1} clicks: {' -> '.join(path)}")
+    else:
+        print(f"No path found from {args.start} to {args.target}")
+    if solver.pages_fetched:
+        print(f"Fetched {solver.pages_fetched} pages outside the crawl")
@@ -0,0 +1,260 @@
+# pipeline_crawler.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue, Empty
+
+from src.link_extractor import LinkExtractor
+from src.page_classifier import PageClassifier
+from src.parsed_page import ParsedPage
+from src.wiki_config import PIPELINE_QUEUE_SIZE
+from src.wiki_crawler import LOG_LEVELS, WikiCrawler
+from src.wiki_parser import WikiParser
+
+# Per-process parser state, created once by the pool initializer
+_worker_link_extractor = None
+_worker_wiki_parser = None
+_worker_page_classifier = None
+_worker_store_article_fields = False
+
+
+def _init_parser_worker(base_url, store_article_fields=False, pids=None):
+    global _worker_link_extractor, _worker_wiki_parser, _worker_page_classifier, _worker_store_article_fields
+    _worker_link_extractor = LinkExtractor(base_url=base_url)
+    _worker_wiki_parser = WikiParser(link_extractor=_worker_link_extractor)
+    _worker_page_classifier = PageClassifier()
+    _worker_store_article_fields = store_article_fields
+    if pids is not None:
+        pids.put(os.getpid())
+
+
+def parser_pool(num_parsers: int, base_url: str, store_article_fields: bool = False, pids=None) -> ProcessPoolExecutor:
+    """
+    Process pool for parse_page. Workers are spawned, never forked: the pool starts them
+    while fetch, writer and store threads are running, and a forked child inherits whatever
+    locks those threads hold at that instant, held forever. With pids (a spawn-context queue)
+    every worker puts its PID there before it takes a task, so a caller can kill a stuck one.
+    """
+    return ProcessPoolExecutor(max_workers=num_parsers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_parser_worker, initargs=(base_url, store_article_fields, pids))
+
+
+def parse_page(html_content: bytes, url: str) -> dict:
+    """
+    Runs in a parser process. Returns only the compact result the writer needs,
+    so the raw HTML and the soup never travel back to the parent process.
+    """
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    page = ParsedPage(html_content, url)
+    page_title = _worker_link_extractor.get_page_title(url)
+    links = _worker_link_extractor.extract_links(page)
+    article = None
+    if _worker_store_article_fields:
+        article = _worker_wiki_parser.parse_articles(page, url) or {}
+        article = {
+            "infobox": article.get("infobox", {}),
+            "categories": article.get("categories", []),
+            "lead_text": article.get("lead_text", ""),
+        }
+    parsed = time.perf_counter()
+    category = _worker_page_classifier.classify(page, page_title)
+    return {
+        "title": page_title,
+        "links": links,
+        "category": category,
+        "article": article,
+        "cpu_seconds": time.process_time() - start_cpu,
+        # Stage times are measured here; the parent process records them in its metrics
+        "parse_seconds": parsed - start,
+        "classify_seconds": time.perf_counter() - parsed,
+    }
+
+
+class PipelinedWikiCrawler(WikiCrawler):
+    """
+    Crawl engine with separate stages, so parsing is not bound by the GIL of the fetch threads:
+
+        fetch threads -> raw queue -> process pool (parse) -> write queue -> writer thread
+
+    Every queue is bounded. A slow stage fills its input queue, and the stage before it
+    blocks on put(), so backpressure reaches the fetchers.
+    """
+
+    def __init__(self, start_url, num_threads=3, requests_per_second=1, num_parsers=None,
+                 queue_size=PIPELINE_QUEUE_SIZE, **kwargs):
+        super().__init__(start_url, num_threads=num_threads, requests_per_second=requests_per_second, **kwargs)
+        self.num_parsers = num_parsers or os.cpu_count() or 1
+        self.raw_queue = Queue(maxsize=queue_size)
+        # Holds in-flight parse futures; two per parser keeps every process busy
+        self.write_queue = Queue(maxsize=2 * self.num_parsers)
+
+        # URLs queued or in any stage; the crawl is complete when this reaches zero
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self.parse_cpu_seconds = 0.0
+        self.metrics.gauge("raw_queue_depth", "Fetched pages waiting for a parser process",
+                           fn=self.raw_queue.qsize)
+        self.metrics.gauge("parse_queue_depth", "Pages being parsed or waiting for the writer",
+                           fn=self.write_queue.qsize)
+
+    def _enqueue(self, url, depth):
+        with self._pending_cond:
+            self._pending += 1
+        self.crawl_queue.put((url, depth))
+
+    def _enqueue_many(self, items):
+        with self._pending_cond:
+            self._pending += len(items)
+        self.crawl_queue.put_many(items)
+
+    def _finish_item(self):
+        with self._pending_cond:
+            self._pending -= 1
+            if self._pending == 0:
+                self._pending_cond.notify_all()
+
+    def stop(self):
+        super().stop()
+        with self._pending_cond:
+            self._pending_cond.notify_all()
+
+    def _fetch_worker(self):
+        """Fetch stage: hands raw bytes to the parse stage, never parses itself"""
+        while not self._stop.is_set():
+            try:
+                url, depth = self.crawl_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            handed_off = False
+            try:
+                handed_off = self._fetch_stage(url, depth)
+            except Exception as e:
+                print(f"[Fetch-{threading.get_ident()}] Error processing {url}: {e}")
+                with self.stats_lock:
+                    self.pages_failed += 1
+            finally:
+                if not handed_off:
+                    self._finish_item()
+
+    def _fetch_stage(self, url, depth):
+        """Returns True if the page moved on to the parse stage"""
+        if depth >= self.max_depth:
+            return False
+
+        if self.log_level <= LOG_LEVELS["debug"]:
+            print(f"[Fetch-{threading.get_ident()}] Crawling: {url} (Depth: {depth})")
+
+        page_title = self.link_extractor.get_page_title(url)
+        stored_page = self._load_stored_page(page_title)
+        if self._stored_before_resume(stored_page):
+            self._enqueue_links(*self._handle_stored_before_resume(stored_page, depth), parent_url=url)
+            return False
+        self._wait_for_rate_limit()
+        result = self._fetch_page(url, stored_page)
+        if result.not_modified:
+            self._enqueue_links(*self._handle_not_modified(stored_page, depth), parent_url=url)
+            return False
+        if not result.content:
+            with self.stats_lock:
+                self.pages_failed += 1
+            return False
+
+        self._archive_response(url, result.content, result.etag, result.last_modified)
+        # Blocks while the parse stage is saturated
+        self.raw_queue.put((url, depth, result.content, result.etag, result.last_modified))
+        return True
+
+    def _parse_dispatcher(self, executor):
+        """Parse stage: submits raw pages to the process pool in arrival order"""
+        while True:
+            item = self.raw_queue.get()
+            if item is None:
+                self.write_queue.put(None)
+                return
+            url, depth, html_content, etag, last_modified = item
+            future = executor.submit(parse_page, html_content, url)
+            # Blocks while the writer is behind, which in turn fills raw_queue
+            self.write_queue.put((url, depth, future, etag, last_modified))
+
+    def _writer(self):
+        """Write stage: persists parse results and expands the frontier"""
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                return
+            url, depth, future, etag, last_modified = item
+            try:
+                parsed = future.result()
+                self.metrics.stage["parse"].observe(parsed["parse_seconds"])
+                self.metrics.stage["classify"].observe(parsed["classify_seconds"])
+                self._store_page(url, parsed["title"], parsed["links"], parsed["category"], parsed["article"],
+                                 etag, last_modified)
+                with self.stats_lock:
+                    self.parse_cpu_seconds += parsed["cpu_seconds"]
+                self._enqueue_links(parsed["links"], depth, parent_url=url)
+            except Exception as e:
+                print(f"[Writer] Error processing {url}: {e}")
+                with self.stats_lock:
+                    self.pages_failed += 1
+            finally:
+                self._finish_item()
+
+    def _cores_busy(self, elapsed):
+        """Average number of cores kept busy by the parser processes"""
+        return self.parse_cpu_seconds / elapsed if elapsed > 0 else 0.0
+
+    def start_crawl(self):
+        """Start the pipelined crawl"""
+        start_time = time.time()
+        print(f"Starting pipelined crawl with {self.num_threads} fetch threads "
+              f"and {self.num_parsers} parser processes...")
+        self._print_rate_limit()
+
+        executor = parser_pool(self.num_parsers, self.link_extractor.base_url, self.store_article_fields)
+        dispatcher = threading.Thread(target=self._parse_dispatcher, args=(executor,))
+        writer = threading.Thread(target=self._writer)
+        fetchers = [threading.Thread(target=self._fetch_worker) for _ in range(self.num_threads)]
+
+        self._enqueue_start()
+        self._start_metrics()
+        for thread in [dispatcher, writer, *fetchers]:
+            thread.start()
+
+        interrupted = False
+        with self._pending_cond:
+            while self._pending > 0 and not self._stop.is_set():
+                try:
+                    if not self._pending_cond.wait(timeout=10):
+                        self._print_progress(start_time)
+                except KeyboardInterrupt:
+                    print("\nInterrupted: finishing the pages in flight, then writing a checkpoint...")
+                    interrupted = True
+                    self._stop.set()
+
+        # Drain: fetchers stop polling, then the sentinel flows through parse and write stages
+        self._stop.set()
+        for fetcher in fetchers:
+            fetcher.join()
+        self.raw_queue.put(None)
+        dispatcher.join()
+        writer.join()
+        executor.shutdown()
+        self.data_store.close()
+        self._close_checkpoint()
+        self._stop_metrics()
+        if interrupted:
+            raise KeyboardInterrupt
+
+        elapsed = time.time() - start_time
+        self._print_final_stats(elapsed)
+        print(f"Parser processes: {self.num_parsers}, cores busy parsing: {self._cores_busy(elapsed):.2f}\n")
+
+    def _print_progress(self, start_time, *engine_lines):
+        elapsed = time.time() - start_time
+        super()._print_progress(start_time, f"Queue sizes: raw={self.raw_queue.qsize()} "
+                                            f"parsing={self.write_queue.qsize()}",
+                                f"Cores busy parsing: {self._cores_busy(elapsed):.2f} of {self.num_parsers}",
+                                *engine_lines)
@@ -0,0 +1,210 @@
+# race_crawler.py
+import itertools
+import re
+import threading
+import time
+from queue import PriorityQueue, Empty
+from urllib.parse import quote
+
+import numpy as np
+
+from src.category_resolver import CategoryResolver
+from src.wiki_config import RACE_MAX_FETCHES
+from src.wiki_crawler import WikiCrawler
+
+_TOKEN_REGEX = re.compile(r"[a-z]{3,}")
+
+
+def _tokens(title: str) -> set[str]:
+    return set(_TOKEN_REGEX.findall(title.lower()))
+
+
+def _overlap(a: set, b: set) -> float:
+    """Jaccard overlap of two sets, 0.0 when either is empty"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class RaceCrawler(WikiCrawler):
+    """
+    Goal-directed crawl for one game round: from the start page to target_title.
+
+    The frontier is a priority queue. Each link is scored once, when its page first sees it:
+        token_weight     * title-token overlap with the target
+      + embedding_weight * cosine similarity of title embeddings (only with an embedder)
+      + category_weight  * overlap of the linking page's categories with the target's,
+                           both widened through the CategoryResolver hierarchy
+    Ties go to the shallower link, then to the earlier one. With every weight at zero
+    the order is plain BFS, which is what the plain crawl does.
+
+    The race ends as soon as a fetched page links to the target. The target itself is
+    never fetched, except once up front to learn its categories when category_weight is set.
+    Every fetch counts against max_fetches.
+    """
+
+    def __init__(self, start_url, target_title, num_threads=3, requests_per_second=1, embedder=None,
+                 category_resolver=None, token_weight=1.0, embedding_weight=1.0, category_weight=0.5,
+                 max_fetches=RACE_MAX_FETCHES, **kwargs):
+        kwargs.setdefault("checkpoint_interval", 0)  # a race is short and is never resumed
+        super().__init__(start_url, num_threads=num_threads, requests_per_second=requests_per_second, **kwargs)
+        self.target_title = target_title.replace(" ", "_")
+        self.embedder = embedder
+        self.category_resolver = category_resolver or CategoryResolver()
+        self.token_weight = token_weight
+        self.embedding_weight = embedding_weight if embedder is not None else 0.0
+        self.category_weight = category_weight
+        self.max_fetches = max_fetches
+
+        self.crawl_queue = PriorityQueue()
+        self._sequence = itertools.count()  # FIFO among equal priorities
+        self._target_tokens = _tokens(self.target_title)
+        self._target_categories = set()
+        self._embeddings = {}  # title -> unit vector
+        self._page_categories = {}  # url -> resolved categories, for scoring that page's links
+        self.parents = {}  # url -> url of the page it was found on
+
+        # Items queued or being processed; the race is lost when this reaches zero
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self._done = threading.Event()
+        self.fetches = 0
+        self.path = None
+
+    def _resolve(self, categories) -> set[str]:
+        return set(self.category_resolver.resolve_categories_and_hierarchy(categories))
+
+    def _embedding(self, title):
+        vector = self._embeddings.get(title)
+        if vector is None:
+            vector = np.asarray(self.embedder.get_embedding(title.replace("_", " ")), dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            vector = self._embeddings[title] = vector / norm if norm else vector
+        return vector
+
+    def score(self, title: str, page_categories: set = frozenset()) -> float:
+        """Relevance of a link titled `title`, found on a page with `page_categories`, to the target"""
+        score = 0.0
+        if self.token_weight:
+            score += self.token_weight * _overlap(_tokens(title), self._target_tokens)
+        if self.embedding_weight:
+            similarity = float(self._embedding(title) @ self._embedding(self.target_title))
+            score += self.embedding_weight * max(0.0, similarity)
+        if self.category_weight:
+            score += self.category_weight * _overlap(page_categories, self._target_categories)
+        return score
+
+    def _enqueue(self, url, depth, score=0.0):
+        with self._pending_cond:
+            self._pending += 1
+        self.crawl_queue.put((-score, depth, next(self._sequence), url))
+
+    def _finish_item(self):
+        with self._pending_cond:
+            self._pending -= 1
+            if self._pending == 0:
+                self._done.set()
+
+    def _needs_article(self):
+        return bool(self.category_weight) or super()._needs_article()
+
+    def _store_page(self, url, page_title, extracted_links, page_category, article, etag=None, last_modified=None):
+        if article is not None:
+            self._page_categories[url] = self._resolve(article.get("categories", []))
+        super()._store_page(url, page_title, extracted_links, page_category, article, etag, last_modified)
+
+    def _handle_not_modified(self, stored_page, current_depth):
+        self._page_categories[stored_page.get("url")] = self._resolve(stored_page.get("categories", []))
+        return super()._handle_not_modified(stored_page, current_depth)
+
+    def _take_fetch(self) -> bool:
+        with self.stats_lock:
+            if self.fetches >= self.max_fetches:
+                return False
+            self.fetches += 1
+            return True
+
+    def _enqueue_links(self, extracted_links, current_depth, parent_url=None):
+        """Every unseen link is queued with its score; there is no per-page cap in a race"""
+        title_of = self.link_extractor.get_page_title
+        for link in extracted_links:
+            if title_of(link) == self.target_title:
+                self._finish_race(parent_url)
+                return
+
+        page_categories = self._page_categories.get(parent_url, set())
+        for link in self.visited_urls.claim_batch(self.visited_urls.filter_unseen(extracted_links)):
+            self.parents[link] = parent_url
+            self._enqueue(link, current_depth + 1, self.score(title_of(link), page_categories))
+
+    def _finish_race(self, last_url):
+        with self.stats_lock:
+            if self.path is not None:
+                return
+            path = [self.target_title]
+            url = last_url
+            while url is not None:
+                path.insert(0, self.link_extractor.get_page_title(url))
+                url = self.parents.get(url)
+            self.path = path
+        self._done.set()
+
+    def _race_worker(self):
+        while not self._done.is_set():
+            try:
+                _, depth, _, url = self.crawl_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            try:
+                if self._done.is_set() or not self._take_fetch():
+                    self._done.set()
+                    continue
+                result = self._process_page(url, depth)
+                if result:
+                    self._enqueue_links(result[0], depth, parent_url=url)
+            finally:
+                self._finish_item()
+
+    def _learn_target(self):
+        """One fetch of the target page, for its categories"""
+        if not self.category_weight or not self._take_fetch():
+            return
+        target_url = f"{self.link_extractor.base_url}/wiki/{quote(self.target_title)}"
+        self.rate_limiter.wait_if_needed()
+        content = self.page_fetcher.fetch(target_url)
+        if content:
+            article = self.wiki_parser.parse_articles(content, target_url) or {}
+            self._target_categories = self._resolve(article.get("categories", []))
+
+    def race(self) -> list[str] | None:
+        """Runs the race; returns the click path as titles, or None if the budget ran out"""
+        if self.link_extractor.get_page_title(self.start_url) == self.target_title:
+            self.path = [self.target_title]
+            return self.path
+        self._learn_target()
+        self.visited_urls.add_if_new(self.start_url)
+        self._enqueue(self.start_url, 0)
+
+        workers = [threading.Thread(target=self._race_worker) for _ in range(self.num_threads)]
+        self._start_metrics()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.data_store.close()
+        self._close_checkpoint()
+        self._stop_metrics()
+        return self.path
+
+    def start_crawl(self):
+        """Race from the start page to the target"""
+        start_time = time.time()
+        print(f"Racing to {self.target_title} with {self.num_threads} threads (budget: {self.max_fetches} fetches)...")
+        self._print_rate_limit()
+        path = self.race()
+        self._print_final_stats(time.time() - start_time)
+        if path:
+            print(f"Reached {self.target_title} in {len(path) - 1} clicks after {self.fetches} fetches: "
+                  f"{' -> '.join(path)}\n")
+        else:
+            print(f"Did not reach {self.target_title} within {self.fetches} fetches\n")
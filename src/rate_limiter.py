@@ -0,0 +1,146 @@
+# rate_limiter.py
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from src.wiki_config import RATE_LIMIT_BURST
+
+ARTICLE_ENDPOINT = "article"  # article HTML under WIKIPEDIA_BASE_URL
+API_ENDPOINT = "api"  # REST API calls such as WIKIPEDIA_API_RACC
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to `burst` tokens, refilled at `rate` tokens/second.
+
+    reserve() takes a token and returns how long the caller must wait for it. The
+    bucket may go into debt, so concurrent callers get consecutive slots 1/rate apart.
+    The lock is held only for this arithmetic; callers sleep outside it.
+    A rate of None means unlimited, though server back-off (throttle) still applies.
+    """
+
+    def __init__(self, rate: float | None, burst: int = RATE_LIMIT_BURST, clock=time.monotonic):
+        self.target_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until - now)
+            if not self.rate:
+                return delay
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def throttle(self, retry_after: float | None = None) -> bool:
+        """
+        Server pushed back (429/503). With Retry-After, nobody gets a slot before it expires;
+        without it, the rate is halved. Either way the burst allowance is dropped.
+        Returns False when neither applies (no Retry-After and no rate to halve), so the
+        bucket will not pace a retry and the caller must back off by itself.
+        """
+        with self._lock:
+            now = self._clock()
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif self.rate:
+                self.rate = max(self.target_rate / 16, self.rate / 2)
+            else:
+                return False
+            self._tokens = min(self._tokens, 0.0)
+            return True
+
+    def record_success(self):
+        """Additive recovery towards the configured rate after a throttle"""
+        with self._lock:
+            if self.rate and self.rate < self.target_rate:
+                self.rate = min(self.target_rate, self.rate + self.target_rate / 20)
+
+
+class _EndpointRateLimiter:
+    """One TokenBucket per endpoint class, so API lookups don't eat the article budget"""
+
+    def __init__(self, requests_per_second: float | None = 1.0, burst: int = RATE_LIMIT_BURST,
+                 endpoint_rates: dict = None, clock=time.monotonic):
+        rates = {ARTICLE_ENDPOINT: requests_per_second, API_ENDPOINT: requests_per_second}
+        rates.update(endpoint_rates or {})
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._clock = clock
+        self._buckets = {endpoint: TokenBucket(rate, burst, clock) for endpoint, rate in rates.items()}
+        self._buckets_lock = threading.Lock()
+
+    def bucket(self, endpoint: str = ARTICLE_ENDPOINT) -> TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._buckets.setdefault(
+                    endpoint, TokenBucket(self.requests_per_second, self.burst, self._clock))
+        return bucket
+
+    def endpoint_rates(self) -> dict:
+        """Configured rate per endpoint class"""
+        return {endpoint: bucket.target_rate for endpoint, bucket in self._buckets.items()}
+
+    def reserve(self, endpoint: str = ARTICLE_ENDPOINT) -> float:
+        return self.bucket(endpoint).reserve()
+
+    def throttle(self, endpoint: str = ARTICLE_ENDPOINT, retry_after: float | None = None) -> bool:
+        return self.bucket(endpoint).throttle(retry_after)
+
+    def record_success(self, endpoint: str = ARTICLE_ENDPOINT):
+        self.bucket(endpoint).record_success()
+
+
+class RateLimiter(_EndpointRateLimiter):
+    """Thread-safe rate limiter to respect Wikipedia's servers"""
+
+    def __init__(self, requests_per_second: float | None = 1.0, burst: int = RATE_LIMIT_BURST,
+                 endpoint_rates: dict = None, clock=time.monotonic, sleep=time.sleep):
+        super().__init__(requests_per_second, burst, endpoint_rates, clock)
+        self._sleep = sleep
+
+    def wait_if_needed(self, endpoint: str = ARTICLE_ENDPOINT):
+        """Wait if necessary to maintain rate limit. Never sleeps while holding a lock."""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            self._sleep(delay)
+
+
+class AsyncRateLimiter(_EndpointRateLimiter):
+    """asyncio variant of RateLimiter: same buckets, waits with asyncio.sleep"""
+
+    def __init__(self, requests_per_second: float | None = 1.0, burst: int = RATE_LIMIT_BURST,
+                 endpoint_rates: dict = None, clock=time.monotonic, sleep=asyncio.sleep):
+        super().__init__(requests_per_second, burst, endpoint_rates, clock)
+        self._sleep = sleep
+
+    async def wait_if_needed(self, endpoint: str = ARTICLE_ENDPOINT):
+        """Wait if necessary to maintain rate limit"""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            await self._sleep(delay)
@@ -0,0 +1,206 @@
+# response_archive.py
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from src.wiki_config import RESPONSE_ARCHIVE_DIR, RESPONSE_ARCHIVE_MAX_BYTES, RESPONSE_ARCHIVE_SEGMENT_BYTES, \
+    RESPONSE_ARCHIVE_COMPRESSION
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+_SEGMENT_NAME = "segment-{:08d}.bin"
+
+
+def compress(content: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(content)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This archive holds zstd responses; install the 'zstandard' package to read them")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_blob(path: str, segment: int, offset: int, length: int, codec: str) -> bytes:
+    """One archived body, read straight from its segment file (usable from other processes)"""
+    with open(os.path.join(path, _SEGMENT_NAME.format(segment)), "rb") as f:
+        f.seek(offset)
+        return decompress(f.read(length), codec)
+
+
+class ResponseArchive:
+    """
+    Local archive of fetched page bodies, so pages can be re-parsed without re-crawling.
+
+    Bodies are content-addressed: each distinct body is stored once, compressed (zstd when
+    the zstandard package is installed, gzip otherwise), appended to the current segment
+    file. An SQLite index maps (url, revision) to a body; the revision is the response's
+    ETag, else its Last-Modified, else the body hash. Total segment size is bounded by
+    max_bytes: past it, whole segments are evicted least recently used first (a get(), or a
+    put() of a body they already hold, counts as a use), along with the index entries that pointed into them.
+    """
+
+    def __init__(self, path: str = RESPONSE_ARCHIVE_DIR, max_bytes: int = RESPONSE_ARCHIVE_MAX_BYTES,
+                 segment_bytes: int = RESPONSE_ARCHIVE_SEGMENT_BYTES, compression: str = RESPONSE_ARCHIVE_COMPRESSION):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.codec = "zstd" if compression == "zstd" and zstandard is not None else "gzip"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(path, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS segments (id INTEGER PRIMARY KEY, bytes INTEGER NOT NULL,
+                                                 last_used REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS blobs (hash BLOB PRIMARY KEY, segment INTEGER NOT NULL, offset INTEGER NOT NULL,
+                                              length INTEGER NOT NULL, size INTEGER NOT NULL, codec TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS blobs_by_segment ON blobs (segment);
+            CREATE TABLE IF NOT EXISTS responses (url TEXT NOT NULL, revision TEXT NOT NULL, hash BLOB NOT NULL,
+                                                  etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL,
+                                                  PRIMARY KEY (url, revision));
+            CREATE INDEX IF NOT EXISTS responses_by_hash ON responses (hash);
+        """)
+        row = self._conn.execute("SELECT id, bytes FROM segments ORDER BY id DESC LIMIT 1").fetchone()
+        self._segment, self._segment_size = row if row else (0, self.segment_bytes)  # roll over on first put
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM segments").fetchone()[0]
+        self._writer = None
+        self.bytes_in = 0  # uncompressed bytes put, for the compression ratio
+        self.bytes_stored = 0  # compressed bytes written; duplicates add nothing
+
+    def put(self, url: str, content: bytes, etag: str = None, last_modified: str = None):
+        """Archives one response body; a body already archived under any URL is not written again"""
+        if not content:
+            return
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        revision = etag or last_modified or digest.hex()
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        data = None if known else compress(content, self.codec)  # outside the lock; zlib/zstd release the GIL
+
+        with self._lock:
+            self.bytes_in += len(content)
+            if self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone():
+                # A duplicate body is a use of the segment holding it, like a get()
+                self._conn.execute("UPDATE segments SET last_used = ? WHERE id = (SELECT segment FROM blobs "
+                                   "WHERE hash = ?)", (time.time(), digest))
+            else:
+                if data is None:  # evicted since it was looked up
+                    data = compress(content, self.codec)
+                segment, offset = self._append(data)
+                self._conn.execute("INSERT INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                                   (digest, segment, offset, len(data), len(content), self.codec))
+                self.bytes_stored += len(data)
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                               (url, revision, digest, etag, last_modified, time.time()))
+            self._conn.commit()
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _append(self, data: bytes) -> tuple[int, int]:
+        """Appends to the current segment, starting a new one when it is full; returns (segment, offset)"""
+        if self._segment_size + len(data) > self.segment_bytes and self._segment_size > 0:
+            if self._writer is not None:
+                self._writer.close()
+            self._segment += 1
+            self._segment_size = 0
+            self._conn.execute("INSERT OR REPLACE INTO segments VALUES (?, 0, ?)", (self._segment, time.time()))
+            self._writer = None
+        if self._writer is None:
+            self._writer = open(os.path.join(self.path, _SEGMENT_NAME.format(self._segment)), "ab")
+            self._segment_size = self._writer.tell()
+        offset = self._segment_size
+        self._writer.write(data)
+        self._writer.flush()  # before the index row that points at it is committed
+        self._segment_size += len(data)
+        self._total_bytes += len(data)
+        self._conn.execute("UPDATE segments SET bytes = ?, last_used = ? WHERE id = ?",
+                           (self._segment_size, time.time(), self._segment))
+        return self._segment, offset
+
+    def _evict(self):
+        """Drops least recently used segments until the archive fits; the segment being written stays"""
+        victims = self._conn.execute("SELECT id, bytes FROM segments WHERE id != ? ORDER BY last_used",
+                                     (self._segment,)).fetchall()
+        for segment, size in victims:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE hash IN (SELECT hash FROM blobs WHERE segment = ?)",
+                               (segment,))
+            self._conn.execute("DELETE FROM blobs WHERE segment = ?", (segment,))
+            self._conn.execute("DELETE FROM segments WHERE id = ?", (segment,))
+            self._conn.commit()
+            try:
+                os.remove(os.path.join(self.path, _SEGMENT_NAME.format(segment)))
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+
+    def _locate(self, url: str, revision: str = None):
+        query = ("SELECT b.segment, b.offset, b.length, b.codec FROM responses r JOIN blobs b ON b.hash = r.hash "
+                 "WHERE r.url = ?")
+        if revision is None:
+            return self._conn.execute(query + " ORDER BY r.fetched_at DESC LIMIT 1", (url,)).fetchone()
+        return self._conn.execute(query + " AND r.revision = ?", (url, revision)).fetchone()
+
+    def get(self, url: str, revision: str = None) -> bytes | None:
+        """The archived body of url at revision, or of its latest archived revision"""
+        with self._lock:
+            location = self._locate(url, revision)
+            if location is None:
+                return None
+            self._conn.execute("UPDATE segments SET last_used = ? WHERE id = ?", (time.time(), location[0]))
+            self._conn.commit()
+            if self._writer is not None:
+                self._writer.flush()
+        return read_blob(self.path, *location)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._locate(url) is not None
+
+    def __len__(self):
+        """Archived URLs"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT url) FROM responses").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def iter_latest(self):
+        """
+        (url, etag, last_modified, (segment, offset, length, codec)) for the latest archived
+        revision of every URL, in segment order so the segment files are read sequentially.
+        Pass the location to read_blob().
+        """
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+            rows = self._conn.execute("""
+                SELECT r.url, r.etag, r.last_modified, b.segment, b.offset, b.length, b.codec
+                FROM responses r JOIN blobs b ON b.hash = r.hash
+                WHERE r.fetched_at = (SELECT MAX(fetched_at) FROM responses latest WHERE latest.url = r.url)
+                ORDER BY b.segment, b.offset
+            """).fetchall()
+        for url, etag, last_modified, *location in rows:
+            yield url, etag, last_modified, tuple(location)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._conn.commit()
+            self._conn.close()
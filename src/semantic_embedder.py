@@ -1,39 +1,95 @@
 # semantic_embedder.py
-from transformers import AutoModel, AutoTokenizer
-import torch
 import numpy as np
+import os
+import threading
+
+from src import model_registry
+from src.embedding_cache import EmbeddingCache
+from src.wiki_config import EMBED_BATCH_SIZE, EMBED_MAX_BATCH_TOKENS, EMBED_NUM_THREADS
+
+_LAZY_ATTRIBUTES = ("tokenizer", "model", "device", "dimension", "cache")
+
+
+def _load_model(model_name: str):
+    """(tokenizer, model, device) for the registry; torch and transformers are imported here, not at module import"""
+    from transformers import AutoModel, AutoTokenizer
+    import torch
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model.to(device)
+    model.eval()
+    print(f"SemanticEmbedder using model: {model_name} on device: {device}")
+    return tokenizer, model, device
 
 
 class SemanticEmbedder:
     """
     Generates semantic embeddings for text using a pre-trained Sentence Transformer model.
+
+    The model is loaded on first use (or by warm_up()), not by the constructor, and comes
+    from the process-wide model registry, so embedders for the same model share it.
     """
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", cache_dir: str = None,
+                 batch_size: int = EMBED_BATCH_SIZE, num_threads: int = EMBED_NUM_THREADS):
         """
         Initializes the SemanticEmbedder with a specified pre-trained model.
         Args:
             model_name (str): The name of the Hugging Face Sentence Transformer model to use.
                               "all-MiniLM-L6-v2" is a good balance of size/performance.
+            cache_dir (str, optional): Directory of a persistent embedding cache, so texts
+                                       embedded by an earlier run are not run through the model again.
+            batch_size (int): Maximum texts per model call in embed_batch.
+            num_threads (int): CPU threads torch may use (process-wide); 0 leaves torch's default.
         """
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name)
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            self.model.to(self.device)
-            print(f"SemanticEmbedder using model: {model_name} on device: {self.device}")
-        except Exception as e:
-            print(f"Error loading SemanticEmbedder model '{model_name}': {e}")
-            print("Please ensure you have 'transformers' and 'torch' installed correctly and internet access.")
-            # Fallback to a dummy model or raise an error depending on desired behavior
-            self.tokenizer = None
-            self.model = None
-            self.device = "cpu"
-
-    def _mean_pooling(self, model_output: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                import torch
+                if self.num_threads:
+                    torch.set_num_threads(min(self.num_threads, os.cpu_count() or 1))
+                self.tokenizer, self.model, self.device = model_registry.get_model(
+                    "embedder", self.model_name, lambda: _load_model(self.model_name))
+            except Exception as e:
+                print(f"Error loading SemanticEmbedder model '{self.model_name}': {e}")
+                print("Please ensure you have 'transformers' and 'torch' installed correctly and internet access.")
+                # Fallback to a dummy model or raise an error depending on desired behavior
+                self.tokenizer = None
+                self.model = None
+                self.device = "cpu"
+            self.dimension = self.model.config.hidden_size if self.model else 384
+            self.cache = EmbeddingCache(self.cache_dir, self.dimension, self.model_name) if self.cache_dir else None
+            self._loaded = True
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: the model-backed ones are set on first access
+        if name in _LAZY_ATTRIBUTES:
+            self._ensure_loaded()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def warm_up(self):
+        """Loads the model and runs one batch through it, so the first real call is not slow"""
+        self.embed_batch(["warm up"])
+        return self
+
+    def _mean_pooling(self, model_output: "torch.Tensor", attention_mask: "torch.Tensor") -> "torch.Tensor":
         """
         Performs mean pooling on token embeddings to get a single vector for the sentence.
         """
+        import torch
         if self.model is None:  # Handle case where model failed to load
             return torch.zeros(1, 384)  # Return a dummy tensor, assuming MiniLM's size
 
@@ -54,27 +110,70 @@ class SemanticEmbedder:
             list[float]: A list of floats representing the dense semantic embedding.
                          Returns a zero vector if text is empty or model not loaded.
         """
-        if not text or self.model is None:
-            # Return a zero vector of the model's expected dimension (e.g., 384 for MiniLM)
-            return np.zeros(self.model.config.hidden_size if self.model else 384).tolist()
-
-            # Tokenize the text
-        encoded_input = self.tokenizer(
-            text,
-            padding=True,
-            truncation=True,
-            max_length=512,  # Max length for most transformer models
-            return_tensors='pt'
-        ).to(self.device)
-
-        # Compute embeddings
-        with torch.no_grad():  # Disable gradient calculation for inference
-            model_output = self.model(**encoded_input)
-
-        # Perform pooling (mean pooling in this case)
-        sentence_embedding = self._mean_pooling(model_output, encoded_input['attention_mask'])
-
-        # Normalize embeddings to unit length (important for cosine similarity)
-        sentence_embedding = torch.nn.functional.normalize(sentence_embedding, p=2, dim=1)
-
-        return sentence_embedding.cpu().numpy()[0].tolist()  # Convert to list for JSON serialization
\ No newline at end of file
+        return self.embed_batch([text])[0].tolist()
+
+    def embed_batch(self, texts, batch_size: int = None) -> np.ndarray:
+        """
+        Embeds many texts at once.
+
+        Args:
+            texts (Iterable[str]): The texts to embed.
+            batch_size (int, optional): Maximum texts per model call; defaults to self.batch_size.
+
+        Returns:
+            np.ndarray: float32 matrix with one unit-length row per text, in input order.
+                        Empty texts, or every text if the model is not loaded, get zero rows.
+        """
+        texts = list(texts)
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if self.model is None:
+            return result
+
+        rows = {}  # distinct text -> rows of result it fills
+        for row, text in enumerate(texts):
+            if text:
+                rows.setdefault(text, []).append(row)
+        pending = list(rows)
+
+        if self.cache is not None:
+            for text, vector in self.cache.get_many(pending).items():
+                result[rows[text]] = vector
+            pending = [text for text in pending if text not in self.cache]
+        if pending:
+            vectors = self._encode(pending, batch_size or self.batch_size)
+            for text, vector in zip(pending, vectors):
+                result[rows[text]] = vector
+            if self.cache is not None:
+                self.cache.put_many(pending, vectors)
+        return result
+
+    def _encode(self, texts: list[str], batch_size: int) -> np.ndarray:
+        """Runs the model over texts, batching texts of similar token length together"""
+        import torch
+        input_ids = self.tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+        vectors = np.empty((len(texts), self.dimension), dtype=np.float32)
+        with torch.inference_mode():
+            for batch in self._length_buckets(input_ids, batch_size):
+                features = self.tokenizer.pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt")
+                features = {name: tensor.to(self.device) for name, tensor in features.items()}
+                model_output = self.model(**features)
+                embeddings = self._mean_pooling(model_output, features["attention_mask"])
+                embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+                vectors[batch] = embeddings.cpu().numpy()
+        return vectors
+
+    @staticmethod
+    def _length_buckets(input_ids: list, batch_size: int):
+        """
+        Index batches in order of token length, so each batch pads to a similar length.
+        A batch also closes once it would exceed EMBED_MAX_BATCH_TOKENS padded tokens.
+        """
+        batch = []
+        for i in sorted(range(len(input_ids)), key=lambda i: len(input_ids[i])):
+            # Sorted ascending, so this text is the longest in the batch so far
+            if batch and (len(batch) >= batch_size or (len(batch) + 1) * len(input_ids[i]) > EMBED_MAX_BATCH_TOKENS):
+                yield batch
+                batch = []
+            batch.append(i)
+        if batch:
+            yield batch
@@ -1,30 +1,93 @@
 # topic_classifier.py
-from transformers import pipeline
-from functools import lru_cache
+from collections import OrderedDict
+import hashlib
+import threading
 import numpy as np  # For float conversion
 
+from src import model_registry
+from src.wiki_config import TOPIC_MODEL, TOPIC_MODEL_SMALL, TOPIC_BATCH_SIZE, TOPIC_CACHE_SIZE
+
+_LAZY_ATTRIBUTES = ("tokenizer", "model", "entailment_id", "contradiction_id", "classifier")
+
+
+def _load_model(model_name: str):
+    """(tokenizer, model, entailment id, contradiction id) for the registry; imports transformers here"""
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    label_ids = {label.lower(): i for label, i in model.config.label2id.items()}
+    entailment_id = next(i for label, i in label_ids.items() if label.startswith("entail"))
+    contradiction_id = next(i for label, i in label_ids.items() if label.startswith("contra"))
+    print(f"TopicClassifier using model: {model_name}")
+    return tokenizer, model, entailment_id, contradiction_id
+
 
 class TopicClassifier:
     """
     Performs zero-shot topic classification on text using a pre-trained NLI model.
+
+    Each (text, label) pair is scored as premise/hypothesis, as the transformers
+    zero-shot pipeline does with multi_label=True, but the hypotheses for a label set
+    are tokenized once and pairs from many texts share each model call. Scores are
+    cached per text hash and label set in a bounded LRU, so the cache holds neither
+    whole article texts nor the classifier itself.
+
+    The model is loaded on first use (or by warm_up()) from the process-wide model registry.
     """
 
-    def __init__(self, model_name: str = "facebook/bart-large-mnli"):
+    def __init__(self, model_name: str = TOPIC_MODEL, small: bool = False, batch_size: int = TOPIC_BATCH_SIZE,
+                 cache_size: int = TOPIC_CACHE_SIZE, hypothesis_template: str = "This example is {}."):
         """
         Initializes the TopicClassifier with a specified pre-trained model.
         Args:
             model_name (str): The name of the Hugging Face model for zero-shot classification.
                               "facebook/bart-large-mnli" is a common choice.
+            small (bool): Use TOPIC_MODEL_SMALL, a distilled MNLI model several times faster on CPU.
+            batch_size (int): Premise/hypothesis pairs per model call.
+            cache_size (int): Texts whose label scores are kept; 0 disables the cache.
+            hypothesis_template (str): Turns a label into the hypothesis sentence.
         """
-        try:
-            self.classifier = pipeline("zero-shot-classification", model=model_name)
-            print(f"TopicClassifier using model: {model_name}")
-        except Exception as e:
-            print(f"Error loading TopicClassifier model '{model_name}': {e}")
-            print("Please ensure you have 'transformers' and 'torch' installed correctly and internet access.")
-            self.classifier = None  # Set to None to indicate failure
-
-    @lru_cache(maxsize=1000)  # Cache to avoid re-running for same text/labels combinations
+        self.model_name = TOPIC_MODEL_SMALL if small else model_name
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.hypothesis_template = hypothesis_template
+        self._cache = OrderedDict()  # (text hash, labels) -> label scores
+        self._cache_lock = threading.Lock()
+        self._hypotheses = {}  # labels -> token IDs of each label's hypothesis
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self.tokenizer, self.model, self.entailment_id, self.contradiction_id = model_registry.get_model(
+                    "zero-shot", self.model_name, lambda: _load_model(self.model_name))
+                self.classifier = self.model
+            except Exception as e:
+                print(f"Error loading TopicClassifier model '{self.model_name}': {e}")
+                print("Please ensure you have 'transformers' and 'torch' installed correctly and internet access.")
+                self.tokenizer = self.model = self.entailment_id = self.contradiction_id = None
+                self.classifier = None  # Set to None to indicate failure
+            self._loaded = True
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: the model-backed ones are set on first access
+        if name in _LAZY_ATTRIBUTES:
+            self._ensure_loaded()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def warm_up(self):
+        """Loads the model and runs one batch through it, so the first real call is not slow"""
+        if self.classifier is not None:
+            self._score(["warm up"], ("warm up",))
+        return self
+
     def classify_zero_shot(self, text: str, candidate_labels: list[str], confidence_threshold: float = 0.6) -> list[
         dict]:
         """
@@ -38,19 +101,99 @@ class TopicClassifier:
         Returns:
             list[dict]: A list of dictionaries, each with 'label' and 'score' for classified topics.
         """
-        if not text or not candidate_labels or self.classifier is None:
-            return []
-
-        # Zero-shot classification handles multiple labels and scores them
-        try:
-            result = self.classifier(text, candidate_labels, multi_label=True)
-            # result example: {'sequence': '...', 'labels': ['music', 'art'], 'scores': [0.9, 0.1]}
-
-            classified_topics = []
-            for label, score in zip(result['labels'], result['scores']):
-                if score > confidence_threshold:
-                    classified_topics.append({"label": label, "score": float(score)})
-            return sorted(classified_topics, key=lambda x: x['score'], reverse=True)  # Sort by score
-        except Exception as e:
-            print(f"Error during zero-shot classification: {e}")
-            return []
\ No newline at end of file
+        return self.classify_batch([text], candidate_labels, confidence_threshold)[0]
+
+    def classify_batch(self, texts, candidate_labels: list[str], confidence_threshold: float = 0.6) -> list[list[dict]]:
+        """
+        classify_zero_shot for many texts against one label set, in shared model calls.
+
+        Returns:
+            list[list[dict]]: One classify_zero_shot result per text, in input order.
+        """
+        texts = list(texts)
+        labels = tuple(candidate_labels or ())
+        if not labels or self.classifier is None:
+            return [[] for _ in texts]
+
+        scores = [None] * len(texts)
+        misses = {}  # cache key -> (text, positions in texts)
+        for position, text in enumerate(texts):
+            if not text:
+                scores[position] = np.zeros(len(labels), dtype=np.float32)
+                continue
+            key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), labels)
+            cached = self._cache_get(key)
+            if cached is not None:
+                scores[position] = cached
+            else:
+                misses.setdefault(key, (text, []))[1].append(position)
+
+        if misses:
+            try:
+                computed = self._score([text for text, _ in misses.values()], labels)
+                cache = True
+            except Exception as e:
+                print(f"Error during zero-shot classification: {e}")
+                # Zeros for this call only: cached, they would hide the texts' real scores for good
+                computed = np.zeros((len(misses), len(labels)), dtype=np.float32)
+                cache = False
+            for (key, (_, positions)), row in zip(misses.items(), computed):
+                if cache:
+                    self._cache_put(key, row)
+                for position in positions:
+                    scores[position] = row
+
+        results = []
+        for row in scores:
+            classified_topics = [{"label": label, "score": float(score)}
+                                 for label, score in zip(labels, row) if score > confidence_threshold]
+            results.append(sorted(classified_topics, key=lambda x: x['score'], reverse=True))  # Sort by score
+        return results
+
+    def _hypothesis_ids(self, labels: tuple) -> list[list[int]]:
+        ids = self._hypotheses.get(labels)
+        if ids is None:
+            ids = [self.tokenizer(self.hypothesis_template.format(label), add_special_tokens=False)["input_ids"]
+                   for label in labels]
+            self._hypotheses[labels] = ids
+        return ids
+
+    def _score(self, texts: list[str], labels: tuple) -> np.ndarray:
+        """(len(texts), len(labels)) entailment probabilities, as the pipeline's multi_label mode"""
+        import torch
+        hypotheses = self._hypothesis_ids(labels)
+        room = self.tokenizer.model_max_length - max(len(h) for h in hypotheses) - 4  # special tokens
+        premises = self.tokenizer(texts, add_special_tokens=False, truncation=True, max_length=room)["input_ids"]
+
+        # Pairs of similar-length premises share batches, so little of each batch is padding
+        pairs = [(t, l) for t in sorted(range(len(texts)), key=lambda t: len(premises[t]))
+                 for l in range(len(labels))]
+        scores = np.zeros((len(texts), len(labels)), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(pairs), self.batch_size):
+                batch = pairs[start:start + self.batch_size]
+                input_ids = [self.tokenizer.build_inputs_with_special_tokens(premises[t], hypotheses[l])
+                             for t, l in batch]
+                features = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+                logits = self.model(**features).logits
+                pair_logits = logits[:, [self.contradiction_id, self.entailment_id]]
+                entailment = torch.softmax(pair_logits, dim=-1)[:, 1].numpy()
+                for (t, l), score in zip(batch, entailment):
+                    scores[t, l] = score
+        return scores
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            row = self._cache.get(key)
+            if row is not None:
+                self._cache.move_to_end(key)
+            return row
+
+    def _cache_put(self, key, row):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[key] = row
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
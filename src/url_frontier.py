@@ -0,0 +1,348 @@
+# url_frontier.py
+import hashlib
+import math
+import tempfile
+from array import array
+from collections import deque
+from queue import Queue
+
+from src.lock_stats import InstrumentedLock, summarize_locks
+from src.wiki_config import FRONTIER_MEMORY_ITEMS, VISITED_CAPACITY, VISITED_SHARDS
+
+
+def url_hash64(url: str) -> int:
+    """Stable 64-bit hash of a URL. 0 is reserved as the empty-slot marker, so it is remapped."""
+    value = int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+class CompactURLSet:
+    """
+    Seen-URL set that stores a 64-bit hash per URL in an array-backed open-addressing
+    table (linear probing): 8-byte slots at 35-70% load are 12-23 bytes per URL (17.8 at 1M
+    URLs, 23.8 at 3M in bench_url_frontier) instead of a full string in a set.
+    Two distinct URLs collide with probability ~n/2^64, negligible at crawl sizes.
+    URLs cannot be listed back out of it, only tested.
+    """
+
+    _MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        size = 1 << max(4, math.ceil(math.log2(capacity / self._MAX_LOAD)))
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def _find_slot(self, key: int) -> int:
+        """Index holding key, or the empty slot where it would go"""
+        slots, mask = self._slots, self._mask
+        index = key & mask
+        while True:
+            current = slots[index]
+            if current == key or current == 0:
+                return index
+            index = (index + 1) & mask
+
+    def add_hash(self, key: int) -> bool:
+        """Inserts a precomputed url_hash64; returns True if it was not present"""
+        index = self._find_slot(key)
+        if self._slots[index] == key:
+            return False
+        self._slots[index] = key
+        self._count += 1
+        if self._count > self._MAX_LOAD * len(self._slots):
+            self._grow()
+        return True
+
+    def add(self, url: str) -> bool:
+        return self.add_hash(url_hash64(url))
+
+    def contains_hash(self, key: int) -> bool:
+        return self._slots[self._find_slot(key)] == key
+
+    def __contains__(self, url: str) -> bool:
+        return self.contains_hash(url_hash64(url))
+
+    def _grow(self):
+        old_slots = self._slots
+        self._slots = array('Q', bytes(16 * len(old_slots)))
+        self._mask = len(self._slots) - 1
+        for key in old_slots:
+            if key:
+                self._slots[self._find_slot(key)] = key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def copy(self) -> 'CompactURLSet':
+        clone = CompactURLSet.__new__(CompactURLSet)
+        clone._slots = array('Q', self._slots)
+        clone._mask = self._mask
+        clone._count = self._count
+        return clone
+
+    def memory_bytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+
+class BloomFilter:
+    """
+    Probabilistic seen-URL set with a target false-positive rate. A false positive makes
+    the crawler skip an unseen URL, so pick the rate accordingly.
+
+    Scalable: the first slice is sized for `capacity` URLs. When it is full, a slice twice
+    as large with half the false-positive rate is added, and so on, so the overall rate
+    stays under error_rate however many URLs arrive (~1.4 bytes/URL at 1% while the first
+    slice lasts). Lookups test every slice; adds go to the newest one.
+    """
+
+    _GROWTH = 2  # each slice holds this many times the URLs of the one before
+    _TIGHTENING = 0.5  # and has this times its false-positive rate; the rates sum to error_rate
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self._slices = []  # [bits, num_bits, num_hashes, capacity, count]
+        self._count = 0
+        self._add_slice(max(1, capacity), error_rate * (1 - self._TIGHTENING))
+
+    def _add_slice(self, capacity: int, error_rate: float):
+        num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._slices.append([bytearray((num_bits + 7) // 8), num_bits, num_hashes, capacity, 0])
+
+    @staticmethod
+    def _hashes(url: str) -> tuple[int, int]:
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    @staticmethod
+    def _in_slice(bloom_slice, h1: int, h2: int) -> bool:
+        # Kirsch-Mitzenmacher double hashing: k positions from two hashes
+        bits, num_bits, num_hashes = bloom_slice[0], bloom_slice[1], bloom_slice[2]
+        for i in range(num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, url: str) -> bool:
+        """Returns True if the URL was (probably) not present before"""
+        h1, h2 = self._hashes(url)
+        if any(self._in_slice(bloom_slice, h1, h2) for bloom_slice in self._slices):
+            return False
+        bloom_slice = self._slices[-1]
+        bits, num_bits = bloom_slice[0], bloom_slice[1]
+        for i in range(bloom_slice[2]):
+            position = (h1 + i * h2) % num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+        bloom_slice[4] += 1
+        self._count += 1
+        if bloom_slice[4] >= bloom_slice[3]:
+            previous_rate = self.error_rate * (1 - self._TIGHTENING) * self._TIGHTENING ** (len(self._slices) - 1)
+            self._add_slice(bloom_slice[3] * self._GROWTH, previous_rate * self._TIGHTENING)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        h1, h2 = self._hashes(url)
+        return any(self._in_slice(bloom_slice, h1, h2) for bloom_slice in self._slices)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def slices(self) -> int:
+        return len(self._slices)
+
+    def copy(self) -> 'BloomFilter':
+        clone = BloomFilter.__new__(BloomFilter)
+        clone.error_rate = self.error_rate
+        clone._slices = [[bytearray(bits), *rest] for bits, *rest in self._slices]
+        clone._count = self._count
+        return clone
+
+    def memory_bytes(self) -> int:
+        return sum(len(bloom_slice[0]) for bloom_slice in self._slices)
+
+
+def make_visited_set(mode: str = "set", capacity: int = VISITED_CAPACITY):
+    """
+    Seen-URL structure for the crawler:
+    - "set":   exact Python set of URL strings (URLs can be listed back)
+    - "hash":  CompactURLSet of 64-bit hashes
+    - "bloom": BloomFilter at 1% false positives, its first slice sized for `capacity` URLs
+    """
+    if mode == "set":
+        return set()
+    if mode == "hash":
+        return CompactURLSet(capacity=min(capacity, 1 << 20))
+    if mode == "bloom":
+        return BloomFilter(capacity=capacity)
+    raise ValueError(f"Unknown visited set mode: {mode}")
+
+
+class ShardedVisitedSet:
+    """
+    Thread-safe seen-URL set split into independently locked shards.
+
+    claim_batch() dedups a whole page's links with one lock acquisition per shard
+    instead of one global lock per link. Check-and-insert happens under the shard
+    lock, so two workers can never both claim the same URL. Every shard lock is an
+    InstrumentedLock; lock_stats() reports how contended they were.
+    """
+
+    def __init__(self, mode: str = "set", shards: int = VISITED_SHARDS, capacity: int = VISITED_CAPACITY):
+        """capacity is the expected number of URLs in the whole crawl; each shard gets its share"""
+        self.mode = mode
+        self._shard_count = shards
+        self._shards = [make_visited_set(mode, max(1, capacity // shards)) for _ in range(shards)]
+        self._locks = [InstrumentedLock() for _ in range(shards)]
+
+    def _shard_of(self, url: str) -> int:
+        # str hashes are cached on the object, so this is nearly free
+        return hash(url) % self._shard_count
+
+    def _group_by_shard(self, urls) -> dict:
+        groups = {}
+        for position, url in enumerate(urls):
+            groups.setdefault(self._shard_of(url), []).append((position, url))
+        return groups
+
+    def add_if_new(self, url: str) -> bool:
+        """Atomically marks one URL as seen; True if this call claimed it"""
+        index = self._shard_of(url)
+        with self._locks[index]:
+            shard = self._shards[index]
+            if url in shard:
+                return False
+            shard.add(url)
+            return True
+
+    def claim_batch(self, urls) -> list[str]:
+        """Atomically marks every unseen URL as seen; returns the ones this call claimed, in input order"""
+        claimed = []
+        for index, members in self._group_by_shard(urls).items():
+            with self._locks[index]:
+                shard = self._shards[index]
+                for position, url in members:
+                    if url not in shard:
+                        shard.add(url)
+                        claimed.append((position, url))
+        claimed.sort()
+        return [url for _, url in claimed]
+
+    def filter_unseen(self, urls) -> list[str]:
+        """URLs not seen yet, in input order. Read-only; use claim_batch to take ownership."""
+        unseen = []
+        for index, members in self._group_by_shard(urls).items():
+            with self._locks[index]:
+                shard = self._shards[index]
+                unseen.extend((position, url) for position, url in members if url not in shard)
+        unseen.sort()
+        return [url for _, url in unseen]
+
+    def add(self, url: str):
+        self.add_if_new(url)
+
+    def __contains__(self, url: str) -> bool:
+        index = self._shard_of(url)
+        with self._locks[index]:
+            return url in self._shards[index]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def copy(self):
+        """A plain set of URLs in "set" mode; otherwise a snapshot ShardedVisitedSet"""
+        if self.mode == "set":
+            merged = set()
+            for index, shard in enumerate(self._shards):
+                with self._locks[index]:
+                    merged.update(shard)
+            return merged
+        clone = ShardedVisitedSet.__new__(ShardedVisitedSet)
+        clone.mode = self.mode
+        clone._shard_count = self._shard_count
+        clone._locks = [InstrumentedLock() for _ in range(self._shard_count)]
+        clone._shards = []
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                clone._shards.append(shard.copy())
+        return clone
+
+    def lock_stats(self) -> dict:
+        return summarize_locks(self._locks)
+
+
+class SpillingFrontier(Queue):
+    """
+    FIFO crawl frontier of (url, depth) items that keeps at most `max_in_memory`
+    items in RAM. Beyond that, new items are appended to a temporary spill file
+    and read back in order once the in-memory head drains.
+    Drop-in replacement for the crawler's Queue (put/get/task_done/qsize/join).
+    """
+
+    def __init__(self, max_in_memory: int = FRONTIER_MEMORY_ITEMS, spill_dir: str = None):
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        super().__init__()
+
+    # queue.Queue storage hooks; all are called with the queue's mutex held
+    def _init(self, maxsize):
+        self._head = deque()
+        self._spill_file = None
+        self._spilled = 0
+        self._read_offset = 0
+        self._at_end = True  # spill file position is at its end, ready to append
+
+    def _qsize(self):
+        return len(self._head) + self._spilled
+
+    def _put(self, item):
+        # Once anything is on disk, newer items must queue behind it to keep FIFO order
+        if not self._spilled and len(self._head) < self.max_in_memory:
+            self._head.append(item)
+            return
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(dir=self.spill_dir)
+        url, depth = item
+        if not self._at_end:
+            self._spill_file.seek(0, 2)
+            self._at_end = True
+        self._spill_file.write(f"{depth}\t{url}\n".encode('utf-8'))
+        self._spilled += 1
+
+    def _get(self):
+        if not self._head and self._spilled:
+            self._refill()
+        return self._head.popleft()
+
+    def _refill(self):
+        spill_file = self._spill_file
+        spill_file.flush()
+        spill_file.seek(self._read_offset)
+        self._at_end = False
+        for _ in range(min(self.max_in_memory, self._spilled)):
+            depth, url = spill_file.readline().decode('utf-8').rstrip('\n').split('\t', 1)
+            self._head.append((url, int(depth)))
+            self._spilled -= 1
+        self._read_offset = spill_file.tell()
+        if not self._spilled:
+            # Everything on disk has been read back: start the file over
+            spill_file.seek(0)
+            spill_file.truncate()
+            self._read_offset = 0
+
+    def put_many(self, items):
+        """put() of many items under one lock acquisition, e.g. a whole frontier restored from a checkpoint"""
+        with self.not_full:
+            count = 0
+            for item in items:
+                self._put(item)
+                count += 1
+            self.unfinished_tasks += count
+            self.not_empty.notify_all()
+
+    @property
+    def spilled(self) -> int:
+        with self.mutex:
+            return self._spilled
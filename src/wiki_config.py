@@ -3,6 +3,47 @@ import re
 WIKIPEDIA_BASE_URL = "http://en.wikipedia.org"
 WIKIPEDIA_API_RACC = "https://en.wikipedia.org/api/rest_v1/page/related"
 POOL_SIZE = 10
+HTTP_POOL_SIZE = 20 # KEEP-ALIVE CONNECTIONS PER HOST IN THE SHARED requests SESSION
+RATE_LIMIT_BURST = 3 # REQUESTS THAT MAY GO OUT BACK-TO-BACK BEFORE THE RATE LIMIT KICKS IN
+ASYNC_NUM_WORKERS = 200 # CONCURRENT FETCH TASKS FOR THE ASYNCIO ENGINE
+ASYNC_POOL_SIZE = 100 # MAX OPEN CONNECTIONS IN THE ASYNCIO ENGINE'S SHARED POOL
+PIPELINE_QUEUE_SIZE = 64 # RAW PAGES WAITING FOR A PARSER PROCESS BEFORE FETCHERS BLOCK
+VISITED_SET_MODE = "set" # "set" (EXACT URL STRINGS), "hash" (64-BIT HASH TABLE) OR "bloom" (BLOOM FILTER)
+VISITED_SHARDS = 16 # INDEPENDENTLY LOCKED SHARDS OF THE SEEN-URL SET
+VISITED_CAPACITY = 1_000_000 # URLS THE SEEN-URL SET IS SIZED FOR UP FRONT; "hash" AND "bloom" GROW PAST IT
+FRONTIER_MEMORY_ITEMS = 100000 # FRONTIER ENTRIES KEPT IN RAM BEFORE SPILLING TO DISK
+PAGE_STORE_BACKEND = "sqlite" # "sqlite" (BATCHED WRITE-BEHIND DATABASE) OR "json" (ONE FILE PER PAGE)
+PAGE_STORE_BATCH_SIZE = 500 # PAGE RECORDS COMMITTED PER TRANSACTION
+PAGE_STORE_FLUSH_INTERVAL = 2.0 # MAX SECONDS A SAVED PAGE WAITS IN MEMORY BEFORE IT IS COMMITTED
+SOLVER_MAX_FETCHES = 200 # PAGES THE PATH SOLVER MAY FETCH PER QUERY WHEN A PATH LEAVES THE CRAWLED GRAPH
+SOLVER_FETCH_BATCH = 20 # UNCRAWLED PAGES FETCHED BEFORE THE SOLVER SEARCHES AGAIN
+RACE_MAX_FETCHES = 500 # FETCH BUDGET FOR ONE TARGETED RACE CRAWL
+EMBED_BATCH_SIZE = 32 # MAX TEXTS PER MODEL CALL IN SemanticEmbedder.embed_batch
+EMBED_MAX_BATCH_TOKENS = 8192 # MAX PADDED TOKENS PER EMBEDDING BATCH, SO LONG TEXTS GET SMALLER BATCHES
+EMBED_NUM_THREADS = 4 # CPU THREADS TORCH MAY USE FOR EMBEDDING, LEAVING CORES FOR FETCHING AND PARSING
+VECTOR_INDEX_NPROBE = 8 # IVF LISTS SCANNED PER RELATED-PAGE QUERY (MORE = BETTER RECALL, SLOWER)
+TOPIC_MODEL = "facebook/bart-large-mnli" # ZERO-SHOT TOPIC MODEL
+TOPIC_MODEL_SMALL = "valhalla/distilbart-mnli-12-1" # DISTILLED MNLI MODEL, SEVERAL TIMES FASTER ON CPU
+TOPIC_BATCH_SIZE = 16 # PREMISE/HYPOTHESIS PAIRS PER ZERO-SHOT MODEL CALL
+TOPIC_CACHE_SIZE = 10000 # TEXTS WHOSE ZERO-SHOT LABEL SCORES ARE KEPT IN MEMORY
+PAGE_CLASSIFIER_MODEL = "models/page_classifier.npz" # TRAINED PageClassifier MODEL; WITHOUT IT PAGES ARE STORED UNCLASSIFIED
+PAGE_CLASSIFIER_FEATURES = 2 ** 18 # HASHED FEATURE BUCKETS FOR NEWLY TRAINED PageClassifier MODELS
+PAGE_CLASSIFIER_MIN_CONFIDENCE = 0.5 # PAGES WHOSE BEST LABEL IS LESS LIKELY THAN THIS STAY UNCLASSIFIED
+CATEGORY_CLOSURE_DEPTH = 3 # ANCESTOR LEVELS PRECOMPUTED PER CATEGORY; DEEPER QUERIES WALK THE PARENT LISTS
+RESPONSE_ARCHIVE_DIR = "response_archive" # WHERE FETCHED PAGE BODIES ARE KEPT FOR REPROCESSING WITHOUT THE NETWORK
+RESPONSE_ARCHIVE_MAX_BYTES = 20 * 1024 ** 3 # ARCHIVE SIZE ABOVE WHICH LEAST RECENTLY USED SEGMENTS ARE EVICTED
+RESPONSE_ARCHIVE_SEGMENT_BYTES = 64 * 1024 ** 2 # SIZE OF ONE ARCHIVE SEGMENT FILE, THE UNIT OF EVICTION
+RESPONSE_ARCHIVE_COMPRESSION = "zstd" # "zstd" (NEEDS THE zstandard PACKAGE, FALLS BACK TO GZIP) OR "gzip"
+REPROCESS_BATCH_SIZE = 32 # ARCHIVED PAGES PER PARSER-PROCESS TASK WHEN REPROCESSING FROM THE ARCHIVE
+REPROCESS_BATCH_TIMEOUT = 300.0 # SECONDS ONE BATCH MAY TAKE IN A PARSER PROCESS BEFORE REPROCESSING IS ABORTED
+CHECKPOINT_INTERVAL = 10.0 # SECONDS BETWEEN CRAWL CHECKPOINTS; 0 TURNS CHECKPOINTING OFF
+DISTRIBUTED_BATCH_SIZE = 256 # LINKS PER MESSAGE WHEN A NODE FORWARDS LINKS TO THE NODE THAT OWNS THEM
+DISTRIBUTED_FLUSH_INTERVAL = 0.05 # MAX SECONDS A FORWARDED LINK WAITS FOR ITS BATCH TO FILL
+DISTRIBUTED_PROBE_INTERVAL = 0.1 # SECONDS BETWEEN THE COORDINATOR'S COMPLETION PROBES
+CRAWL_LOG_LEVEL = "info" # "debug" ALSO PRINTS EVERY CRAWLED URL, "warning" ONLY ERRORS AND RESULTS
+METRICS_PORT = 0 # LOCAL PORT SERVING PROMETHEUS TEXT AT /metrics DURING A CRAWL; 0 TURNS IT OFF
+METRICS_SNAPSHOT_INTERVAL = 10.0 # SECONDS BETWEEN JSON METRICS SNAPSHOTS IN data_dir/metrics.json; 0 TURNS THEM OFF
+STORE_ARTICLE_FIELDS = False # ALSO STORE EACH PAGE'S INFOBOX, CATEGORIES AND LEAD TEXT; COSTS A FULL HTML PARSE PER PAGE
 MAX_DEPTH = 3 # THIS IS TO TELL HOW DEEP FROM CURRENT PAGE WE CAN GO
 MAX_PAGES_PER_DEPTH = 100 # WE DO NOT WANT A SINGLE CRAWLER TO GO LOOK FOR THE ENTIRE WIKIPEDIA
 
@@ -1,110 +1,158 @@
-from multiprocessing.pool import ThreadPool
+import os
 import time
 from collections import deque
 import random
 import threading
-from queue import Queue, Empty
-import requests
+from queue import Empty
 from requests import RequestException
 
 from src.link_extractor import LinkExtractor
-from src.wiki_config import WIKIPEDIA_BASE_URL, POOL_SIZE, MAX_DEPTH, MAX_PAGES_PER_DEPTH, WIKIPEDIA_API_RACC
+from src.parsed_page import ParsedPage
+from src.wiki_parser import WikiParser
+from src.wiki_config import WIKIPEDIA_BASE_URL, POOL_SIZE, MAX_DEPTH, MAX_PAGES_PER_DEPTH, WIKIPEDIA_API_RACC, \
+    VISITED_SET_MODE, VISITED_SHARDS, VISITED_CAPACITY, FRONTIER_MEMORY_ITEMS, RATE_LIMIT_BURST, PAGE_STORE_BACKEND, \
+    CHECKPOINT_INTERVAL, CRAWL_LOG_LEVEL, METRICS_PORT, METRICS_SNAPSHOT_INTERVAL, STORE_ARTICLE_FIELDS
 from src.page_fetcher import PageFetcher
 from src.page_classifier import PageClassifier
-from src.data_store import PageDataStore
+from src.data_store import open_page_store
+from src.crawl_checkpoint import CrawlCheckpoint
+from src.crawl_metrics import CrawlMetrics, MetricsReporter, MetricsServer
+from src.http_session import get_shared_pool, configure_shared_pool
+from src.url_frontier import ShardedVisitedSet, SpillingFrontier
+from src.rate_limiter import RateLimiter, API_ENDPOINT, parse_retry_after
 
-
-class RateLimiter:
-    """Thread-safe rate limiter to respect Wikipedia's servers"""
-
-    def __init__(self, min_interval=1.0):
-        self.min_interval = min_interval  # Minimum seconds between requests
-        self.last_request_time = 0
-        self.lock = threading.Lock()
-
-    def wait_if_needed(self):
-        """Wait if necessary to maintain rate limit"""
-        with self.lock:
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-
-            if time_since_last_request < self.min_interval:
-                sleep_time = self.min_interval - time_since_last_request
-                time.sleep(sleep_time)
-
-            self.last_request_time = time.time()
+# Console verbosity: "debug" adds one line per crawled page, "warning" drops the progress updates
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30}
 
 
 class WikiCrawler:
-    def __init__(self, start_url, num_threads=3, requests_per_second=1):
+    def __init__(self, start_url, num_threads=3, requests_per_second=1, base_url=WIKIPEDIA_BASE_URL,
+                 data_dir="crawled_data", max_depth=MAX_DEPTH, max_pages_per_depth=MAX_PAGES_PER_DEPTH,
+                 http_pool_size=None, visited_mode=VISITED_SET_MODE, visited_shards=VISITED_SHARDS,
+                 visited_capacity=VISITED_CAPACITY, frontier_memory_items=FRONTIER_MEMORY_ITEMS, burst=RATE_LIMIT_BURST,
+                 endpoint_rates=None, store_backend=PAGE_STORE_BACKEND, related_index=None, response_archive=None,
+                 checkpoint_interval=CHECKPOINT_INTERVAL, log_level=CRAWL_LOG_LEVEL, metrics_port=METRICS_PORT,
+                 metrics_interval=METRICS_SNAPSHOT_INTERVAL, store_article_fields=STORE_ARTICLE_FIELDS):
         self.start_url = start_url
-        self.visited_urls = set()
-        self.visited_urls_lock = threading.Lock()
-
-        self.page_fetcher = PageFetcher()
-        self.link_extractor = LinkExtractor()
-        self.data_store = PageDataStore()
+        self.max_depth = max_depth
+        self.max_pages_per_depth = max_pages_per_depth
+        # Every URL is claimed here when it is queued, so each one is fetched at most once.
+        # Plain sets by default; "hash"/"bloom" keep memory flat on million-page crawls.
+        self.visited_urls = ShardedVisitedSet(mode=visited_mode, shards=visited_shards, capacity=visited_capacity)
+
+        # Token-bucket rate limiter, one bucket per endpoint class, shared across all threads.
+        # A falsy rate disables limiting (e.g. for a local mirror); server 429s still slow it down.
+        self.rate_limiter = RateLimiter(requests_per_second or None, burst=burst, endpoint_rates=endpoint_rates)
+
+        # Every HTTP caller shares one keep-alive session pool
+        if http_pool_size:
+            configure_shared_pool(http_pool_size)
+        self.page_fetcher = PageFetcher(rate_limiter=self.rate_limiter)
+        self.link_extractor = LinkExtractor(base_url=base_url)
+        self.wiki_parser = WikiParser(link_extractor=self.link_extractor)
+        # Batched write-behind store by default; flushed when the crawl ends
+        self.data_store = open_page_store(data_dir, backend=store_backend)
         self.page_classifier = PageClassifier()
-
-        # Thread pool with limited workers
-        self.num_threads = min(num_threads, POOL_SIZE)  # Respect configured max
-        self.pool = ThreadPool(self.num_threads)
-
-        # Thread-safe queue for URLs to crawl
-        self.crawl_queue = Queue()
-
-        # Rate limiter - shared across all threads
-        self.rate_limiter = RateLimiter(min_interval=1.0 / requests_per_second)
+        # Infobox, categories and lead text need the full BeautifulSoup parse, several times the
+        # cost of link extraction; without this they are parsed only for a consumer that reads them
+        self.store_article_fields = store_article_fields
+        # Optional VectorIndex over page embeddings; answers related-page queries without the API
+        self.related_index = related_index
+        # Optional ResponseArchive; keeps every fetched body so later parser changes can reprocess offline
+        self.response_archive = response_archive
+
+        # Worker threads, limited to the configured max
+        self.num_threads = min(num_threads, POOL_SIZE)
+
+        # Thread-safe queue for URLs to crawl, spills to disk past frontier_memory_items entries
+        self.crawl_queue = SpillingFrontier(max_in_memory=frontier_memory_items)
+        # Idle workers park on this condition until a URL is queued, the crawl completes or stop() is called
+        self._work_cond = threading.Condition()
+        self._in_flight = 0  # URLs taken from crawl_queue whose links are not queued yet
 
         # Statistics
         self.stats_lock = threading.Lock()
         self.pages_crawled = 0
         self.pages_failed = 0
-
-    def _process_page(self, url, current_depth):
-        """Process a single page (thread-safe)"""
-        # Check if already visited (thread-safe)
-        with self.visited_urls_lock:
-            if url in self.visited_urls:
-                return None
-            self.visited_urls.add(url)
-
-        # Rate limit before making request
+        self.pages_not_modified = 0
+
+        # Journal of frontier deltas in data_dir, written in the background; resume() replays it
+        self.checkpoint = None
+        if checkpoint_interval:
+            self.checkpoint = CrawlCheckpoint(os.path.join(data_dir, "crawl.journal"), checkpoint_interval,
+                                              flush_store=self.data_store.flush, stats=self._checkpoint_stats)
+        self._resume_state = None
+        self.resumed_from = None  # start time of the interrupted crawl, once resumed
+        self._stop = threading.Event()
+
+        self.log_level = LOG_LEVELS[log_level]
+        # Stage latencies, fetch counters and gauges; see src/crawl_metrics.py for the ways to read them
+        self.metrics = CrawlMetrics()
+        self.metrics.gauge("queue_depth", "URLs waiting in the frontier", fn=self._queue_depth)
+        for stat in ("pages_crawled", "pages_failed", "pages_not_modified"):
+            self.metrics.counter(f"{stat}_total", stat.replace("_", " ").capitalize(),
+                                 fn=lambda stat=stat: getattr(self, stat))
+        self.metrics_port = metrics_port
+        self.metrics_interval = metrics_interval
+        self._metrics_path = os.path.join(data_dir, "metrics.json")
+        self._metrics_server = None
+        self._metrics_reporter = None
+
+    def _queue_depth(self):
+        return self.crawl_queue.qsize()
+
+    def _start_metrics(self):
+        """Starts the Prometheus endpoint and the JSON snapshots, whichever are configured"""
+        if self.metrics_port:
+            self._metrics_server = MetricsServer(self.metrics, self.metrics_port)
+            print(f"Metrics: http://127.0.0.1:{self._metrics_server.port}/metrics")
+        if self.metrics_interval:
+            self._metrics_reporter = MetricsReporter(self.metrics, self._metrics_path, self.metrics_interval)
+
+    def _stop_metrics(self):
+        """Writes the final JSON snapshot and closes the endpoint"""
+        if self._metrics_reporter is not None:
+            self._metrics_reporter.close()
+            self._metrics_reporter = None
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            self._metrics_server = None
+
+    def _wait_for_rate_limit(self):
+        start = time.perf_counter()
         self.rate_limiter.wait_if_needed()
+        self.metrics.stage["rate_limit_wait"].observe(time.perf_counter() - start)
 
-        print(f"[Thread-{threading.get_ident()}] Crawling: {url} (Depth: {current_depth})")
+    def _fetch_page(self, url, stored_page):
+        """Conditional GET using the stored page's validators, timed and counted in the metrics"""
+        with self.metrics.in_flight.track(), self.metrics.stage["fetch"].time():
+            result = self.page_fetcher.fetch_conditional(url, stored_page.get("etag"),
+                                                         stored_page.get("last_modified"))
+        self._count_fetch(result)
+        return result
 
-        try:
-            html_content = self.page_fetcher.fetch(url)
-            if not html_content:
-                with self.stats_lock:
-                    self.pages_failed += 1
-                return None
-
-            page_title = self.link_extractor.get_page_title(url)
-            extracted_links = self.link_extractor.extract_links(html_content)
-
-            # Basic classification
-            page_category = self.page_classifier.classify(
-                html_content.decode('utf-8', errors='ignore'),
-                page_title
-            )
-
-            page_data = {
-                "url": url,
-                "title": page_title,
-                "links": extracted_links,
-                "crawled_at": time.time(),
-                "category": page_category
-            }
-
-            # Thread-safe save
-            self.data_store.save_page_data(page_title, page_data)
+    def _count_fetch(self, result):
+        self.metrics.fetches.inc()
+        if result.content:
+            self.metrics.bytes_downloaded.inc(len(result.content))
 
-            with self.stats_lock:
-                self.pages_crawled += 1
+    def _process_page(self, url, current_depth):
+        """Process a single page (thread-safe). The URL was already claimed in visited_urls when queued."""
+        if self.log_level <= LOG_LEVELS["debug"]:
+            print(f"[Thread-{threading.get_ident()}] Crawling: {url} (Depth: {current_depth})")
 
-            return extracted_links, current_depth
+        try:
+            page_title = self.link_extractor.get_page_title(url)
+            stored_page = self._load_stored_page(page_title)
+            if self._stored_before_resume(stored_page):
+                return self._handle_stored_before_resume(stored_page, current_depth)
+            # Rate limit only requests that are made; pages stored before a resume use no token
+            self._wait_for_rate_limit()
+            result = self._fetch_page(url, stored_page)
+            if result.not_modified:
+                return self._handle_not_modified(stored_page, current_depth)
+            return self._handle_page_content(url, current_depth, result.content,
+                                             result.etag, result.last_modified)
 
         except Exception as e:
             print(f"[Thread-{threading.get_ident()}] Error processing {url}: {e}")
@@ -112,55 +160,231 @@ class WikiCrawler:
                 self.pages_failed += 1
             return None
 
-    def _worker(self):
-        """Worker thread function"""
-        while True:
-            try:
-                # Get next URL from queue (blocks for up to 1 second)
-                url, depth = self.crawl_queue.get(timeout=1)
+    def _load_stored_page(self, page_title):
+        """Previously stored data for a page (used for its ETag/Last-Modified), or an empty dict"""
+        if not self.data_store.has_page(page_title):
+            return {}
+        return self.data_store.load_page_data(page_title) or {}
+
+    def _handle_not_modified(self, stored_page, current_depth):
+        """A 304 means the stored record is still current, so its links are reused without re-parsing"""
+        with self.stats_lock:
+            self.pages_crawled += 1
+            self.pages_not_modified += 1
+        return stored_page.get("links", []), current_depth
+
+    def _stored_before_resume(self, stored_page):
+        """True for a page this crawl stored after its last checkpoint, before it was interrupted"""
+        return self.resumed_from is not None and stored_page.get("crawled_at", 0) >= self.resumed_from
+
+    def _handle_stored_before_resume(self, stored_page, current_depth):
+        """Such a page is not fetched again: its stored links are reused"""
+        with self.stats_lock:
+            self.pages_crawled += 1
+        return stored_page.get("links", []), current_depth
+
+    def _handle_page_content(self, url, current_depth, html_content, etag=None, last_modified=None):
+        """Extract, classify and store a fetched page. Shared by the threaded and asyncio engines."""
+        if not html_content:
+            with self.stats_lock:
+                self.pages_failed += 1
+            return None
+        self._archive_response(url, html_content, etag, last_modified)
 
-                if depth >= MAX_DEPTH:
-                    self.crawl_queue.task_done()
-                    continue
+        stage = self.metrics.stage
+        # One shared document per page: every reader below reuses the same decode/parse
+        with stage["parse"].time():
+            page = ParsedPage(html_content, url)
+            page_title = self.link_extractor.get_page_title(url)
+            extracted_links = self.link_extractor.extract_links(page)
+            article = (self.wiki_parser.parse_articles(page, url) or {}) if self._needs_article() else None
 
-                # Process the page
-                result = self._process_page(url, depth)
+        # Basic classification
+        with stage["classify"].time():
+            page_category = self.page_classifier.classify(page, page_title)
 
-                if result:
-                    extracted_links, current_depth = result
+        self._store_page(url, page_title, extracted_links, page_category, article, etag, last_modified)
+        return extracted_links, current_depth
 
-                    # Add new links to queue
-                    links_added = 0
-                    for link in extracted_links:
-                        if links_added >= MAX_PAGES_PER_DEPTH:
-                            break
+    def _needs_article(self):
+        """True if the page's WikiParser article is read. The classifier scans the bytes itself and never needs it."""
+        return self.store_article_fields
 
-                        with self.visited_urls_lock:
-                            if link not in self.visited_urls:
-                                self.crawl_queue.put((link, current_depth + 1))
-                                links_added += 1
+    def _archive_response(self, url, html_content, etag=None, last_modified=None):
+        """Keeps the raw body in the response archive, if there is one. A failed write never fails the page."""
+        if self.response_archive is None:
+            return
+        try:
+            self.response_archive.put(url, html_content, etag, last_modified)
+        except Exception as e:
+            print(f"[Thread-{threading.get_ident()}] Could not archive {url}: {e}")
+
+    def _store_page(self, url, page_title, extracted_links, page_category, article, etag=None, last_modified=None):
+        """
+        Build the stored record for a parsed page, save it and count it as crawled.
+        article is None when the page was not parsed for it; the record then has no article fields.
+        """
+        page_data = {
+            "url": url,
+            "title": page_title,
+            "links": extracted_links,
+            "crawled_at": time.time(),
+            "category": page_category
+        }
+        if article is not None:
+            page_data["infobox"] = article.get("infobox", {})
+            page_data["categories"] = article.get("categories", [])
+            page_data["lead_text"] = article.get("lead_text", "")
+        # Validators let the next crawl of this page be a conditional GET
+        if etag:
+            page_data["etag"] = etag
+        if last_modified:
+            page_data["last_modified"] = last_modified
+
+        # Thread-safe save
+        with self.metrics.stage["store"].time():
+            self.data_store.save_page_data(page_title, page_data)
 
-                self.crawl_queue.task_done()
+        with self.stats_lock:
+            self.pages_crawled += 1
+
+    def _enqueue_links(self, extracted_links, current_depth, parent_url=None):
+        """Queue up to max_pages_per_depth links that have not been visited yet"""
+        next_depth = current_depth + 1
+        claimed = []
+        if next_depth < self.max_depth:  # deeper links would be dropped unfetched anyway
+            # Whole-page dedup: one lock per shard to filter, one to claim. A link another
+            # worker claimed in between is simply not returned by claim_batch.
+            candidates = self.visited_urls.filter_unseen(extracted_links)[:self.max_pages_per_depth]
+            claimed = self.visited_urls.claim_batch(candidates)
+
+        # Journaled as one record, so no checkpoint has the parent done without its links queued
+        if self.checkpoint is not None and parent_url is not None:
+            self.checkpoint.record_expanded(parent_url, next_depth, claimed)
+        if claimed:
+            self._enqueue_many([(link, next_depth) for link in claimed])
+
+    def _enqueue(self, url, depth):
+        self.crawl_queue.put((url, depth))
+        with self._work_cond:
+            self._work_cond.notify()
+
+    def _enqueue_many(self, items):
+        self.crawl_queue.put_many(items)
+        with self._work_cond:
+            self._work_cond.notify(len(items))
+
+    def _enqueue_start(self):
+        """Seeds the frontier: the start page, or when resuming, whatever the interrupted crawl had left"""
+        if self._resume_state is not None:
+            return self._restore_checkpoint()
+        self.visited_urls.add_if_new(self.start_url)
+        if self.checkpoint is not None:
+            self.checkpoint.begin({"start_url": self.start_url, "started_at": time.time(),
+                                   "max_depth": self.max_depth, "max_pages_per_depth": self.max_pages_per_depth})
+            self.checkpoint.record_expanded(None, 0, [self.start_url])
+        self._enqueue(self.start_url, 0)
+
+    def _restore_checkpoint(self):
+        state, self._resume_state = self._resume_state, None
+        self.resumed_from = state.meta["started_at"]
+        self.visited_urls.claim_batch(state.seen)
+        with self.stats_lock:
+            self.pages_crawled = state.pages_done
+            self.pages_failed = state.stats.get("pages_failed", 0)
+            self.pages_not_modified = state.stats.get("pages_not_modified", 0)
+        self.checkpoint.reopen(state)
+        print(f"Resuming crawl of {self.start_url}: {len(state.seen)} URLs seen, {state.pages_done} done, "
+              f"{len(state.pending)} left in the frontier")
+        self._enqueue_many(state.pending)
+
+    def _checkpoint_stats(self):
+        with self.stats_lock:
+            return {"pages_crawled": self.pages_crawled, "pages_failed": self.pages_failed,
+                    "pages_not_modified": self.pages_not_modified}
+
+    def _close_checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+    def resume(self):
+        """
+        Continues the interrupted crawl whose checkpoint is in data_dir with this crawler's engine.
+        Pages already stored are not fetched again; the start URL and limits come from the checkpoint.
+        """
+        if self.checkpoint is None or not self.checkpoint.exists():
+            raise FileNotFoundError("No crawl checkpoint to resume from")
+        start = time.time()
+        self._resume_state = self.checkpoint.load()
+        meta = self._resume_state.meta
+        self.start_url = meta["start_url"]
+        self.max_depth = meta["max_depth"]
+        self.max_pages_per_depth = meta["max_pages_per_depth"]
+        print(f"Loaded checkpoint {self.checkpoint.path} in {time.time() - start:.2f}s")
+        self.start_crawl()
+
+    def stop(self):
+        """Asks the crawl to finish the pages in flight and return; resume() picks up the rest"""
+        self._stop.set()
+        with self._work_cond:
+            self._work_cond.notify_all()
+
+    def _next_item(self):
+        """
+        The next (url, depth) to crawl, counted as in flight; None once the crawl is over.
+        With the queue empty but pages still in flight, the worker parks until one of them
+        queues links or finishes. The crawl is complete exactly when neither is left.
+        """
+        with self._work_cond:
+            while not self._stop.is_set():
+                try:
+                    item = self.crawl_queue.get_nowait()
+                except Empty:
+                    if self._in_flight == 0:
+                        self._stop.set()  # complete: wakes the other workers and start_crawl
+                        self._work_cond.notify_all()
+                        break
+                    self._work_cond.wait()
+                    continue
+                self._in_flight += 1
+                return item
+            return None
 
-            except Empty:
-                # No more URLs to process
-                break
+    def _item_done(self):
+        """Called once the item's links are queued, so an empty queue then means nothing more is coming"""
+        with self._work_cond:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._work_cond.notify_all()
+
+    def _worker(self):
+        """Worker thread function: crawls until the crawl is complete or stopped"""
+        while True:
+            item = self._next_item()
+            if item is None:
+                return
+            url, depth = item
+            try:
+                if depth < self.max_depth:
+                    result = self._process_page(url, depth)
+                    if result:
+                        extracted_links, current_depth = result
+                        self._enqueue_links(extracted_links, current_depth, parent_url=url)
             except Exception as e:
                 print(f"[Thread-{threading.get_ident()}] Worker error: {e}")
-                try:
-                    self.crawl_queue.task_done()
-                except:
-                    pass
+            finally:
+                self._item_done()
 
     def start_crawl(self):
         """Start the multi-threaded crawl"""
         start_time = time.time()
 
         # Add initial URL to queue
-        self.crawl_queue.put((self.start_url, 0))
+        self._enqueue_start()
+        self._start_metrics()
 
         print(f"Starting crawl with {self.num_threads} threads...")
-        print(f"Rate limit: {1 / self.rate_limiter.min_interval:.1f} requests/second")
+        self._print_rate_limit()
 
         # Start worker threads
         workers = []
@@ -169,58 +393,105 @@ class WikiCrawler:
             worker.start()
             workers.append(worker)
 
-        # Monitor progress
-        last_stats_time = time.time()
-        while not self.crawl_queue.empty() or any(w.is_alive() for w in workers):
-            time.sleep(5)  # Check every 5 seconds
-
-            # Print statistics
-            current_time = time.time()
-            if current_time - last_stats_time >= 10:  # Every 10 seconds
-                with self.stats_lock:
-                    print(f"\n--- Progress Update ---")
-                    print(f"Pages crawled: {self.pages_crawled}")
-                    print(f"Pages failed: {self.pages_failed}")
-                    print(f"Queue size: {self.crawl_queue.qsize()}")
-                    print(f"Active threads: {sum(1 for w in workers if w.is_alive())}")
-                    print(f"Time elapsed: {current_time - start_time:.1f}s")
-                    print("----------------------\n")
-                last_stats_time = current_time
-
-        # Wait for all threads to complete
+        # Wakes the moment the crawl completes or stop() is called; otherwise prints progress every 10 s
+        interrupted = False
+        while not self._stop.is_set():
+            try:
+                if not self._stop.wait(timeout=10):
+                    self._print_progress(start_time, f"Pages in flight: {self._in_flight}")
+            except KeyboardInterrupt:
+                print("\nInterrupted: finishing the pages in flight, then writing a checkpoint...")
+                interrupted = True
+                self.stop()
+
+        # Workers leave as soon as they finish their current page
         for worker in workers:
             worker.join()
 
         # Clean up
-        self.pool.close()
-        self.pool.join()
+        self.data_store.close()
+        self._close_checkpoint()
+        self._stop_metrics()
+        if interrupted:
+            raise KeyboardInterrupt
 
         end_time = time.time()
-
-        # Final statistics
+        self._print_final_stats(end_time - start_time)
+
+    def _print_progress(self, start_time, *engine_lines):
+        """The periodic progress block, read from the metrics; silent below the "info" log level"""
+        if self.log_level > LOG_LEVELS["info"]:
+            return
+        values = self.metrics.snapshot()["metrics"]
+        fetch = values["stage_fetch_seconds"]
+        print(f"\n--- Progress Update ---")
+        print(f"Pages crawled: {values['pages_crawled_total']}")
+        print(f"Pages failed: {values['pages_failed_total']}")
+        print(f"Not modified (304): {values['pages_not_modified_total']}")
+        print(f"Queue size: {values['queue_depth']}")
+        print(f"Fetches in flight: {values['fetches_in_flight']}, "
+              f"downloaded: {values['bytes_downloaded_total'] / 2 ** 20:.1f} MiB, "
+              f"fetch p50/p95: {fetch['p50'] * 1000:.0f}/{fetch['p95'] * 1000:.0f} ms")
+        for line in engine_lines:
+            print(line)
+        print(f"Time elapsed: {time.time() - start_time:.1f}s")
+        print("----------------------\n")
+
+    def _print_rate_limit(self):
+        if self.rate_limiter.requests_per_second:
+            print(f"Rate limit: {self.rate_limiter.requests_per_second:.1f} requests/second "
+                  f"(burst {self.rate_limiter.burst})")
+        else:
+            print("Rate limit: disabled")
+
+    def _print_final_stats(self, total_time):
         print(f"\n=== Crawl Completed ===")
-        print(f"Total time: {end_time - start_time:.2f} seconds")
+        print(f"Total time: {total_time:.2f} seconds")
         print(f"Pages crawled: {self.pages_crawled}")
         print(f"Pages failed: {self.pages_failed}")
         print(f"Total pages visited: {len(self.visited_urls)}")
+        print(f"Not modified (304): {self.pages_not_modified}")
+        lock_stats = self.visited_urls.lock_stats()
+        print(f"Visited-set locks: {lock_stats['locks']} shards, {lock_stats['acquisitions']} acquisitions, "
+              f"{lock_stats['contended_ratio']:.1%} contended, {lock_stats['wait_seconds'] * 1000:.1f} ms waiting")
+        for host, counts in sorted(self._connection_stats().items()):
+            print(f"Connections to {host}: {counts['connections']} opened, "
+                  f"{counts['reused']} reused over {counts['requests']} requests")
+        for stage, histogram in self.metrics.stage.items():
+            latency = histogram.value
+            if latency["count"]:
+                print(f"{stage}: {latency['count']} pages, mean {latency['mean'] * 1000:.1f} ms, "
+                      f"p50 {latency['p50'] * 1000:.1f} ms, p95 {latency['p95'] * 1000:.1f} ms")
         print("=====================\n")
 
+    def _connection_stats(self):
+        """Per-host connection reuse from the shared session pool"""
+        return get_shared_pool().connection_stats()
+
     def get_visited_pages(self):
         """Get a copy of visited pages (thread-safe)"""
-        with self.visited_urls_lock:
-            return self.visited_urls.copy()
+        return self.visited_urls.copy()
 
     def get_page_data(self, title):
         """Get data for a specific page"""
         return self.data_store.load_page_data(title)
 
+    def get_related_wikis(self, title):
+        """Related pages from the local vector index when one is loaded, else from the REST API"""
+        if self.related_index is not None:
+            return self.related_index.get_related(title)
+        return self.get_related_wikis_api(title)
+
     def get_related_wikis_api(self, title):
         """Get related wikis using API (rate-limited)"""
-        self.rate_limiter.wait_if_needed()
+        rate_limiter = self.page_fetcher.rate_limiter  # synchronous in every engine, unlike self.rate_limiter
+        rate_limiter.wait_if_needed(API_ENDPOINT)
 
         api_url = WIKIPEDIA_API_RACC + "/" + title
         try:
-            response = requests.get(api_url, timeout=5)
+            response = get_shared_pool().get(api_url, timeout=5)
+            if response.status_code == 429:
+                rate_limiter.throttle(API_ENDPOINT, parse_retry_after(response.headers.get("Retry-After")))
             response.raise_for_status()
             return [i['title'] for i in response.json().get('pages', [])]
         except RequestException as e:
@@ -1,13 +1,15 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Comment, NavigableString
 import re
-import time
-from src.wiki_config import WIKIPEDIA_BASE_URL, VALID_WIKI_LINK_REGEX
+from urllib.parse import unquote
+from src.link_extractor import LinkExtractor
+from src.parsed_page import ParsedPage
 
 class WikiParser:
-    def __init__(self):
+    def __init__(self, link_extractor: LinkExtractor = None):
         self.paragraph_tags_regex = re.compile(r'<(p|ul|ol)>')
+        self.link_extractor = link_extractor or LinkExtractor()
 
-    def parse_articles(self, html_content: bytes, article_url:str) -> dict | None:
+    def parse_articles(self, html_content: bytes | ParsedPage, article_url:str) -> dict | None:
         """
         extract from Wiki:
         - Article title
@@ -15,11 +17,18 @@ class WikiParser:
         - Categories
         - Lead section text
         - Internal links
+        Accepts raw bytes or a ParsedPage; with a ParsedPage the page's shared soup is reused.
         """
         if not html_content:
             return None
+        page = html_content if isinstance(html_content, ParsedPage) else ParsedPage(html_content, article_url)
+        if not page.html_content:
+            return None
+        return page.memoize("article", lambda: self._parse(page, article_url))
+
+    def _parse(self, page: ParsedPage, article_url: str) -> dict | None:
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = page.soup
 
             title_tag = soup.find('h1', {"firstHeading"})
             article_title = title_tag.get_text(strip=True) if title_tag else self._get_title_from_url(article_url)
@@ -27,7 +36,7 @@ class WikiParser:
             infobox_data = self._extract_infobox(soup)
             categories = self._extract_categories(soup)
             lead_text = self._extract_lead_section(soup)
-            all_internal_link = self._extract_internal_links(soup)
+            all_internal_link = self.link_extractor.extract_links(page)
 
             return {
                 "title"             : article_title,
@@ -47,7 +56,9 @@ class WikiParser:
         infobox = soup.find("table", {"class": "infobox"})
         data = {}
         if infobox:
-            for row in infobox.find_all('tr', recursive=False):
+            # Live pages wrap the rows in <tbody>, saved/minimal pages may not
+            row_parent = infobox.find('tbody', recursive=False) or infobox
+            for row in row_parent.find_all('tr', recursive=False):
                 header = row.find('th', recursive=False)
                 value_td = row.find('td', recursive=False)
 
@@ -61,4 +72,48 @@ class WikiParser:
                             value_parts.append(content.get_text(separator=' ', strip=True))
                         else:
                             value_parts.append(str(content).strip())
-                    value = ' '.join(value_parts).replace('\n', ' ').strip()
\ No newline at end of file
+                    value = ' '.join(value_parts).replace('\n', ' ').strip()
+                    data[key] = value
+        return data
+
+    def _extract_categories(self, soup: BeautifulSoup) -> list[str]:
+        """Visible categories from the catlinks box at the bottom of the page"""
+        catlinks = soup.find("div", id="mw-normal-catlinks") or soup.find("div", id="catlinks")
+        if not catlinks:
+            return []
+        categories = []
+        for anchor in catlinks.find_all("a", href=True):
+            if anchor["href"].startswith("/wiki/Category:"):
+                categories.append(anchor.get_text(strip=True))
+        return categories
+
+    def _extract_lead_section(self, soup: BeautifulSoup) -> str:
+        """Text of the paragraphs before the first section heading, without reference markers"""
+        content = soup.find("div", {"class": "mw-parser-output"}) or soup.body or soup
+        paragraphs = []
+        for element in content.find_all(["p", "h2", "div"], recursive=False):
+            if element.name == "h2" or "mw-heading" in element.get("class", []):
+                break
+            if element.name != "p" or "mw-empty-elt" in element.get("class", []):
+                continue
+            text = self._text_without_references(element)
+            if text:
+                paragraphs.append(text)
+        return "\n".join(paragraphs)
+
+    def _text_without_references(self, element) -> str:
+        # Walk the tree instead of decompose()-ing <sup> tags: the soup is shared with other readers
+        parts = []
+        for child in element.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                parts.append(str(child))
+            elif child.name == 'sup' and 'reference' in child.get('class', []):
+                continue
+            else:
+                parts.append(self._text_without_references(child))
+        return re.sub(r'\s+', ' ', ''.join(parts)).strip()
+
+    def _get_title_from_url(self, article_url: str) -> str:
+        return unquote(article_url.rstrip("/").split("/")[-1]).replace("_", " ")
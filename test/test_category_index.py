@@ -0,0 +1,83 @@
+# test_category_index.py
+import json
+import os
+import random
+import time
+
+import pytest
+
+import src.category_index as category_index
+from src.category_index import CategoryIndex, is_category_index, iter_mapping_file, open_category_index
+from src.category_resolver import CategoryResolver
+
+
+def naive_ancestors(mapping, category, max_depth):
+    """The old recursive resolution, a set per level"""
+    if max_depth <= 0:
+        return set()
+    found = set()
+    for parent in mapping.get(category, []):
+        found.add(parent)
+        found.update(naive_ancestors(mapping, parent, max_depth - 1))
+    return found
+
+
+def test_closure_matches_recursive_resolution_on_a_cyclic_graph(tmp_path, monkeypatch):
+    monkeypatch.setattr(category_index, "_CLOSURE_BLOCK", 7)  # several blocks
+    rng = random.Random(3)
+    names = [f"C{i}" for i in range(60)]
+    mapping = {name: rng.sample(names, rng.randint(0, 3)) for name in names}
+    mapping["C0"] = ["C1"]
+    mapping["C1"] = ["C0", "C2"]  # a cycle through C0
+    index = CategoryIndex.from_mapping(mapping, max_depth=3)
+    index.save(str(tmp_path / "index"))
+    loaded = CategoryIndex.load(str(tmp_path / "index"))
+
+    for name in names:
+        for depth in range(0, 6):  # depths past the precomputed 3 walk the parent lists
+            expected = naive_ancestors(mapping, name, depth) - {name}
+            assert set(loaded.ancestors_of(name, depth)) == expected
+    assert loaded.ancestors_of("Category:C1", 1) == ["C0", "C2"]
+    assert loaded.ancestors_of("Unknown", 3) == []
+
+
+def test_resolver_reads_mapping_files_and_saved_indexes(tmp_path):
+    mapping = {"Mario": ["Video game characters"], "Video game characters": ["Fictional characters"],
+               "Fictional characters": ["Fiction"]}
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps(mapping))
+    expected = ["Fictional characters", "Mario", "Video game characters"]
+    assert CategoryResolver(str(path)).resolve_categories_and_hierarchy(["Category:Mario"]) == expected
+
+    CategoryIndex.from_mapping(mapping).save(str(tmp_path / "index"))
+    resolver = CategoryResolver(str(tmp_path / "index"))
+    assert resolver.resolve_categories_and_hierarchy(["Category:Mario"], max_depth=3) == ["Fiction"] + expected
+    assert resolver._get_parents_from_tree("Mario") == ["Category:Video game characters"]
+    assert CategoryResolver().resolve_categories_and_hierarchy(["Category:Mario"]) == ["Mario"]
+
+
+def test_streaming_parse_matches_json_load(tmp_path):
+    mapping = {"Ærø": ["Islands of Denmark", "Quote \" and \\ slash"], "Empty": [], "": ["Root"],
+               "Long " + "x" * 300: ["Ærø"]}
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps(mapping, indent=2, ensure_ascii=False), encoding="utf-8")
+    assert dict(iter_mapping_file(str(path), chunk_size=7)) == mapping
+
+    path.write_text('{"A": ["B"], "C": ["D"', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_mapping_file(str(path), chunk_size=4))
+
+
+def test_compiled_index_is_reused_until_the_mapping_changes(tmp_path, monkeypatch):
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps({"A": ["B"], "B": ["C"]}))
+    assert open_category_index(str(path)).ancestors_of("A") == ["B", "C"]
+    assert is_category_index(str(path) + ".index")
+
+    monkeypatch.setattr(category_index, "iter_mapping_file", None)  # the JSON must not be read again
+    assert open_category_index(str(path)).ancestors_of("A") == ["B", "C"]
+    monkeypatch.undo()
+
+    path.write_text(json.dumps({"A": ["D"]}))
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert open_category_index(str(path)).ancestors_of("A") == ["D"]
@@ -0,0 +1,100 @@
+# test_crawl_checkpoint.py
+import asyncio
+import contextlib
+import io
+import threading
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.async_crawler import AsyncWikiCrawler
+from src.crawl_checkpoint import CrawlCheckpoint, load_checkpoint
+from src.pipeline_crawler import PipelinedWikiCrawler
+from src.rate_limiter import AsyncRateLimiter, RateLimiter
+from src.wiki_crawler import WikiCrawler
+
+
+def test_replay_drops_torn_tail(tmp_path):
+    path = str(tmp_path / "crawl.journal")
+    checkpoint = CrawlCheckpoint(path, interval=60)
+    checkpoint.begin({"start_url": "u0", "started_at": 1.0, "max_depth": 3, "max_pages_per_depth": 5})
+    checkpoint.record_expanded(None, 0, ["u0"])
+    checkpoint.record_expanded("u0", 1, ["u1", "u2"])
+    checkpoint.record_expanded("u2", 2, [])
+    checkpoint.close()
+    with open(path, "ab") as f:
+        f.write(b"e\t2\tu1\tu3")  # crash in the middle of a write
+
+    state = load_checkpoint(path)
+    assert state.seen == ["u0", "u1", "u2"]
+    assert state.pending == [("u1", 1)]
+    assert state.pages_done == 2
+    assert state.stats == {}
+
+    checkpoint.reopen(state)
+    checkpoint.record_expanded("u1", 2, ["u3"])
+    checkpoint.close()
+    state = load_checkpoint(path)
+    assert state.pending == [("u3", 2)] and state.pages_done == 3
+
+
+def _crawler(crawler_cls, server, data_dir, **kwargs):
+    return crawler_cls(f"{server.base_url}/wiki/Article_0", requests_per_second=None, base_url=server.base_url,
+                       data_dir=str(data_dir), max_depth=3, max_pages_per_depth=5, num_threads=3, **kwargs)
+
+
+def _interrupted_then_resumed(crawler_cls, server, data_dir, **kwargs):
+    first = _crawler(crawler_cls, server, data_dir, checkpoint_interval=0.05, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawl = threading.Thread(target=first.start_crawl)
+        crawl.start()
+        while first.pages_crawled < 5:
+            time.sleep(0.01)
+        first.stop()
+        crawl.join()
+        assert first.pages_crawled < 31
+
+        second = _crawler(crawler_cls, server, data_dir, checkpoint_interval=0.05, **kwargs)
+        second.resume()
+    return first, second
+
+
+def test_resume_finishes_crawl_without_refetching(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5, latency=0.02) as server:
+        complete = _crawler(WikiCrawler, server, tmp_path / "complete")
+        with contextlib.redirect_stdout(io.StringIO()):
+            complete.start_crawl()
+        assert complete.pages_crawled == server.requests_served == 31
+
+        for crawler_cls, kwargs in ((WikiCrawler, {}), (PipelinedWikiCrawler, {"num_parsers": 1})):
+            served = server.requests_served
+            _, resumed = _interrupted_then_resumed(crawler_cls, server, tmp_path / crawler_cls.__name__, **kwargs)
+            assert server.requests_served - served == 31  # every page fetched exactly once across both runs
+            assert resumed.pages_crawled == 31
+            assert resumed.get_visited_pages() == complete.get_visited_pages()
+            assert [t for t, _ in resumed.data_store.iter_pages()] == [t for t, _ in complete.data_store.iter_pages()]
+
+
+def test_pages_stored_before_resume_take_no_request_token(tmp_path, monkeypatch):
+    waits = []
+    monkeypatch.setattr(RateLimiter, "wait_if_needed", lambda self, *args: waits.append(self))
+
+    async def async_wait(self, *args):
+        waits.append(self)
+    monkeypatch.setattr(AsyncRateLimiter, "wait_if_needed", async_wait)
+
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        url = f"{server.base_url}/wiki/Article_3"
+        engines = {
+            WikiCrawler: lambda crawler: crawler._process_page(url, 1),
+            PipelinedWikiCrawler: lambda crawler: crawler._fetch_stage(url, 1),
+            AsyncWikiCrawler: lambda crawler: asyncio.run(crawler._async_process_page(None, url, 1)),
+        }
+        for crawler_cls, process in engines.items():
+            crawler = crawler_cls(url, requests_per_second=None, base_url=server.base_url,
+                                  data_dir=str(tmp_path / crawler_cls.__name__))
+            crawler.resumed_from = time.time()
+            crawler.data_store.save_page_data("Article_3", {"url": url, "links": [], "crawled_at": time.time()})
+            process(crawler)
+            crawler.data_store.close()
+            assert crawler.pages_crawled == 1
+        assert waits == [] and server.requests_served == 0
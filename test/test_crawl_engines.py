@@ -0,0 +1,93 @@
+# test_crawl_engines.py
+import contextlib
+import io
+import threading
+import time
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.async_crawler import AsyncWikiCrawler
+from src.pipeline_crawler import PipelinedWikiCrawler
+from src.wiki_crawler import WikiCrawler
+
+
+def _crawl(crawler_cls, server, data_dir, **kwargs):
+    crawler = crawler_cls(f"{server.base_url}/wiki/Article_0", requests_per_second=None,
+                          base_url=server.base_url, data_dir=str(data_dir),
+                          max_depth=2, max_pages_per_depth=5, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.start_crawl()
+    return crawler
+
+
+def test_async_engine_matches_threaded_engine(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        threaded = _crawl(WikiCrawler, server, tmp_path / "threaded", num_threads=3)
+        asynchronous = _crawl(AsyncWikiCrawler, server, tmp_path / "async", num_workers=20)
+
+    assert asynchronous.pages_crawled == threaded.pages_crawled == 6
+    assert asynchronous.pages_failed == threaded.pages_failed == 0
+    assert asynchronous.get_visited_pages() == threaded.get_visited_pages()
+    assert [t for t, _ in asynchronous.data_store.iter_pages()] == [t for t, _ in threaded.data_store.iter_pages()]
+    for crawler in (threaded, asynchronous):  # the crawl closed its store; reads still work
+        assert not crawler.data_store._flusher.is_alive()
+
+    start_page = asynchronous.get_page_data("Article_0")
+    assert "infobox" not in start_page  # no consumer asked for the article, so it was never parsed
+    assert sorted(start_page["links"]) == sorted(threaded.get_page_data("Article_0")["links"])
+
+
+def test_pipelined_engine_matches_threaded_engine(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        threaded = _crawl(WikiCrawler, server, tmp_path / "threaded", num_threads=3, store_article_fields=True)
+        pipelined = _crawl(PipelinedWikiCrawler, server, tmp_path / "pipelined", num_threads=3, num_parsers=2,
+                           store_article_fields=True)
+
+    assert pipelined.pages_crawled == threaded.pages_crawled == 6
+    assert pipelined.pages_failed == 0
+    assert pipelined.get_visited_pages() == threaded.get_visited_pages()
+    assert pipelined.parse_cpu_seconds > 0
+
+    stored = pipelined.get_page_data("Article_0")
+    expected = threaded.get_page_data("Article_0")
+    for field in ("links", "infobox", "categories", "lead_text"):
+        assert stored[field] == expected[field]
+
+
+def test_recrawl_uses_conditional_gets(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        first = _crawl(WikiCrawler, server, tmp_path, num_threads=3)
+        assert first.pages_not_modified == 0
+        assert first.get_page_data("Article_0")["etag"]
+
+        second = _crawl(AsyncWikiCrawler, server, tmp_path, num_workers=20)
+        assert second.pages_crawled == first.pages_crawled
+        assert second.pages_not_modified == second.pages_crawled
+        assert server.not_modified_served == second.pages_crawled
+
+        host = server.base_url.split("//", 1)[1]
+        assert second._connection_stats()[host]["reused"] > 0
+
+
+def test_threaded_workers_wait_out_a_slow_page_and_finish_promptly(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        crawler = WikiCrawler(f"{server.base_url}/wiki/Article_0", num_threads=4, requests_per_second=None,
+                              base_url=server.base_url, data_dir=str(tmp_path), max_depth=3, max_pages_per_depth=5)
+        process_page = crawler._process_page
+        threads_used = set()
+
+        def slow_start_page(url, depth):
+            if depth == 0:
+                time.sleep(1.5)  # longer than idle workers used to wait before giving up
+            else:
+                threads_used.add(threading.get_ident())
+            return process_page(url, depth)
+
+        crawler._process_page = slow_start_page
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            crawler.start_crawl()
+            elapsed = time.perf_counter() - start
+
+    assert crawler.pages_crawled == 31
+    assert len(threads_used) > 1  # the other workers were still there once links were queued
+    assert elapsed < 3  # returns when the last page is done, not on the next monitor poll
@@ -0,0 +1,51 @@
+# test_crawl_metrics.py
+import contextlib
+import io
+import json
+import urllib.request
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src.crawl_metrics import CrawlMetrics, Histogram, MetricsServer
+from src.wiki_crawler import WikiCrawler
+
+
+def test_histogram_quantiles_and_prometheus_text():
+    histogram = Histogram("latency", buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+        histogram.observe(seconds)
+    value = histogram.value
+    assert value["count"] == 100 and value["buckets"] == [50, 45, 5, 0]
+    assert value["p50"] == 0.01
+    assert 0.01 < value["p95"] <= 0.1 < value["p99"] <= 1.0
+
+    metrics = CrawlMetrics()
+    metrics.counter("pages_total", "Pages", fn=lambda: 7)
+    metrics.stage["fetch"].observe(0.02)
+    metrics.bytes_downloaded.inc(1024)
+    with MetricsServer(metrics, 0) as server:
+        text = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+    assert "wiki_crawler_pages_total 7" in text
+    assert "wiki_crawler_bytes_downloaded_total 1024" in text
+    assert 'wiki_crawler_stage_fetch_seconds_bucket{le="0.025"} 1' in text
+    assert 'wiki_crawler_stage_fetch_seconds_bucket{le="+Inf"} 1' in text
+    assert "wiki_crawler_stage_fetch_seconds_count 1" in text
+
+
+def test_crawl_records_every_stage(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        crawler = WikiCrawler(f"{server.base_url}/wiki/Article_0", requests_per_second=None,
+                              base_url=server.base_url, data_dir=str(tmp_path), max_depth=3,
+                              max_pages_per_depth=5, metrics_interval=60)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            crawler.start_crawl()
+
+    assert "Crawling:" not in output.getvalue()  # per-page lines are debug-level only
+    metrics = crawler.metrics.snapshot()["metrics"]
+    for stage in ("rate_limit_wait", "fetch", "parse", "classify", "store"):
+        assert metrics[f"stage_{stage}_seconds"]["count"] == 31
+    assert metrics["fetches_total"] == 31
+    assert metrics["bytes_downloaded_total"] > 31 * 5000
+    assert metrics["fetches_in_flight"] == 0 and metrics["queue_depth"] == 0
+    with open(tmp_path / "metrics.json") as f:  # the final snapshot is written when the crawl ends
+        assert json.load(f)["metrics"]["pages_crawled_total"] == 31
@@ -0,0 +1,54 @@
+# test_data_store.py
+import sqlite3
+
+import pytest
+
+from src.data_store import PageDataStore, SQLitePageDataStore, open_page_store
+
+
+def test_queued_pages_are_readable_before_they_are_committed(tmp_path):
+    store = SQLitePageDataStore(str(tmp_path), batch_size=1000, flush_interval=60)
+    store.save_page_data("Alpha", {"title": "Alpha", "links": ["x"]})
+
+    assert store.has_page("Alpha")
+    assert store.load_page_data("Alpha") == {"title": "Alpha", "links": ["x"]}
+    assert store.load_page_data("Missing") is None
+    store.close()
+
+
+def test_close_commits_everything_for_the_next_process(tmp_path):
+    store = SQLitePageDataStore(str(tmp_path), batch_size=7, flush_interval=60)
+    for i in range(50):
+        store.save_page_data(f"Page_{i}", {"title": f"Page_{i}", "n": i})
+    store.save_page_data("Page_3", {"title": "Page_3", "n": -3})  # latest write wins
+    store.close()
+    store.save_page_data("Late", {"title": "Late"})  # written straight through after close
+
+    reopened = SQLitePageDataStore(str(tmp_path))
+    pages = dict(reopened.iter_pages())
+    assert len(pages) == 51
+    assert pages["Page_3"]["n"] == -3
+    assert pages["Late"] == {"title": "Late"}
+    reopened.close()
+
+
+def test_failed_commit_is_raised_instead_of_blocking(tmp_path):
+    store = SQLitePageDataStore(str(tmp_path), batch_size=1, flush_interval=60)
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("DROP TABLE pages")  # every commit from now on fails
+    with pytest.raises(sqlite3.OperationalError):
+        for i in range(store.max_pending + 1):  # would block forever on a dead flusher
+            store.save_page_data(f"Page_{i}", {"title": f"Page_{i}"})
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    with pytest.raises(sqlite3.OperationalError):
+        store.close()
+    assert not store._flusher.is_alive()
+
+
+def test_json_backend_is_still_available(tmp_path):
+    store = open_page_store(str(tmp_path), backend="json")
+    assert isinstance(store, PageDataStore)
+    store.save_page_data("A/B", {"title": "A/B"})
+    assert store.has_page("A/B")
+    assert list(store.iter_pages()) == [("A/B", {"title": "A/B"})]
@@ -0,0 +1,134 @@
+# test_distributed_crawler.py
+import contextlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from src import distributed_crawler, http_session
+from src.crawl_transport import COORDINATOR, LocalTransport, SocketTransport
+from src.data_store import open_crawl_dir
+from src.distributed_crawler import CrawlCoordinator, run_local_cluster, run_node
+from src.url_frontier import url_hash64
+from src.wiki_crawler import WikiCrawler
+
+
+def _stored_titles(data_dir, num_nodes):
+    titles = []
+    for node in range(num_nodes):
+        store = open_crawl_dir(os.path.join(data_dir, f"node-{node}"))
+        titles += [title for title, _ in store.iter_pages()]
+        store.close()
+    return titles
+
+
+def test_cluster_crawls_each_page_once_on_its_owner(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        start_url = f"{server.base_url}/wiki/Article_0"
+        single = WikiCrawler(start_url, requests_per_second=None, base_url=server.base_url,
+                             data_dir=str(tmp_path / "single"), max_depth=3, max_pages_per_depth=5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            single.start_crawl()
+        expected = sorted(title for title, _ in single.data_store.iter_pages())
+
+        for num_nodes in (1, 3):
+            served = server.requests_served
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = run_local_cluster(start_url, num_nodes, requests_per_second=None, max_depth=3,
+                                          max_pages_per_depth=5, base_url=server.base_url,
+                                          data_dir=str(tmp_path / f"nodes_{num_nodes}"))
+            titles = _stored_titles(tmp_path / f"nodes_{num_nodes}", num_nodes)
+            # Same set as one node only because the mock's first links on every page are new:
+            # the distributed cap counts links before dedup (see CrawlNode)
+            assert sorted(titles) == expected  # no page stored twice, none missing
+            assert stats["pages_crawled"] == server.requests_served - served == len(expected)
+            if num_nodes > 1:
+                assert stats["links_forwarded"] > 0
+                assert all(node["pages_crawled"] > 0 for node in stats["per_node"].values())
+
+
+def test_socket_transport_cluster(tmp_path):
+    authkey = b"test"
+    coordinator = SocketTransport(COORDINATOR, ("127.0.0.1", 0), authkey)
+    nodes = [SocketTransport(node, ("127.0.0.1", 0), authkey, peers={COORDINATOR: coordinator.address})
+             for node in range(2)]
+    with MockWikiServer(links_per_page=20, page_kb=5) as server, contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=run_node, args=(transport, node, str(tmp_path)))
+                   for node, transport in enumerate(nodes)]
+        for thread in threads:
+            thread.start()
+        stats = CrawlCoordinator(coordinator, 2, requests_per_second=None).run(
+            f"{server.base_url}/wiki/Article_0", max_depth=3, max_pages_per_depth=5, base_url=server.base_url)
+        for thread in threads:
+            thread.join()
+    for transport in [coordinator, *nodes]:
+        transport.close()
+
+    assert stats["pages_crawled"] == 31
+    assert len(set(_stored_titles(tmp_path, 2))) == 31
+
+
+def test_node_keeps_links_forwarded_before_its_start(tmp_path):
+    # The test plays the coordinator and node 1, which forwards a batch before node 0 reads its start
+    transports = LocalTransport.create([COORDINATOR, 0, 1])
+    coordinator = transports[COORDINATOR]
+    start_title, forwarded_title = [next(f"Article_{i}" for i in range(100) if url_hash64(f"Article_{i}") % 2 == node)
+                                    for node in (1, 0)]
+    with MockWikiServer(links_per_page=20, page_kb=5) as server, contextlib.redirect_stdout(io.StringIO()):
+        transports[1].send(0, ("links", 1, [(f"{server.base_url}/wiki/{forwarded_title}", 1)]))
+        transports[1].send(0, ("start", COORDINATOR, {
+            "num_nodes": 2, "addresses": {}, "start_url": f"{server.base_url}/wiki/{start_title}",
+            "base_url": server.base_url, "max_depth": 2, "max_pages_per_depth": 5, "requests_per_second": None}))
+        node = threading.Thread(target=run_node, args=(transports[0], 0, str(tmp_path)), daemon=True)
+        node.start()
+        assert coordinator.receive(timeout=10)[0] == "join"
+
+        status = None
+        for probe_round in range(50):
+            coordinator.send(0, ("probe", COORDINATOR, probe_round))
+            _, _, status = coordinator.receive(timeout=10)
+            if status["idle"] and status["pages_crawled"]:
+                break
+            time.sleep(0.1)
+        coordinator.send(0, ("stop", COORDINATOR, None))
+        _, _, stats = coordinator.receive(timeout=10)
+        node.join(timeout=10)
+
+    assert status["received"] == 1
+    assert stats["pages_crawled"] == 1
+    assert _stored_titles(tmp_path, 1) == [forwarded_title]  # node-0 only
+
+
+def test_nodes_do_not_inherit_parent_state(tmp_path):
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        http_session.get_shared_pool().get(f"{server.base_url}/wiki/Article_0")  # a live keep-alive socket
+        result = {}
+        cluster = threading.Thread(target=lambda: result.update(run_local_cluster(
+            f"{server.base_url}/wiki/Article_0", 2, requests_per_second=None, max_depth=3, max_pages_per_depth=5,
+            base_url=server.base_url, data_dir=str(tmp_path))), daemon=True)
+        served = server.requests_served
+        # Held while the nodes start: a forked node would begin with it locked and never fetch a page
+        with http_session._shared_pool_lock, contextlib.redirect_stdout(io.StringIO()):
+            cluster.start()
+            cluster.join(timeout=60)
+        if cluster.is_alive():
+            for process in multiprocessing.active_children():
+                process.kill()
+        assert not cluster.is_alive()
+        assert result["pages_crawled"] == server.requests_served - served == 31
+
+
+def test_cluster_stops_nodes_when_coordinator_fails(tmp_path, monkeypatch):
+    def fail(self, *args):
+        raise RuntimeError("coordinator failed")
+
+    monkeypatch.setattr(distributed_crawler.CrawlCoordinator, "run", fail)
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="coordinator failed"):
+        run_local_cluster("http://127.0.0.1:9/wiki/Article_0", 2, data_dir=str(tmp_path))
+    assert time.perf_counter() - start < 30
+    assert not multiprocessing.active_children()
@@ -0,0 +1,36 @@
+# test_embedding_cache.py
+import numpy as np
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+
+
+def test_vectors_survive_reopening(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dimension=4, model_name="m")
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    cache.put_many(["a", "b", "a"], vectors)  # the second "a" is already cached
+    assert len(cache) == 2
+    cache.put_many(["c"], vectors[2:])
+    assert np.array_equal(cache.get_many(["c", "missing"])["c"], vectors[2])
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), dimension=4, model_name="m")
+    found = reopened.get_many(["a", "b", "c"])
+    assert np.array_equal(found["a"], vectors[0]) and np.array_equal(found["b"], vectors[1])
+    assert "a" not in EmbeddingCache(str(tmp_path), dimension=4, model_name="other model")
+
+
+def test_half_written_tail_is_dropped(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dimension=2)
+    cache.put_many(["a"], [[1.0, 2.0]])
+    cache.close()
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(np.float32([3.0]).tobytes())  # crash in the middle of the next vector
+
+    reopened = EmbeddingCache(str(tmp_path), dimension=2)
+    reopened.put_many(["b"], [[5.0, 6.0]])
+    assert np.array_equal(reopened.get_many(["b"])["b"], [5.0, 6.0])
+    assert len(reopened) == 2
+
+    with pytest.raises(ValueError):
+        EmbeddingCache(str(tmp_path), dimension=3)
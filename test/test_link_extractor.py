@@ -0,0 +1,40 @@
+# test_link_extractor.py
+import os
+
+from benchmarks.wiki_fixtures import make_article_html
+from src.link_extractor import LinkExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _corpus():
+    with open(os.path.join(FIXTURES_DIR, "link_edge_cases.html"), "rb") as f:
+        yield f.read()
+    for title in ("Article_0", "Article_42", "Article_4999"):
+        yield make_article_html(title, page_kb=50)
+
+
+def test_fast_path_matches_beautifulsoup():
+    extractor = LinkExtractor()
+    for html_content in _corpus():
+        fast = extractor.extract_links(html_content)
+        assert len(fast) == len(set(fast))
+        assert set(fast) == set(extractor.extract_links_soup(html_content))
+
+
+def test_skips_comments_scripts_and_non_article_links():
+    extractor = LinkExtractor(base_url="")
+    with open(os.path.join(FIXTURES_DIR, "link_edge_cases.html"), "rb") as f:
+        links = extractor.extract_links(f.read())
+
+    assert "/wiki/Plain" in links
+    assert "/wiki/Procter_&_Gamble" in links
+    for skipped in ("/wiki/In_comment", "/wiki/In_script", "/wiki/In_style", "/wiki/Not_an_anchor",
+                    "/wiki/Special:Random", "/wiki/Category:Things", "/wiki/First"):
+        assert skipped not in links
+
+
+def test_accepts_str_input():
+    extractor = LinkExtractor(base_url="")
+    assert extractor.extract_links('<p><a href="/wiki/Mario">Mario</a></p>') == ["/wiki/Mario"]
+    assert extractor.extract_links(b"") == []
@@ -0,0 +1,51 @@
+# test_link_graph.py
+import numpy as np
+
+from src.link_graph import LinkGraph
+
+BASE = "http://en.wikipedia.org"
+
+
+def _page(*links):
+    return {"links": [f"{BASE}/wiki/{link}" for link in links]}
+
+
+def _titles(graph, nodes):
+    return sorted(graph.title_of(int(n)) for n in nodes)
+
+
+def test_build_forward_and_reverse_edges():
+    graph = LinkGraph.build([("A", _page("B", "C")), ("B", _page("C", "A")), ("C", _page("Caf%C3%A9"))])
+
+    a, c = graph.id_of("A"), graph.id_of("C")
+    assert graph.num_nodes == 4 and graph.num_edges == 5
+    assert _titles(graph, graph.successors(a)) == ["B", "C"]
+    assert _titles(graph, graph.predecessors(c)) == ["A", "B"]
+    assert _titles(graph, graph.successors(c)) == ["Café"]
+    assert not graph.is_crawled(graph.id_of("Café")) and graph.is_crawled(a)
+
+
+def test_incremental_appends_match_a_full_rebuild(tmp_path):
+    first = [("A", _page("B")), ("B", _page("C"))]
+    later = [("C", _page("A", "D")), ("A", _page("D"))]  # A is recrawled with new links
+
+    graph = LinkGraph.build(first)
+    graph.save(str(tmp_path))
+    graph = LinkGraph.load(str(tmp_path))
+    assert isinstance(graph.targets, np.memmap)
+
+    graph.add_pages(later)
+    a, d = graph.id_of("A"), graph.id_of("D")
+    assert _titles(graph, graph.successors(a)) == ["D"]
+    assert _titles(graph, graph.predecessors(d)) == ["A", "C"]
+    assert _titles(graph, graph.predecessors(graph.id_of("B"))) == []
+    assert graph.num_edges == 4
+
+    graph.save(str(tmp_path))
+    reloaded = LinkGraph.load(str(tmp_path))
+    rebuilt = LinkGraph.build(first + later)
+    for title in ("A", "B", "C", "D"):
+        assert _titles(reloaded, reloaded.successors(reloaded.id_of(title))) == \
+               _titles(rebuilt, rebuilt.successors(rebuilt.id_of(title)))
+        assert _titles(reloaded, reloaded.predecessors(reloaded.id_of(title))) == \
+               _titles(rebuilt, rebuilt.predecessors(rebuilt.id_of(title)))
@@ -0,0 +1,47 @@
+# test_model_registry.py
+import threading
+import time
+
+import pytest
+
+from src import model_registry
+from src.semantic_embedder import SemanticEmbedder
+from src.topic_classifier import TopicClassifier
+
+
+def test_concurrent_first_use_loads_once():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(model_registry.get_model("test", "m", loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1 and len({id(model) for model in results}) == 1
+    assert ("test", "m") in model_registry.loaded_models()
+    model_registry.release("test")
+    assert ("test", "m") not in model_registry.loaded_models()
+
+
+def test_failed_load_is_retried():
+    def failing():
+        raise OSError("no network")
+
+    with pytest.raises(OSError):
+        model_registry.get_model("test", "flaky", failing)
+    assert model_registry.get_model("test", "flaky", lambda: "model") == "model"
+    model_registry.release("test")
+
+
+def test_constructors_do_not_load_models():
+    before = model_registry.loaded_models()
+    SemanticEmbedder(cache_dir=None)
+    TopicClassifier(small=True)
+    assert model_registry.loaded_models() == before
@@ -0,0 +1,40 @@
+# test_page_archive.py
+from src.data_store import PageDataStore
+from src.page_archive import PageArchive, build_archive, convert_crawl_dir
+
+
+def _page(title, links):
+    return {"url": f"http://en.wikipedia.org/wiki/{title}", "title": title, "links": links,
+            "category": None, "infobox": {"Genre": "Jazz"}}
+
+
+def test_lookup_projection_and_iteration(tmp_path):
+    pages = [(f"Article_{i}", _page(f"Article_{i}", [f"/wiki/Article_{i + 1}"])) for i in range(300)]
+    pages.append(("Ünïcode/Title", _page("Ünïcode/Title", [])))
+    pages.append(("Article_7", _page("Article_7", ["replaced"])))  # last copy wins
+
+    with PageArchive(build_archive(pages, str(tmp_path / "pages.archive"))) as archive:
+        assert len(archive) == 301
+        assert archive.get("Article_42") == pages[42][1]
+        assert archive.get("Ünïcode/Title")["title"] == "Ünïcode/Title"
+        assert archive.get("Article_7")["links"] == ["replaced"]
+        assert archive.get("Article_300") is None
+        assert not archive.has_page("Missing")
+        assert archive.get("Article_1", fields=["links", "category"]) == {"links": ["/wiki/Article_2"],
+                                                                         "category": None}
+
+        titles = [title for title, _ in archive.iter_pages(fields=["title"])]
+        assert titles[:3] == ["Article_0", "Article_1", "Article_2"] and len(titles) == 301
+        title, record = next(archive.iter_records())
+        assert title == "Article_0" and isinstance(record, memoryview)
+        record.release()
+
+
+def test_convert_json_crawl_dir(tmp_path):
+    store = PageDataStore(str(tmp_path / "crawled_data"))
+    for i in range(5):
+        store.save_page_data(f"Page_{i}", _page(f"Page_{i}", [str(i)]))
+
+    with PageArchive(convert_crawl_dir(str(tmp_path / "crawled_data"), str(tmp_path / "a"))) as archive:
+        assert len(archive) == 5
+        assert archive.load_page_data("Page_3") == store.load_page_data("Page_3")
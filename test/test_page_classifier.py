@@ -0,0 +1,71 @@
+# test_page_classifier.py
+from benchmarks.wiki_fixtures import make_article_html
+from src.page_classifier import LinearPageModel, PageClassifier, accuracy, scan_page_record, train_classifier
+from src.parsed_page import ParsedPage
+from src.wiki_parser import WikiParser
+
+VOCAB = {
+    "Music": "album singer guitar band concert song chart tour",
+    "Science": "physics experiment theory molecule laboratory energy atom research",
+    "Sports": "league season goal match championship coach stadium team",
+}
+
+
+def labelled_pages():
+    pages = []
+    for label, words in VOCAB.items():
+        words = words.split()
+        for i in range(30):
+            lead = " ".join(words[(i + j) % len(words)] for j in range(5)) + " the of and was"
+            pages.append((f"{label}_page_{i}", {"lead_text": lead, "categories": [f"{label} stubs"]}, [label]))
+    return pages
+
+
+def test_trained_model_survives_saving(tmp_path):
+    pages = labelled_pages()
+    model = train_classifier(pages, n_features=2 ** 12)
+    assert accuracy(model, pages) == 1.0
+
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    classifier = PageClassifier(model_path=path)
+    assert classifier.classify_record("Unseen", {"lead_text": "the band played a song on tour"}) == "Music"
+    assert classifier.classify_record("Unseen", {"lead_text": "a physics laboratory experiment"}) == "Science"
+    assert LinearPageModel.load(path).labels == sorted(VOCAB)
+
+
+def test_classifies_parsed_pages_and_stays_quiet_without_a_model(tmp_path):
+    html = (b"<html><body><h1 id='firstHeading'>Derby</h1><div id='mw-content-text'><div class='mw-parser-output'>"
+            b"<p>The derby match decided the league championship at the stadium.</p></div></div></body></html>")
+    page = ParsedPage(html, "https://en.wikipedia.org/wiki/Derby")
+    assert PageClassifier(model_path=str(tmp_path / "missing.npz")).classify(page, "Derby") is None
+
+    classifier = PageClassifier(model=train_classifier(labelled_pages(), n_features=2 ** 12))
+    assert classifier.classify(page, "Derby") == "Sports"
+    assert "soup" not in page.__dict__  # classified from the bytes, never parsed
+
+
+LIVE_LIKE_PAGE = (
+    b'<html><body><h1 id="firstHeading">Caf&eacute;</h1><div id="mw-content-text"><div class="mw-parser-output">'
+    b'<table class="infobox vcard"><tbody><tr><th colspan="2">Caf\xc3\xa9</th></tr>'
+    b'<tr><th scope="row">Type</th><td>Restaurant<sup class="reference"><a href="#c1">[1]</a></sup></td></tr>'
+    b'<tr><th scope="row">Origin</th><td><p>France</p></td></tr></tbody></table>'
+    b'<p class="mw-empty-elt">\n</p><p>A <b>caf&eacute;</b> serves <!-- hidden -->coffee'
+    b'<sup class="reference"><a href="#c2">[2]</a></sup> &amp; tea.</p>\n<p>It is   informal.</p>'
+    b'<div class="mw-heading mw-heading2"><h2 id="History">History</h2></div><p>Later text.</p>'
+    b'</div></div><div id="catlinks" class="catlinks"><div id="mw-normal-catlinks"><ul>'
+    b'<li><a href="/wiki/Category:Coffeehouses" title="Category:Coffeehouses">Coffeehouses</a></li>'
+    b'<li><a href="/wiki/Category:Restaurants_by_type">Restaurants by type</a></li></ul></div>'
+    b'<div id="mw-hidden-catlinks"><ul><li><a href="/wiki/Category:Articles_with_short_description">'
+    b'Articles with short description</a></li></ul></div></div></body></html>'
+)
+
+
+def test_byte_scan_matches_wiki_parser():
+    url = "https://en.wikipedia.org/wiki/Cafe"
+    for html in (make_article_html("Article_7", page_kb=20), LIVE_LIKE_PAGE):
+        article = WikiParser().parse_articles(html, url)
+        record = scan_page_record(html)
+        assert record["lead_text"] == article["lead_text"]
+        assert record["categories"] == article["categories"]
+        assert list(record["infobox"]) == list(article["infobox"])
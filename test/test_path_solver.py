@@ -0,0 +1,65 @@
+# test_path_solver.py
+import numpy as np
+
+from src.link_graph import LinkGraph
+from src.path_solver import PathSolver
+
+BASE = "http://en.wikipedia.org"
+
+
+def _graph(edges):
+    pages = {}
+    for source, target in edges:
+        pages.setdefault(source, []).append(f"{BASE}/wiki/{target}")
+    return LinkGraph.build((title, {"links": links}) for title, links in pages.items())
+
+
+# Two routes from A to F: A-B-C-D-F (4 clicks) and A-E-F (2 clicks); G is a dead end
+EDGES = [("A", "B"), ("B", "C"), ("C", "D"), ("D", "F"), ("A", "E"), ("E", "F"), ("F", "G"), ("B", "A")]
+
+
+class FakeFetcher:
+    """Serves article HTML for pages outside the crawled graph"""
+
+    def __init__(self, links):
+        self.links = links
+        self.fetched = []
+
+    def fetch(self, url):
+        title = url.rsplit("/", 1)[1]
+        self.fetched.append(title)
+        anchors = "".join(f'<a href="/wiki/{target}">{target}</a>' for target in self.links.get(title, []))
+        return f"<html><body>{anchors}</body></html>".encode()
+
+
+class TitleEmbedder:
+    """Embeds titles by their first letter, so alphabetically close titles look similar"""
+
+    def get_embedding(self, text):
+        angle = (ord(text[0]) - ord("A")) / 10
+        return [np.cos(angle), np.sin(angle)]
+
+
+def test_bidirectional_bfs_finds_the_shortest_path():
+    solver = PathSolver(_graph(EDGES))
+    assert solver.shortest_path("A", "F") == ["A", "E", "F"]
+    assert solver.shortest_path("C", "G") == ["C", "D", "F", "G"]
+    assert solver.shortest_path("A", "A") == ["A"]
+    assert solver.shortest_path("G", "A") is None
+    assert solver.shortest_path("A", "Nowhere") is None
+
+
+def test_astar_with_embedding_heuristic_is_still_shortest():
+    solver = PathSolver(_graph(EDGES), embedder=TitleEmbedder())
+    assert solver.astar_path("A", "F") == ["A", "E", "F"]
+    assert solver.astar_path("C", "G") == ["C", "D", "F", "G"]
+
+
+def test_fetches_pages_beyond_the_crawled_region():
+    # G was never crawled; it links on to H, which links to the target
+    fetcher = FakeFetcher({"G": ["H"], "H": ["Target"]})
+    solver = PathSolver(_graph(EDGES), page_fetcher=fetcher, base_url=BASE, fetch_batch=1)
+
+    assert solver.shortest_path("A", "Target") == ["A", "E", "F", "G", "H", "Target"]
+    assert fetcher.fetched == ["G", "H"]
+    assert solver.pages_fetched == 2
@@ -0,0 +1,38 @@
+# test_race_crawler.py
+import contextlib
+import io
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from benchmarks.wiki_fixtures import make_topical_article_html, topical_links, topical_titles
+from src.race_crawler import RaceCrawler
+
+TITLES = topical_titles(per_topic=60)
+
+
+def _race(server, tmp_path, target, **weights):
+    crawler = RaceCrawler(f"{server.base_url}/wiki/{TITLES[0]}", target, num_threads=1, requests_per_second=None,
+                          base_url=server.base_url, data_dir=str(tmp_path), **weights)
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.start_crawl()
+    return crawler
+
+
+def test_best_first_race_beats_bfs_and_returns_a_valid_path(tmp_path):
+    target = "Orchid_archive_43"
+    with MockWikiServer(TITLES, links_per_page=20, page_kb=2, page_builder=make_topical_article_html) as server:
+        guided = _race(server, tmp_path / "guided", target)
+        bfs = _race(server, tmp_path / "bfs", target, token_weight=0, category_weight=0)
+
+    assert guided.path[0] == TITLES[0] and guided.path[-1] == target
+    for page, next_page in zip(guided.path, guided.path[1:]):
+        assert next_page in topical_links(page, TITLES, 20)
+    assert bfs.path[-1] == target
+    assert guided.fetches < bfs.fetches
+    assert guided.checkpoint is None and not (tmp_path / "guided" / "crawl.journal").exists()
+
+
+def test_race_stops_when_the_budget_runs_out(tmp_path):
+    with MockWikiServer(TITLES, links_per_page=20, page_kb=2, page_builder=make_topical_article_html) as server:
+        crawler = _race(server, tmp_path, "Not_a_page", max_fetches=5)
+    assert crawler.path is None
+    assert crawler.fetches == 5
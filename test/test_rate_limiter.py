@@ -0,0 +1,139 @@
+# test_rate_limiter.py
+import asyncio
+import threading
+
+from requests import HTTPError
+
+from src.page_fetcher import PageFetcher
+from src.rate_limiter import API_ENDPOINT, ARTICLE_ENDPOINT, AsyncRateLimiter, RateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a caller sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+
+def test_achieved_rate_after_burst():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=4, burst=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.wait_if_needed()
+    assert clock.now == 0.0  # the burst goes out immediately
+
+    for _ in range(40):
+        limiter.wait_if_needed()
+    assert abs(clock.now - 40 / 4) < 1e-9
+
+
+def test_concurrent_reservations_get_distinct_slots():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=10, burst=1, clock=clock, sleep=clock.sleep)
+    delays = []
+    delays_lock = threading.Lock()
+
+    def reserve_many():
+        for _ in range(50):
+            delay = limiter.reserve()
+            with delays_lock:
+                delays.append(delay)
+
+    threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Clock never moved: 400 reservations must be spread 0.1s apart, none sharing a slot
+    expected = [round(i * 0.1, 6) for i in range(400)]
+    assert sorted(round(delay, 6) for delay in delays) == expected
+
+
+def test_endpoints_have_separate_buckets():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=1, burst=1, endpoint_rates={API_ENDPOINT: 0.5}, clock=clock)
+    assert limiter.reserve(ARTICLE_ENDPOINT) == 0.0
+    assert limiter.reserve(API_ENDPOINT) == 0.0
+    assert limiter.reserve(ARTICLE_ENDPOINT) == 1.0
+    assert limiter.reserve(API_ENDPOINT) == 2.0
+
+
+def test_retry_after_blocks_and_429_halves_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=2, burst=3, clock=clock, sleep=clock.sleep)
+    limiter.throttle(ARTICLE_ENDPOINT, retry_after=30)
+    assert limiter.reserve() >= 30
+
+    limiter = RateLimiter(requests_per_second=2, burst=1, clock=clock, sleep=clock.sleep)
+    limiter.throttle(ARTICLE_ENDPOINT)
+    assert limiter.bucket().rate == 1
+    for _ in range(20):
+        limiter.record_success()
+    assert limiter.bucket().rate == 2
+
+
+def test_unlimited_rate_still_honours_retry_after():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=None, clock=clock)
+    assert limiter.reserve() == 0.0
+    assert not limiter.throttle(ARTICLE_ENDPOINT)  # no rate to halve
+    assert limiter.throttle(ARTICLE_ENDPOINT, retry_after=5)
+    assert limiter.reserve() == 5.0
+
+
+class _TooManyRequests:
+    status_code = 429
+    headers = {}
+
+    def raise_for_status(self):
+        raise HTTPError("429 Too Many Requests")
+
+
+class _ThrottlingPool:
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        return _TooManyRequests()
+
+
+def test_unlimited_rate_backs_off_on_429_without_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("src.page_fetcher.time.sleep", sleeps.append)
+    pool = _ThrottlingPool()
+    fetcher = PageFetcher(retries=3, delay=1, session_pool=pool, rate_limiter=RateLimiter(requests_per_second=None))
+    assert fetcher.fetch_conditional("http://x/wiki/A").content is None
+    assert pool.requests == 3
+    assert sleeps == [1, 2]  # nothing to halve, so the retries are spaced by the backoff, not back-to-back
+
+
+def test_async_limiter_rate():
+    clock = FakeClock()
+    limiter = AsyncRateLimiter(requests_per_second=5, burst=1, clock=clock, sleep=clock.async_sleep)
+
+    async def run():
+        for _ in range(26):
+            await limiter.wait_if_needed()
+
+    asyncio.run(run())
+    assert abs(clock.now - 25 / 5) < 1e-9
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
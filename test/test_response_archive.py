@@ -0,0 +1,106 @@
+# test_response_archive.py
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from benchmarks.mock_wiki_server import MockWikiServer
+from benchmarks.wiki_fixtures import make_article_html
+from src.archive_reprocessor import ArchiveReprocessor
+from src.response_archive import ResponseArchive
+from src.wiki_crawler import WikiCrawler
+
+
+def test_put_get_dedup_and_reopen(tmp_path):
+    archive = ResponseArchive(str(tmp_path), compression="gzip")
+    body = b"<html>" + b"Mario " * 2000 + b"</html>"
+    archive.put("http://x/wiki/Mario", body, etag='"1"')
+    archive.put("http://x/wiki/Mario_(franchise)", body)  # same bytes, another URL
+    archive.put("http://x/wiki/Mario", body + b"!", etag='"2"')
+
+    assert archive.get("http://x/wiki/Mario") == body + b"!"
+    assert archive.get("http://x/wiki/Mario", revision='"1"') == body
+    assert archive.get("http://x/wiki/Luigi") is None
+    assert len(archive) == 2
+    assert archive.bytes_stored < len(body) // 10  # compressed, and the duplicate was not written
+    archive.close()
+
+    reopened = ResponseArchive(str(tmp_path), compression="gzip")
+    assert reopened.get("http://x/wiki/Mario_(franchise)") == body
+    latest = sorted(url for url, *_ in reopened.iter_latest())
+    assert latest == ["http://x/wiki/Mario", "http://x/wiki/Mario_(franchise)"]
+    reopened.close()
+
+
+@pytest.mark.parametrize("use", ["get", "duplicate put"])
+def test_evicts_least_recently_used_segment(tmp_path, use):
+    archive = ResponseArchive(str(tmp_path), max_bytes=350, segment_bytes=100, compression="gzip")
+    bodies = {f"http://x/wiki/{i}": os.urandom(90) for i in range(4)}  # incompressible: one segment each
+    for url, body in list(bodies.items())[:2]:
+        archive.put(url, body)
+    # 0 is now more recently used than 1
+    if use == "get":
+        archive.get("http://x/wiki/0")
+    else:
+        archive.put("http://x/wiki/Mirror_of_0", bodies["http://x/wiki/0"])
+    for url, body in list(bodies.items())[2:]:
+        archive.put(url, body)
+
+    assert archive.total_bytes <= 350
+    assert archive.get("http://x/wiki/1") is None
+    assert archive.get("http://x/wiki/0") == bodies["http://x/wiki/0"]
+    assert archive.get("http://x/wiki/3") == bodies["http://x/wiki/3"]
+    archive.close()
+
+
+def test_reprocess_matches_crawl_without_network(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"))
+    with MockWikiServer(links_per_page=20, page_kb=5) as server:
+        crawler = WikiCrawler(f"{server.base_url}/wiki/Article_0", requests_per_second=None,
+                              base_url=server.base_url, data_dir=str(tmp_path / "crawl"), max_depth=2,
+                              max_pages_per_depth=5, num_threads=3, response_archive=archive,
+                              store_article_fields=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            crawler.start_crawl()
+        base_url = server.base_url
+    # The server is gone: everything below comes from the archive
+    for num_parsers in (0, 2):
+        reprocessor = ArchiveReprocessor(archive, num_parsers=num_parsers, base_url=base_url,
+                                         data_dir=str(tmp_path / f"reprocessed_{num_parsers}"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            reprocessor.start_crawl()
+
+        assert reprocessor.pages_crawled == crawler.pages_crawled == 6
+        assert reprocessor.get_visited_pages() == crawler.get_visited_pages()
+        stored, expected = reprocessor.get_page_data("Article_0"), crawler.get_page_data("Article_0")
+        for field in ("links", "infobox", "categories", "lead_text", "etag"):
+            assert stored[field] == expected[field]
+    archive.close()
+
+
+def test_reprocess_aborts_on_stuck_parser(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"))
+    archive.put("http://x/wiki/A", b"<html><body><p>A</p></body></html>")
+    # Starting a spawned parser process alone takes longer than this
+    reprocessor = ArchiveReprocessor(archive, num_parsers=1, batch_timeout=0.001, base_url="http://x",
+                                     data_dir=str(tmp_path / "reprocessed"))
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(TimeoutError):
+        reprocessor.start_crawl()
+    archive.close()
+
+
+def test_reprocess_kills_a_parser_that_overruns_its_batch(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), compression="gzip")
+    for i in range(16):  # ~10 s of parsing in one batch
+        archive.put(f"http://x/wiki/Article_{i}", make_article_html(f"Article_{i}", page_kb=1000))
+    reprocessor = ArchiveReprocessor(archive, num_parsers=1, batch_size=16, batch_timeout=4, base_url="http://x",
+                                     data_dir=str(tmp_path / "reprocessed"))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(TimeoutError):
+        reprocessor.start_crawl()
+    assert time.perf_counter() - start < 8  # the busy worker was killed, not waited for
+    assert not multiprocessing.active_children()
+    archive.close()
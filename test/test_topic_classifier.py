@@ -0,0 +1,66 @@
+# test_topic_classifier.py
+import numpy as np
+
+from src.topic_classifier import TopicClassifier
+
+
+class _StubModel:
+    """Stands in for TopicClassifier._score: the score of (text, label) is fixed by the text and label"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, texts, labels):
+        self.calls.append((list(texts), labels))
+        if self.fail:
+            raise RuntimeError("model error")
+        return np.array([[(len(text) * (i + 1)) % 8 / 8 for i in range(len(labels))] for text in texts],
+                        dtype=np.float32)
+
+
+def _classifier(**kwargs):
+    classifier = TopicClassifier(**kwargs)
+    classifier.classifier = object()  # marks the model as loaded without importing transformers
+    classifier._score = _StubModel()
+    return classifier
+
+
+def test_list_labels_are_scored_once_and_cached():
+    classifier = _classifier()
+    labels = ["Science", "History"]
+    first = classifier.classify_zero_shot("abcdefg", labels, confidence_threshold=0.0)
+    assert first == classifier.classify_zero_shot("abcdefg", list(labels), confidence_threshold=0.0)
+    assert first == [{"label": "Science", "score": 0.875}, {"label": "History", "score": 0.75}]
+    assert len(classifier._score.calls) == 1
+
+
+def test_batch_keeps_input_order_and_scores_duplicates_once():
+    classifier = _classifier()
+    texts = ["aaaaa", "bb", "aaaaa", "", "ccc"]
+    results = classifier.classify_batch(texts, ["x"], confidence_threshold=0.0)
+    assert [r[0]["score"] if r else None for r in results] == [0.625, 0.25, 0.625, None, 0.375]
+    assert classifier._score.calls == [(["aaaaa", "bb", "ccc"], ("x",))]
+
+
+def test_cache_is_bounded_and_keyed_by_label_set():
+    classifier = _classifier(cache_size=2)
+    for text in ("a", "bb", "ccc"):
+        classifier.classify_zero_shot(text, ["x"])
+    assert len(classifier._cache) == 2
+    classifier.classify_zero_shot("a", ["x"])  # least recently used, so evicted
+    assert classifier._score.calls[-1] == (["a"], ("x",))
+
+    calls = len(classifier._score.calls)
+    classifier.classify_zero_shot("ccc", ["x"])
+    assert len(classifier._score.calls) == calls
+    classifier.classify_zero_shot("ccc", ["x", "y"])  # same text, new label set: scored again
+    assert len(classifier._score.calls) == calls + 1
+
+
+def test_model_errors_are_not_cached():
+    classifier = _classifier()
+    classifier._score.fail = True
+    assert classifier.classify_zero_shot("abcdefg", ["x"], confidence_threshold=0.0) == []
+    classifier._score.fail = False
+    assert classifier.classify_zero_shot("abcdefg", ["x"], confidence_threshold=0.0) == [{"label": "x", "score": 0.875}]
@@ -0,0 +1,92 @@
+# test_url_frontier.py
+import threading
+
+from src.url_frontier import BloomFilter, CompactURLSet, ShardedVisitedSet, SpillingFrontier
+
+URLS = [f"http://en.wikipedia.org/wiki/Article_{i}" for i in range(5000)]
+
+
+def test_compact_url_set_grows_and_deduplicates():
+    seen = CompactURLSet(capacity=16)
+    assert all(seen.add(url) for url in URLS)
+    assert not any(seen.add(url) for url in URLS)
+    assert len(seen) == len(URLS)
+    assert all(url in seen for url in URLS)
+    assert "http://en.wikipedia.org/wiki/Unseen" not in seen
+    assert seen.memory_bytes() < 16 * len(URLS)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=len(URLS), error_rate=0.01)
+    for url in URLS:
+        bloom.add(url)
+    assert all(url in bloom for url in URLS)
+    false_positives = sum(f"http://en.wikipedia.org/wiki/Other_{i}" in bloom for i in range(5000))
+    assert false_positives < 150
+
+
+def test_bloom_filter_grows_past_its_capacity():
+    bloom = BloomFilter(capacity=500, error_rate=0.01)  # a tenth of what arrives
+    assert sum(bloom.add(url) for url in URLS) > len(URLS) - 50  # new URLs are not taken for seen
+    assert all(url in bloom for url in URLS)
+    assert bloom.slices > 1
+    false_positives = sum(f"http://en.wikipedia.org/wiki/Other_{i}" in bloom for i in range(5000))
+    assert false_positives < 150
+
+
+def test_spilling_frontier_keeps_fifo_order():
+    frontier = SpillingFrontier(max_in_memory=10)
+    items = [(url, i % 3) for i, url in enumerate(URLS[:100])]
+    for item in items[:50]:
+        frontier.put(item)
+    assert frontier.spilled == 40
+    drained = [frontier.get() for _ in range(25)]
+    for item in items[50:]:
+        frontier.put(item)
+    drained += [frontier.get() for _ in range(75)]
+
+    assert drained == items
+    assert frontier.empty() and frontier.spilled == 0
+
+
+def test_spilling_frontier_is_thread_safe():
+    frontier = SpillingFrontier(max_in_memory=8)
+    results = []
+
+    def consume():
+        for _ in range(250):
+            results.append(frontier.get())
+            frontier.task_done()
+
+    consumers = [threading.Thread(target=consume) for _ in range(4)]
+    for consumer in consumers:
+        consumer.start()
+    for i in range(1000):
+        frontier.put((URLS[i], 0))
+    frontier.join()
+    for consumer in consumers:
+        consumer.join()
+    assert sorted(url for url, _ in results) == sorted(URLS[:1000])
+
+
+def test_sharded_claims_are_exclusive():
+    for mode in ("set", "hash"):
+        visited = ShardedVisitedSet(mode=mode, shards=8)
+        claimed = []
+
+        def claim(offset):
+            for start in range(0, len(URLS), 250):
+                batch = URLS[start:start + 250][offset:] + URLS[start:start + 250][:offset]
+                claimed.extend(visited.claim_batch(batch))
+
+        threads = [threading.Thread(target=claim, args=(offset,)) for offset in (0, 50, 100, 200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(URLS)
+        assert len(visited) == len(URLS)
+        assert visited.filter_unseen(URLS[:10] + ["http://en.wikipedia.org/wiki/New"]) == [
+            "http://en.wikipedia.org/wiki/New"]
+        assert visited.lock_stats()["acquisitions"] > 0
@@ -0,0 +1,57 @@
+# test_vector_index.py
+import numpy as np
+import pytest
+
+from src.vector_index import VectorIndex, build_page_index
+
+
+def _clustered(count=600, dim=32, clusters=6, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[np.arange(count) % clusters] + 0.3 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_exact_int8_and_ivf_search_agree(tmp_path):
+    vectors = _clustered()
+    titles = [f"Page_{i}" for i in range(len(vectors))]
+    query = vectors[7]
+    expected = np.argsort(-(vectors @ query))[:10]
+
+    exact = VectorIndex.build(titles, vectors)
+    rows, scores = exact.search(query, k=10)
+    assert rows.tolist() == expected.tolist()
+    assert np.all(np.diff(scores) <= 0)
+
+    quantized = VectorIndex.build(titles, vectors, quantize=True)
+    assert quantized.vectors.dtype == np.int8
+    assert len(set(quantized.search(query, k=10)[0].tolist()) & set(expected.tolist())) >= 9
+
+    ivf = VectorIndex.build(titles, vectors, nlist=6)
+    assert ivf.search(query, k=10, nprobe=6)[0].tolist() == expected.tolist()  # probing every list is exact
+    ivf.save(str(tmp_path))
+    loaded = VectorIndex.load(str(tmp_path))
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.search(query, k=10, nprobe=2)[0].tolist() == ivf.search(query, k=10, nprobe=2)[0].tolist()
+
+
+def test_get_related_excludes_the_page_itself():
+    vectors = _clustered(count=60, clusters=3)
+    index = VectorIndex.build([f"Page_{i}" for i in range(60)], vectors, nlist=3)
+    related = index.get_related("Page_4", k=5)
+    assert len(related) == 5 and "Page_4" not in related
+    assert all(int(title.split("_")[1]) % 3 == 1 for title in related)  # same cluster as Page_4
+    assert index.get_related("Unknown") == []
+
+
+def test_build_page_index_embeds_title_and_lead():
+    class LengthEmbedder:
+        def embed_batch(self, texts):
+            return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+    index = build_page_index([("A_b", {"lead_text": "xyz"}), ("C", {})], LengthEmbedder())
+    assert index.titles == ["A_b", "C"]
+    assert index.vector(0).tolist() == [len("A b. xyz"), 1.0]
+
+    with pytest.raises(ValueError, match="store_article_fields=True"):
+        build_page_index([("A_b", {"lead_text": "xyz"}), ("C", {}), ("D", {})], LengthEmbedder())
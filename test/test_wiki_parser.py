@@ -0,0 +1,32 @@
+# test_wiki_parser.py
+from benchmarks.wiki_fixtures import make_article_html
+from src.link_extractor import LinkExtractor
+from src.parsed_page import ParsedPage
+from src.wiki_parser import WikiParser
+
+URL = "http://en.wikipedia.org/wiki/Article_7"
+
+
+def test_parse_articles_fields():
+    article = WikiParser().parse_articles(make_article_html("Article_7", page_kb=5), URL)
+
+    assert article["title"] == "Article 7"
+    assert article["infobox"]["Occupation"] == "Plumber"
+    assert len(article["categories"]) == 3
+    assert article["lead_text"] == "Article 7 is a fictional subject used as a benchmark fixture."
+    assert len(article["internal_links"]) == 150
+
+
+def test_readers_share_one_parse():
+    link_extractor = LinkExtractor()
+    parser = WikiParser(link_extractor=link_extractor)
+    page = ParsedPage(make_article_html("Article_7", page_kb=5), URL)
+
+    links = link_extractor.extract_links(page)
+    assert "soup" not in page.__dict__  # link extraction never builds a DOM
+
+    article = parser.parse_articles(page, URL)
+    soup = page.soup
+    assert parser.parse_articles(page, URL) is article
+    assert article["internal_links"] is links
+    assert page.soup is soup